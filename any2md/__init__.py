@@ -1,14 +1,36 @@
 __version__ = "1.5.4"
 __author__ = "dustbinchen"
 
-from .converter import Any2MDConverter, ConvertResult
-from .unzipper import Unzipper
-from .cleaner import FilenameCleaner
+# Submodules are imported on first access so that `import any2md` (and with it
+# every CLI start) stays cheap; see scripts/bench_startup.py.
+_EXPORTS = {
+    "Any2MDConverter": "converter",
+    "ConvertResult": "converter",
+    "ConversionCache": "cache",
+    "Unzipper": "unzipper",
+    "FilenameCleaner": "cleaner",
+}
 
 __all__ = [
     "Any2MDConverter",
     "ConvertResult",
+    "ConversionCache",
     "Unzipper",
     "FilenameCleaner",
     "__version__",
 ]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_EXPORTS))
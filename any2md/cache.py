@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+
+DEFAULT_CACHE_BYTES = 1024 * 1024 * 1024
+# Eviction goes down to this fraction of `max_bytes`, so a full cache is not
+# rescanned on every insert.
+_LOW_WATER = 0.9
+_HASH_CHUNK = 1024 * 1024
+
+
+def hash_file(path: Path, chunk_size: int = _HASH_CHUNK) -> str:
+    """Streamed sha256 of a file; memory use is bounded by `chunk_size`."""
+    digest = hashlib.sha256()
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+def default_cache_dir() -> Path:
+    env_val = os.environ.get("ANY2MD_CACHE_DIR")
+    if env_val:
+        return Path(env_val).expanduser()
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "any2md"
+
+
+def _engine_versions() -> dict:
+    from . import __version__
+
+    try:
+        from importlib.metadata import version
+
+        markitdown_version = version("markitdown")
+    except Exception:
+        markitdown_version = "unknown"
+    return {"any2md": __version__, "markitdown": markitdown_version}
+
+
+class ConversionCache:
+    """
+    On-disk markdown cache keyed by input content, engine versions and options.
+
+    Each entry is a `<key>.md` file plus a small `<key>.json` sidecar holding the
+    title. Entry mtimes double as the LRU clock: hits touch the entry, and once
+    the total size exceeds `max_bytes` the least recently used entries are removed
+    until it is back under 90% of it.
+
+    Each instance keeps an in-memory index in LRU order, so most inserts cost
+    no directory access. Other processes (e.g. process workers) share the
+    directory but not the index: it is rebuilt from disk before evicting and
+    after each instance has written 10% of `max_bytes`, so the shared
+    directory overshoots `max_bytes` by at most that much per writer.
+    """
+
+    def __init__(
+        self, root: Optional[Path] = None, max_bytes: int = DEFAULT_CACHE_BYTES
+    ):
+        self.root = Path(root) if root is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Entry sizes, least recently used first; None until loaded from disk.
+        self._sizes: Optional[OrderedDict[str, int]] = None
+        self._total = 0
+        self._written = 0
+        self._versions = _engine_versions()
+
+    def __getstate__(self):
+        # Picklable for process workers; each process rebuilds its own index.
+        return {"root": self.root, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state["root"], state["max_bytes"])
+
+    def key_for(self, input_path: Path, options: Optional[dict] = None) -> str:
+        payload = {
+            "content": hash_file(input_path),
+            "suffix": Path(input_path).suffix.lower(),
+            "versions": self._versions,
+            "options": options or {},
+        }
+        raw = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        bucket = self.root / key[:2]
+        return bucket / f"{key}.md", bucket / f"{key}.json"
+
+    def get(self, key: str) -> Optional[tuple[str, Optional[str]]]:
+        md_path, meta_path = self._paths(key)
+        try:
+            markdown = md_path.read_text(encoding="utf-8")
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(md_path)
+        except OSError:
+            pass
+        with self._lock:
+            if self._sizes is not None and key in self._sizes:
+                self._sizes.move_to_end(key)
+        return markdown, meta.get("title")
+
+    def put(self, key: str, markdown: str, title: Optional[str]) -> None:
+        md_path, meta_path = self._paths(key)
+        md_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to temp names first so concurrent readers never see half an entry.
+        tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_md = md_path.with_name(md_path.name + tmp_suffix)
+        tmp_meta = meta_path.with_name(meta_path.name + tmp_suffix)
+        tmp_md.write_text(markdown, encoding="utf-8")
+        tmp_meta.write_text(json.dumps({"title": title}), encoding="utf-8")
+        os.replace(tmp_meta, meta_path)
+        os.replace(tmp_md, md_path)
+
+        size = md_path.stat().st_size + meta_path.stat().st_size
+        with self._lock:
+            sizes = self._load_index()
+            self._total += size - sizes.pop(key, 0)
+            self._written += size
+            sizes[key] = size
+            headroom = self.max_bytes - int(self.max_bytes * _LOW_WATER)
+            if self._total > self.max_bytes or self._written > headroom:
+                self._evict()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._load_index()
+            return self._total
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_index()):
+                self._remove(key)
+            self._sizes = OrderedDict()
+            self._total = 0
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        if self._sizes is None:
+            entries: list[tuple[float, str, int]] = []
+            if self.root.exists():
+                for md_path in self.root.glob("??/*.md"):
+                    meta_path = md_path.with_suffix(".json")
+                    try:
+                        st = md_path.stat()
+                        size = st.st_size + meta_path.stat().st_size
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, md_path.stem, size))
+            entries.sort()
+            self._sizes = OrderedDict((key, size) for _, key, size in entries)
+            self._total = sum(self._sizes.values())
+            self._written = 0
+        return self._sizes
+
+    def _evict(self) -> None:
+        # Pick up entries written by other processes since the index was built.
+        self._sizes = None
+        sizes = self._load_index()
+        if self._total <= self.max_bytes:
+            return
+        low_water = int(self.max_bytes * _LOW_WATER)
+        while sizes and self._total > low_water:
+            key, size = sizes.popitem(last=False)
+            self._total -= size
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        for p in self._paths(key):
+            try:
+                p.unlink()
+            except OSError:
+                pass
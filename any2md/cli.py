@@ -1,10 +1,20 @@
+import time
 from pathlib import Path
+from typing import Optional
 
 import typer
 from rich.console import Console
-from rich.progress import Progress, BarColumn, TextColumn, TaskProgressColumn
 
+from .cache import DEFAULT_CACHE_BYTES, ConversionCache
 from .converter import Any2MDConverter
+from .dashboard import ConvertDashboard
+from .merge import MergeWriter
+from .pdf import PdfSplitter
+from .pool import WorkerLimits
+from .report import write_report
+from .scheduler import ThroughputStats
+from .scratch import ScratchSpace, ScratchSpaceError
+from .tabular import TableOptions
 from .unzipper import Unzipper
 
 app = typer.Typer(name="any2md", help="批量转换文档为 Markdown")
@@ -29,58 +39,274 @@ def convert(
     input_path: Path = typer.Argument(..., help="输入文件/文件夹/ZIP路径"),
     output: Path = typer.Option("./output", "-o", "--output", help="输出目录"),
     recursive: bool = typer.Option(True, "-r", "--recursive", help="递归处理子目录"),
+    cache: bool = typer.Option(False, "--cache", help="启用转换缓存，跳过未变化的文件"),
+    cache_dir: Optional[Path] = typer.Option(
+        None, "--cache-dir", help="缓存目录（默认 ~/.cache/any2md 或 $ANY2MD_CACHE_DIR）"
+    ),
+    cache_max_mb: int = typer.Option(
+        DEFAULT_CACHE_BYTES // (1024 * 1024), "--cache-max-mb", help="缓存容量上限 (MB)"
+    ),
+    incremental: bool = typer.Option(
+        False, "--incremental", help="增量同步：只转换新增/变化的文件，并删除源文件已不存在的输出"
+    ),
+    merge: bool = typer.Option(False, "--merge", help="额外生成一份合并后的 Markdown 文档"),
+    merge_name: str = typer.Option(
+        "Any2MD-Merged.md", "--merge-name", help="合并文档的文件名（保存在输出目录）"
+    ),
+    timeout: Optional[float] = typer.Option(
+        None, "--timeout", help="单个文件的转换时限（秒），超时的文件会被终止并隔离"
+    ),
+    retry_quarantined: bool = typer.Option(
+        False, "--retry-quarantined", help="重新尝试此前因超时被隔离的文件"
+    ),
+    max_memory_mb: Optional[int] = typer.Option(
+        None, "--max-memory-mb", help="每个工作进程的内存上限 (MB)，超出的文件记为失败"
+    ),
+    recycle_after: Optional[int] = typer.Option(
+        None, "--recycle-after", help="每个工作进程处理 N 个文件后重启"
+    ),
+    recycle_after_mb: Optional[int] = typer.Option(
+        None, "--recycle-after-mb", help="每个工作进程处理 M MB 输入后重启"
+    ),
+    jobs: Optional[int] = typer.Option(
+        None,
+        "-j",
+        "--jobs",
+        min=1,
+        help="并行任务数（默认：线程模式 4，进程模式为 CPU 核数）",
+    ),
+    executor: str = typer.Option(
+        "thread", "--executor", help="并行方式：thread（线程）或 process（多进程）"
+    ),
+    scratch_dir: Optional[Path] = typer.Option(
+        None,
+        "--scratch-dir",
+        help="临时文件目录（可指定 tmpfs 等；默认 $ANY2MD_SCRATCH_DIR 或系统临时目录）",
+    ),
+    scratch_quota_mb: Optional[int] = typer.Option(
+        None,
+        "--scratch-quota-mb",
+        min=1,
+        help="临时文件总量上限 (MB)，超出时停止解压（默认 $ANY2MD_SCRATCH_QUOTA_MB，不限制）",
+    ),
+    pdf_split_pages: Optional[int] = typer.Option(
+        None,
+        "--pdf-split-pages",
+        min=1,
+        help="页数达到 N 的 PDF 按页分段并行提取（仅文本，不识别表格）",
+    ),
+    pdf_split_mb: Optional[int] = typer.Option(
+        None,
+        "--pdf-split-mb",
+        min=1,
+        help="大小达到 M MB 的 PDF 按页分段并行提取",
+    ),
+    table_max_rows: Optional[int] = typer.Option(
+        None,
+        "--table-max-rows",
+        min=1,
+        help="表格类文件（xlsx 等）每个工作表最多输出 N 行数据",
+    ),
+    table_sample: bool = typer.Option(
+        False, "--table-sample", help="配合 --table-max-rows：在整张表中随机抽样，而不是取前 N 行"
+    ),
+    drop_empty_cols: bool = typer.Option(
+        False, "--drop-empty-cols", help="删除表格中的空列（需要多读一遍工作表）"
+    ),
+    link_text: bool = typer.Option(
+        False,
+        "--link-text",
+        help="UTF-8 编码的 .md/.txt 以硬链接方式输出（不复制；修改输出即修改源文件）",
+    ),
+    sniff_content: bool = typer.Option(
+        False,
+        "--sniff-content",
+        help="总是根据文件内容识别格式（默认对常见扩展名直接按扩展名转换）",
+    ),
+    throughput_stats: Optional[Path] = typer.Option(
+        None,
+        "--throughput-stats",
+        help="记录/读取各格式转换速度的 JSON 文件，用于大文件优先调度",
+    ),
+    report_path: Optional[Path] = typer.Option(
+        None,
+        "--report",
+        help="生成 JSON 运行报告：各格式耗时汇总、分位数、各阶段耗时和最慢的文件",
+    ),
 ):
-    converter = Any2MDConverter()
-
-    with Progress(
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        console=console,
-    ) as progress:
-        if input_path.suffix.lower() == ".zip":
-            task = progress.add_task("解压 ZIP 文件...", total=1)
-            with Unzipper() as unzipper:
-                extracted = unzipper.extract_recursive(input_path)
-                progress.update(task, completed=1)
-
-                files = [
-                    f
-                    for f in extracted.rglob("*")
-                    if f.is_file() and converter.can_convert(f)
-                ]
-                convert_task = progress.add_task("转换文件...", total=len(files))
-                results = []
-                for file_path in files:
-                    rel_path = file_path.relative_to(extracted)
-                    file_output_dir = output / rel_path.parent
-                    result = converter.convert_file(file_path, file_output_dir)
-                    results.append(result)
-                    progress.update(convert_task, advance=1)
-        elif input_path.is_dir():
-            pattern = "**/*" if recursive else "*"
-            files = [
-                f
-                for f in input_path.glob(pattern)
-                if f.is_file() and converter.can_convert(f)
-            ]
-            task = progress.add_task("转换文件...", total=len(files))
-            results = []
-            for file_path in files:
-                rel_path = file_path.relative_to(input_path)
-                file_output_dir = output / rel_path.parent
-                result = converter.convert_file(file_path, file_output_dir)
-                results.append(result)
-                progress.update(task, advance=1)
-        else:
-            task = progress.add_task("转换文件...", total=1)
+    if merge and incremental:
+        console.print("[red]--merge 不能与 --incremental 同时使用[/red]")
+        raise typer.Exit(code=2)
+    if executor not in Any2MDConverter.EXECUTORS:
+        console.print(f"[red]未知的 --executor: {executor}[/red]（可选 thread / process）")
+        raise typer.Exit(code=2)
+
+    conversion_cache = (
+        ConversionCache(cache_dir, max_bytes=cache_max_mb * 1024 * 1024)
+        if cache or cache_dir is not None
+        else None
+    )
+    limits = WorkerLimits(
+        max_memory_mb=max_memory_mb, max_files=recycle_after, max_mb=recycle_after_mb
+    )
+    scratch = ScratchSpace(
+        scratch_dir,
+        quota_bytes=scratch_quota_mb * 1024 * 1024 if scratch_quota_mb else None,
+    )
+    pdf_splitter = (
+        PdfSplitter(
+            page_threshold=pdf_split_pages,
+            byte_threshold=pdf_split_mb * 1024 * 1024 if pdf_split_mb else None,
+        )
+        if pdf_split_pages or pdf_split_mb
+        else None
+    )
+    converter = Any2MDConverter(
+        cache=conversion_cache,
+        timeout=timeout,
+        worker_limits=limits or None,
+        throughput=ThroughputStats(throughput_stats) if throughput_stats else None,
+        scratch=scratch,
+        pdf_splitter=pdf_splitter,
+        link_text=link_text,
+        trust_extensions=not sniff_content,
+        table_options=TableOptions(
+            drop_empty_cols=drop_empty_cols,
+            max_rows=table_max_rows,
+            sample=table_sample,
+        ),
+    )
+    report = None
+    report_base = input_path if input_path.is_dir() else input_path.parent
+    merged_path = None
+    if merge:
+        name = merge_name.strip() or "Any2MD-Merged.md"
+        if not name.lower().endswith(".md"):
+            name += ".md"
+        merged_path = output / name
+
+    def convert_tree(
+        directory: Path,
+        walk_subdirs: bool,
+        files=None,
+        after_result=None,
+        archive=None,
+    ) -> list:
+        with ConvertDashboard(console) as dashboard:
+
+            def finished(result) -> None:
+                dashboard.finished(result)
+                if after_result is not None:
+                    after_result(result)
+
+            return converter.convert_directory(
+                directory,
+                output,
+                recursive=walk_subdirs,
+                files=files,
+                archive=archive,
+                max_workers=jobs,
+                executor=executor,
+                merged_path=merged_path,
+                retry_quarantined=retry_quarantined,
+                on_discovered=dashboard.discovered,
+                on_started=dashboard.started,
+                on_result=finished,
+            )
+
+    started = time.perf_counter()
+    if input_path.suffix.lower() == ".zip":
+        try:
+            if executor == "process" or timeout or limits:
+                # Worker processes need real files, so extract first, but only
+                # what can be converted, and free each file once converted.
+                with scratch.tempdir("any2md_") as td, Unzipper(
+                    scratch=scratch
+                ) as unzipper:
+                    extracted_dir = report_base = td.resolve()
+                    with console.status("解压 ZIP 文件..."):
+                        extracted = unzipper.extract_selective(
+                            input_path,
+                            extracted_dir,
+                            predicate=converter.can_convert,
+                            max_workers=jobs,
+                        )
+                    results = convert_tree(
+                        extracted_dir,
+                        True,
+                        files=extracted,
+                        after_result=lambda r: unzipper.release(r.input_path),
+                        archive=input_path,
+                    )
+            else:
+                # Members are converted straight from the archive.
+                with ConvertDashboard(console) as dashboard:
+                    results = converter.convert_zip(
+                        input_path,
+                        output,
+                        max_workers=jobs,
+                        merged_path=merged_path,
+                        on_discovered=dashboard.discovered,
+                        on_started=dashboard.started,
+                        on_result=dashboard.finished,
+                    )
+        except ScratchSpaceError as e:
+            console.print(f"[red]解压已中止[/red]: {e}")
+            raise typer.Exit(code=1)
+    elif input_path.is_dir() and incremental:
+        with ConvertDashboard(console) as dashboard:
+            report = converter.sync_directory(
+                input_path,
+                output,
+                recursive=recursive,
+                max_workers=jobs,
+                executor=executor,
+                retry_quarantined=retry_quarantined,
+                on_discovered=dashboard.discovered,
+                on_started=dashboard.started,
+                on_result=dashboard.finished,
+            )
+        results = report.results
+    elif input_path.is_dir():
+        results = convert_tree(input_path, recursive)
+    elif timeout or limits:
+        # Limits are enforced by killing a worker process, so even a single
+        # file goes through the pool (and the quarantine).
+        with console.status("转换文件..."):
+            results = converter.convert_directory(
+                input_path.parent,
+                output,
+                files=[input_path],
+                max_workers=1,
+                merged_path=merged_path,
+                retry_quarantined=retry_quarantined,
+            )
+    else:
+        with console.status("转换文件..."):
             results = [converter.convert_file(input_path, output)]
-            progress.update(task, completed=1)
+        if merged_path is not None:
+            with MergeWriter(merged_path) as writer:
+                writer.add(results[0])
+
+    wall_seconds = time.perf_counter() - started
+
+    if pdf_splitter is not None:
+        pdf_splitter.close()
+
+    if merged_path is not None:
+        console.print(f"[green]已生成合并文档[/green]: {merged_path}")
+    if report_path is not None:
+        write_report(report_path, results, report_base, wall_seconds)
+        console.print(f"[green]已生成运行报告[/green]: {report_path}")
 
     success_count = sum(1 for r in results if r.success)
     fail_count = len(results) - success_count
 
     console.print(f"\n[green]✓ 成功: {success_count}[/green]")
+    if report is not None:
+        console.print(f"[dim]- 未变化跳过: {report.skipped}[/dim]")
+        if report.removed:
+            console.print(f"[dim]- 已删除过期输出: {len(report.removed)}[/dim]")
     if fail_count:
         console.print(f"[red]✗ 失败: {fail_count}[/red]")
         for r in results:
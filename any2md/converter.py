@@ -1,15 +1,130 @@
 from pathlib import Path
-from typing import Optional
-from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, IO, Callable, Iterable, Iterator, Optional, Union
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+import codecs
 import errno
+import io
+import itertools
 import shutil
-import subprocess
-import tempfile
+import threading
 import os
 import sys
+import time
 
-from markitdown import MarkItDown
+from .cache import ConversionCache
+from .detect import (
+    TRUSTED_EXTENSIONS,
+    content_mismatch,
+    extension_trusted,
+    install_sniff_gate,
+    time_detection,
+)
+from .discovery import PREFETCH_SIZE, Prefetcher, iter_files
+from .manifest import SyncManifest
+from .merge import (
+    MERGE_HEADER,
+    MergeWriter,
+    format_merge_section,
+    merge_section_title,
+    result_markdown,
+)
+from .office import LEGACY_TARGETS, SofficePool, run_command
+from .pdf import PdfSplitter
+from .quarantine import Quarantine
+from .scheduler import ThroughputStats, iter_by_cost
+from .scratch import ScratchSpace, default_scratch
+from .tabular import TABLE_WRITERS, TableOptions, write_xls, write_xlsx
+from .unzipper import DEFAULT_SPILL_BYTES, Unzipper
+
+if TYPE_CHECKING:
+    from markitdown import MarkItDown, StreamInfo, UnsupportedFormatException
+
+    from .pool import WorkerLimits
+
+
+_MARKITDOWN_NAMES = ("MarkItDown", "StreamInfo", "UnsupportedFormatException")
+
+
+def __getattr__(name: str):
+    # `markitdown` imports pdfminer, magika, pptx, ... up front; it is loaded on
+    # the first conversion that needs it, not when this module is imported.
+    if name in _MARKITDOWN_NAMES:
+        import markitdown
+
+        value = getattr(markitdown, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _load_markitdown() -> None:
+    for name in _MARKITDOWN_NAMES:
+        if name not in globals():
+            __getattr__(name)
+
+
+MEMORY_ERROR = "内存超出限制"
+
+# Stages timed per file in `ConvertResult.timings`: waiting for a worker,
+# legacy Office pre-conversion, format detection, parsing, writing the .md.
+STAGES = ("queue", "legacy", "detect", "parse", "write")
+
+# Text formats whose UTF-8 content is already valid output and is copied as is.
+PASSTHROUGH_EXTENSIONS = {".md", ".txt"}
+_UTF8_CHECK_CHUNK = 1024 * 1024
+
+
+def _is_plain_utf8(stream: IO[bytes]) -> bool:
+    """True if the rest of `stream` is UTF-8 without a BOM; reads it in chunks."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    first = True
+    try:
+        while True:
+            chunk = stream.read(_UTF8_CHECK_CHUNK)
+            if first and chunk.startswith(codecs.BOM_UTF8):
+                return False
+            first = False
+            if not chunk:
+                decoder.decode(b"", final=True)
+                return True
+            decoder.decode(chunk)
+    except UnicodeDecodeError:
+        return False
+
+
+def _title(result) -> Optional[str]:
+    # Some converters return a BeautifulSoup string, which drags its whole
+    # document along and cannot be pickled back from worker processes.
+    title = getattr(result, "title", None)
+    return None if title is None else str(title)
+
+
+def _output_size(result: "ConvertResult") -> int:
+    if not result.success:
+        return 0
+    if result.output_path is not None:
+        try:
+            return result.output_path.stat().st_size
+        except OSError:
+            return 0
+    return len(result.markdown.encode("utf-8"))
+
+
+def _stream_size(stream: IO[bytes]) -> int:
+    try:
+        position = stream.tell()
+        size = stream.seek(0, os.SEEK_END) - position
+        stream.seek(position)
+        return size
+    except (OSError, ValueError, AttributeError):
+        return 0
 
 
 @dataclass
@@ -20,9 +135,55 @@ class ConvertResult:
     markdown: str = ""
     title: Optional[str] = None
     error: Optional[str] = None
+    timed_out: bool = False
+    elapsed: float = 0.0
+    # Seconds per stage (see STAGES); stages the file did not go through are absent.
+    timings: dict[str, float] = field(default_factory=dict)
+    input_bytes: int = 0
+    output_bytes: int = 0
+
+
+class _QueueClock:
+    """Time from a task being queued to a worker starting it, per input path."""
+
+    def __init__(self):
+        self._queued: dict[Path, float] = {}
+        self._waited: dict[Path, float] = {}
+
+    def queued(self, path: Path) -> None:
+        self._queued[path] = time.perf_counter()
+
+    def started(self, path: Path) -> None:
+        queued = self._queued.pop(path, None)
+        if queued is not None:
+            self._waited[path] = time.perf_counter() - queued
+
+    def stamp(self, result: "ConvertResult") -> None:
+        waited = self._waited.pop(result.input_path, None)
+        if waited is not None:
+            result.timings["queue"] = waited
+
+
+@dataclass
+class SyncReport:
+    results: list[ConvertResult] = field(default_factory=list)
+    skipped: int = 0
+    removed: list[Path] = field(default_factory=list)
 
 
 class Any2MDConverter:
+    """
+    Converts documents to markdown, one file at a time or in batches.
+
+    One converter may be used from several threads at once, which is how
+    `convert_directory` runs. Each thread gets its own MarkItDown instance
+    (`md`, built on first use in that thread), so parser state is never shared
+    between concurrent conversions. What is shared is the configuration and
+    the helpers handed in, which are thread-safe: the conversion cache, the
+    scratch space, the LibreOffice pool and the PDF splitter. Throughput stats
+    are only read and updated by the thread that started the batch.
+    """
+
     SUPPORTED_EXTENSIONS = {
         ".pdf",
         ".docx",
@@ -42,11 +203,148 @@ class Any2MDConverter:
         ".zip",
     }
 
+    EXECUTORS = ("thread", "process")
+
     _soffice_cache: Optional[str] = None
     _powershell_cache: Optional[str] = None
 
-    def __init__(self, enable_plugins: bool = False):
-        self.md = MarkItDown(enable_plugins=enable_plugins)
+    def __init__(
+        self,
+        enable_plugins: bool = False,
+        soffice_pool: Optional[SofficePool] = None,
+        cache: Optional[ConversionCache] = None,
+        timeout: Optional[float] = None,
+        worker_limits: Optional["WorkerLimits"] = None,
+        throughput: Optional[ThroughputStats] = None,
+        scratch: Optional[ScratchSpace] = None,
+        pdf_splitter: Optional[PdfSplitter] = None,
+        table_options: Optional[TableOptions] = None,
+        link_text: bool = False,
+        trust_extensions: bool = True,
+    ):
+        self.enable_plugins = enable_plugins
+        self.soffice_pool = soffice_pool
+        self.cache = cache
+        # Per-file wall-clock limit (seconds). External tools are killed when it
+        # expires; batch runs enforce it by killing the worker process.
+        self.timeout = timeout
+        # Memory ceilings and recycling for worker processes (see pool.WorkerLimits).
+        self.worker_limits = worker_limits
+        # Measured per-format throughput used to schedule long jobs first.
+        self.throughput = throughput
+        # Budget and location for temporary files (see scratch.ScratchSpace).
+        self.scratch = scratch or default_scratch()
+        # Page-range parallel conversion of large PDFs (see pdf.PdfSplitter).
+        self.pdf_splitter = pdf_splitter
+        # Row caps and cleanup for streamed spreadsheets (see tabular.TableOptions).
+        self.table_options = table_options or TableOptions()
+        # Hard-link UTF-8 .md/.txt inputs into the output instead of copying.
+        self.link_text = link_text
+        # Pick MarkItDown's converter from the suffix for well-known formats
+        # instead of running magika on every file (see detect.py).
+        self.trust_extensions = trust_extensions
+        self._local = threading.local()
+
+    @property
+    def md(self) -> "MarkItDown":
+        """This thread's MarkItDown instance, created on first use."""
+        md = getattr(self._local, "md", None)
+        if md is None:
+            _load_markitdown()
+            md = MarkItDown(enable_plugins=self.enable_plugins)
+            install_sniff_gate(md)
+            time_detection(md, self._timed)
+            self._local.md = md
+        return md
+
+    @contextmanager
+    def _timing(self) -> Iterator[dict[str, float]]:
+        """Collect the `_timed` stages of one conversion into the yielded dict."""
+        local = self._local
+        saved = getattr(local, "timings", None), getattr(local, "frames", None)
+        local.timings, local.frames = {}, []
+        try:
+            yield local.timings
+        finally:
+            local.timings, local.frames = saved
+
+    @contextmanager
+    def _timed(self, stage: str) -> Iterator[None]:
+        """
+        Charge the time spent in the block to `stage` of the current
+        conversion. Time spent in a nested stage counts for that stage only.
+        """
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            yield
+            return
+        frame = [time.perf_counter(), 0.0]  # start, time in nested stages
+        frames.append(frame)
+        try:
+            yield
+        finally:
+            frames.pop()
+            spent = time.perf_counter() - frame[0]
+            timings = self._local.timings
+            timings[stage] = timings.get(stage, 0.0) + spent - frame[1]
+            if frames:
+                frames[-1][1] += spent
+
+    def _markitdown(
+        self,
+        suffix: str,
+        source: Union[Path, IO[bytes]],
+        convert: Callable[["MarkItDown"], object],
+    ):
+        """
+        Run `convert(md)`, skipping content sniffing for trusted suffixes.
+        `source` is the file or the stream (at its start) being converted.
+        """
+        # Building this thread's MarkItDown on first use counts as parsing.
+        with self._timed("parse"):
+            md = self.md
+            if not (self.trust_extensions and suffix in TRUSTED_EXTENSIONS):
+                return convert(md)
+            start = None if isinstance(source, Path) else source.tell()
+            try:
+                with extension_trusted(md):
+                    return convert(md)
+            except MemoryError:
+                raise
+            except UnsupportedFormatException:
+                # The extension alone did not select a converter.
+                return convert(md)
+            except Exception:
+                # Only content that looks like another format is worth a
+                # second parse; a corrupt file would just fail again.
+                with self._source_stream(source, start) as stream:
+                    with self._timed("detect"), content_mismatch(md, stream, suffix) as other:
+                        if not other:
+                            raise
+                        with self._timed("parse"):
+                            return convert(md)
+
+    @staticmethod
+    @contextmanager
+    def _source_stream(source: Union[Path, IO[bytes]], start: Optional[int]) -> Iterator[IO[bytes]]:
+        if isinstance(source, Path):
+            with source.open("rb") as stream:
+                yield stream
+        else:
+            source.seek(start)
+            yield source
+
+    def _worker_options(self) -> dict:
+        # Constructor arguments for converters rebuilt inside worker processes.
+        return {
+            "enable_plugins": self.enable_plugins,
+            "cache": self.cache,
+            "timeout": self.timeout,
+            "scratch": self.scratch,
+            "table_options": self.table_options,
+            "link_text": self.link_text,
+            "trust_extensions": self.trust_extensions,
+        }
 
     def _find_powershell(self) -> Optional[str]:
         if Any2MDConverter._powershell_cache is not None:
@@ -173,10 +471,9 @@ if ($lastErr) {{ throw $lastErr }}
 throw "Office/WPS conversion failed"
 """
 
-        proc = subprocess.run(
+        proc = run_command(
             [powershell, "-NoProfile", "-NonInteractive", "-Command", script],
-            capture_output=True,
-            text=True,
+            timeout=self.timeout,
         )
         if proc.returncode != 0:
             stderr = (proc.stderr or "").strip()
@@ -226,7 +523,7 @@ throw "Office/WPS conversion failed"
             str(output_path),
         ]
 
-        proc = subprocess.run(cmd, capture_output=True, text=True)
+        proc = run_command(cmd, timeout=self.timeout)
         if proc.returncode != 0:
             stderr = (proc.stderr or "").strip()
             stdout = (proc.stdout or "").strip()
@@ -240,7 +537,12 @@ throw "Office/WPS conversion failed"
         input_path = Path(input_path)
         out_dir = Path(out_dir)
         suffix = input_path.suffix.lower()
-        target_ext = {".doc": "docx", ".ppt": "pptx", ".xls": "xlsx"}[suffix]
+        target_ext = LEGACY_TARGETS[suffix]
+
+        # A batch's own pool (see `_run_threads`) wins over the shared one.
+        soffice_pool = getattr(self._local, "soffice_pool", None) or self.soffice_pool
+        if soffice_pool is not None:
+            return soffice_pool.convert(input_path, out_dir)
 
         soffice = self._find_soffice()
         if soffice is None:
@@ -261,7 +563,7 @@ throw "Office/WPS conversion failed"
             str(out_dir),
             str(input_path),
         ]
-        proc = subprocess.run(cmd, capture_output=True, text=True)
+        proc = run_command(cmd, timeout=self.timeout)
         if proc.returncode != 0:
             stderr = (proc.stderr or "").strip()
             stdout = (proc.stdout or "").strip()
@@ -279,63 +581,220 @@ throw "Office/WPS conversion failed"
             return matches[0]
         raise RuntimeError("LibreOffice 转换未生成输出文件")
 
-    def _convert_xls_with_xlrd(self, input_path: Path) -> str:
+    def _convert_xls_with_xlrd(self, input_path: Path, out: IO[str]) -> None:
         try:
-            import xlrd  # type: ignore
+            import xlrd  # type: ignore  # noqa: F401
         except Exception as e:
             raise RuntimeError(
                 "缺少 `xlrd`，请安装 `any2md[legacy]` 或安装 LibreOffice 后重试"
             ) from e
 
-        book = xlrd.open_workbook(str(input_path))
-        if book.nsheets == 0:
-            return ""
-        sheet = book.sheet_by_index(0)
-
-        max_cols = sheet.ncols
-        rows: list[list[str]] = []
-        for r in range(sheet.nrows):
-            row = []
-            for c in range(max_cols):
-                val = sheet.cell_value(r, c)
-                row.append("" if val is None else str(val))
-            rows.append(row)
-
-        if not rows:
-            return ""
-
-        header = rows[0]
-        body = rows[1:] if len(rows) > 1 else []
-        lines = []
-        lines.append("| " + " | ".join(header) + " |")
-        lines.append("| " + " | ".join(["---"] * len(header)) + " |")
-        for row in body:
-            lines.append("| " + " | ".join(row) + " |")
-        return "\n".join(lines) + "\n"
+        write_xls(input_path, out, self.table_options)
+
+    def _open_output(
+        self, input_path: Path, output_dir: Path, binary: bool = False
+    ) -> tuple[Path, IO]:
+        def open_(path: Path) -> IO:
+            try:
+                if path.stat().st_nlink > 1:
+                    # A hard-linked output (see `link_text`) shares its inode with
+                    # the source; truncating it would overwrite the source file.
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+            return path.open("wb") if binary else path.open("w", encoding="utf-8")
 
-    def _write_markdown(
-        self, markdown_content: str, input_path: Path, output_dir: Optional[Path]
-    ) -> Optional[Path]:
-        if not output_dir:
-            return None
         output_dir = self._prepare_output_dir(output_dir)
         output_path = output_dir / f"{input_path.stem}.md"
         try:
-            output_path.write_text(markdown_content, encoding="utf-8")
+            return output_path, open_(output_path)
         except OSError as e:
             if e.errno in {errno.EROFS, errno.EACCES} and not output_dir.is_absolute():
                 output_dir = self._prepare_output_dir(Path.home() / output_dir)
                 output_path = output_dir / f"{input_path.stem}.md"
-                output_path.write_text(markdown_content, encoding="utf-8")
-            else:
-                raise
+                return output_path, open_(output_path)
+            raise
+
+    def _write_markdown(
+        self, markdown_content: str, input_path: Path, output_dir: Optional[Path]
+    ) -> Optional[Path]:
+        if not output_dir:
+            return None
+        with self._timed("write"):
+            output_path, fh = self._open_output(input_path, output_dir)
+            with fh:
+                fh.write(markdown_content)
         return output_path
 
+    def _convert_table(
+        self,
+        source: Union[Path, IO[bytes]],
+        input_path: Path,
+        output_dir: Optional[Path],
+    ) -> ConvertResult:
+        # Spreadsheets are streamed straight into the .md file; like process
+        # workers, the result then only points at it and `markdown` is empty.
+        # Reading and writing interleave, so both are timed as "parse".
+        writer = self._table_writer(input_path.suffix.lower())
+        if not output_dir:
+            buf = io.StringIO()
+            with self._timed("parse"):
+                writer(source, buf, self.table_options)
+            return ConvertResult(
+                success=True, input_path=input_path, markdown=buf.getvalue()
+            )
+        output_path, fh = self._open_output(input_path, output_dir)
+        try:
+            with fh, self._timed("parse"):
+                writer(source, fh, self.table_options)
+        except BaseException:
+            output_path.unlink(missing_ok=True)
+            raise
+        return ConvertResult(success=True, input_path=input_path, output_path=output_path)
+
+    def _legacy_intermediate(self, input_path: Path, out_dir: Path) -> Optional[Path]:
+        """Convert a legacy Office file to its OOXML counterpart in `out_dir`."""
+        try:
+            return self._convert_via_soffice(input_path, out_dir)
+        except Exception:
+            if sys.platform == "win32":
+                try:
+                    return self._convert_via_windows_com(input_path, out_dir)
+                except Exception:
+                    return None
+            if sys.platform == "darwin" and input_path.suffix.lower() == ".doc":
+                # macOS fallback: try textutil
+                try:
+                    return self._convert_via_textutil(input_path, out_dir)
+                except Exception:
+                    return None
+            return None
+
+    def _convert_legacy(self, input_path: Path) -> tuple[str, Optional[str]]:
+        legacy_suffix = input_path.suffix.lower()
+        try:
+            # The converted intermediate is about as large as the input.
+            reserve = input_path.stat().st_size
+        except OSError:
+            reserve = 0
+        with self.scratch.tempdir("any2md_lo_", reserve=reserve) as out_dir:
+            with self._timed("legacy"):
+                converted_path = self._legacy_intermediate(input_path, out_dir)
+            try:
+                if converted_path is None:
+                    raise RuntimeError("No legacy converter available")
+                result = self._markitdown(
+                    converted_path.suffix.lower(),
+                    converted_path,
+                    lambda md: md.convert(str(converted_path)),
+                )
+                return result.text_content or "", _title(result)
+            except Exception:
+                msg = "未检测到可用的旧格式转换器："
+                if sys.platform == "win32":
+                    msg += "Windows 请安装 Microsoft Office/WPS 或 LibreOffice"
+                elif sys.platform == "darwin":
+                    msg += "macOS 请安装 LibreOffice"
+                    if legacy_suffix == ".doc":
+                        msg += " (textutil fallback 同时也失败)"
+                else:
+                    msg += "Linux 请安装 LibreOffice"
+                raise RuntimeError(msg)
+
+    def _write_xls(
+        self, source: Union[Path, IO[bytes]], out: IO[str], options: TableOptions
+    ) -> None:
+        # Prefer the office suite's .xlsx (it keeps formatted values); xlrd is the
+        # fallback. Both paths stream every sheet row by row into `out`.
+        size = source.stat().st_size if isinstance(source, Path) else _stream_size(source)
+        with self.scratch.tempdir("any2md_lo_", reserve=size) as out_dir:
+            with self._timed("legacy"):
+                if not isinstance(source, Path):
+                    # The office-suite converters only work on real files.
+                    input_path = out_dir / "input.xls"
+                    with input_path.open("wb") as dst:
+                        shutil.copyfileobj(source, dst)
+                else:
+                    input_path = source
+                converted_path = self._legacy_intermediate(input_path, out_dir)
+            if converted_path is not None:
+                write_xlsx(converted_path, out, options)
+            else:
+                self._convert_xls_with_xlrd(input_path, out)
+
+    def _passthrough(
+        self, input_path: Path, output_dir: Path
+    ) -> Optional[ConvertResult]:
+        # UTF-8 text is already markdown-ready: copy it with a kernel-side copy
+        # (or hard-link it) instead of decoding it through MarkItDown. Other
+        # encodings return None and take the normal path.
+        with self._timed("detect"), input_path.open("rb") as f:
+            if not _is_plain_utf8(f):
+                return None
+        target = self._prepare_output_dir(output_dir) / f"{input_path.stem}.md"
+        if target.exists() and target.samefile(input_path):
+            return ConvertResult(success=True, input_path=input_path, output_path=target)
+
+        with self._timed("write"):
+            output_path, fh = self._open_output(input_path, output_dir, binary=True)
+            fh.close()
+            if self.link_text:
+                try:
+                    output_path.unlink()
+                    os.link(input_path, output_path)
+                    return ConvertResult(
+                        success=True, input_path=input_path, output_path=output_path
+                    )
+                except OSError:
+                    pass
+            shutil.copyfile(input_path, output_path)
+        return ConvertResult(success=True, input_path=input_path, output_path=output_path)
+
+    def _table_writer(self, suffix: str) -> Optional[Callable]:
+        if suffix == ".xls":
+            return self._write_xls
+        return TABLE_WRITERS.get(suffix)
+
+    def _convert_content(self, input_path: Path) -> tuple[str, Optional[str]]:
+        suffix = input_path.suffix.lower()
+        if suffix in LEGACY_TARGETS:
+            return self._convert_legacy(input_path)
+        if (
+            suffix == ".pdf"
+            and self.pdf_splitter is not None
+            and self.pdf_splitter.should_split(input_path)
+        ):
+            with self._timed("parse"):
+                return self.pdf_splitter.convert(input_path), None
+
+        result = self._markitdown(suffix, input_path, lambda md: md.convert(str(input_path)))
+        return result.text_content or "", _title(result)
+
+    def _cache_options(self) -> dict:
+        options = {"enable_plugins": self.enable_plugins}
+        if self.pdf_splitter is not None:
+            options["pdf_split"] = self.pdf_splitter.cache_tag()
+        return options
+
     def convert_file(
         self, input_path: Path, output_dir: Optional[Path] = None
     ) -> ConvertResult:
         input_path = Path(input_path)
+        started = time.perf_counter()
+        with self._timing() as timings:
+            result = self._convert_file(input_path, output_dir)
+        result.elapsed = time.perf_counter() - started
+        result.timings.update(timings)
+        try:
+            result.input_bytes = input_path.stat().st_size
+        except OSError:
+            pass
+        result.output_bytes = _output_size(result)
+        return result
 
+    def _convert_file(
+        self, input_path: Path, output_dir: Optional[Path]
+    ) -> ConvertResult:
         if not input_path.exists():
             return ConvertResult(
                 success=False, input_path=input_path, error=f"文件不存在: {input_path}"
@@ -349,71 +808,120 @@ throw "Office/WPS conversion failed"
             )
 
         try:
-            legacy_suffix = input_path.suffix.lower()
-            if legacy_suffix in {".doc", ".ppt", ".xls"}:
-                with tempfile.TemporaryDirectory(prefix="any2md_lo_") as td:
-                    out_dir = Path(td)
-                    try:
-                        converted_path = self._convert_via_soffice(input_path, out_dir)
-                    except Exception:
-                        if sys.platform == "win32":
-                            try:
-                                converted_path = self._convert_via_windows_com(
-                                    input_path, out_dir
-                                )
-                            except Exception:
-                                converted_path = None
-                        elif sys.platform == "darwin" and legacy_suffix == ".doc":
-                            # macOS fallback: try textutil
-                            try:
-                                converted_path = self._convert_via_textutil(
-                                    input_path, out_dir
-                                )
-                            except Exception:
-                                converted_path = None
-                        else:
-                            converted_path = None
-
-                    try:
-                        if converted_path is None:
-                            raise RuntimeError("No legacy converter available")
-                        result = self.md.convert(str(converted_path))
-                        markdown_content = result.text_content or ""
-                        title = getattr(result, "title", None)
-                    except Exception:
-                        if legacy_suffix != ".xls":
-                            msg = "未检测到可用的旧格式转换器："
-                            if sys.platform == "win32":
-                                msg += (
-                                    "Windows 请安装 Microsoft Office/WPS 或 LibreOffice"
-                                )
-                            elif sys.platform == "darwin":
-                                msg += "macOS 请安装 LibreOffice"
-                                if legacy_suffix == ".doc":
-                                    msg += " (textutil fallback 同时也失败)"
-                            else:
-                                msg += "Linux 请安装 LibreOffice"
-                            raise RuntimeError(msg)
-                        markdown_content = self._convert_xls_with_xlrd(input_path)
-                        title = input_path.stem
-
-                    output_path = self._write_markdown(
-                        markdown_content, input_path, output_dir
-                    )
+            if input_path.suffix.lower() in PASSTHROUGH_EXTENSIONS and output_dir:
+                result = self._passthrough(input_path, output_dir)
+                if result is not None:
+                    return result
+
+            if self._table_writer(input_path.suffix.lower()) is not None:
+                # Never cached: the point is not to hold the whole table in memory.
+                return self._convert_table(input_path, input_path, output_dir)
+
+            cache_key = None
+            cached = None
+            if self.cache is not None:
+                cache_key = self.cache.key_for(input_path, self._cache_options())
+                cached = self.cache.get(cache_key)
+
+            if cached is not None:
+                markdown_content, title = cached
+            else:
+                markdown_content, title = self._convert_content(input_path)
+                if cache_key is not None:
+                    self.cache.put(cache_key, markdown_content, title)
+
+            output_path = self._write_markdown(markdown_content, input_path, output_dir)
+
+            return ConvertResult(
+                success=True,
+                input_path=input_path,
+                output_path=output_path,
+                markdown=markdown_content,
+                title=title,
+            )
+        except MemoryError:
+            return ConvertResult(
+                success=False, input_path=input_path, error=MEMORY_ERROR
+            )
+        except Exception as e:
+            return ConvertResult(success=False, input_path=input_path, error=str(e))
+
+    def convert_stream(
+        self,
+        stream: IO[bytes],
+        input_path: Path,
+        output_dir: Optional[Path] = None,
+    ) -> ConvertResult:
+        """
+        Convert content that is not a file on disk, e.g. an archive member.
+
+        `input_path` is the logical path of the content: its suffix selects the
+        converter, its stem names the `.md` file and it is reported back in the
+        result, but nothing needs to exist there. The conversion cache only
+        applies to `convert_file`.
+        """
+        input_bytes = _stream_size(stream)
+        started = time.perf_counter()
+        with self._timing() as timings:
+            result = self._convert_stream(stream, Path(input_path), output_dir)
+        result.elapsed = time.perf_counter() - started
+        result.timings.update(timings)
+        result.input_bytes = input_bytes
+        result.output_bytes = _output_size(result)
+        return result
+
+    def _convert_stream(
+        self, stream: IO[bytes], input_path: Path, output_dir: Optional[Path]
+    ) -> ConvertResult:
+        if not self.can_convert(input_path):
+            return ConvertResult(
+                success=False,
+                input_path=input_path,
+                error=f"不支持的格式: {input_path.suffix}",
+            )
+
+        try:
+            suffix = input_path.suffix.lower()
+            if suffix in PASSTHROUGH_EXTENSIONS and output_dir:
+                start = stream.tell()
+                with self._timed("detect"):
+                    plain = _is_plain_utf8(stream)
+                stream.seek(start)
+                if plain:
+                    with self._timed("write"):
+                        output_path, fh = self._open_output(
+                            input_path, output_dir, binary=True
+                        )
+                        with fh:
+                            shutil.copyfileobj(stream, fh, _UTF8_CHECK_CHUNK)
                     return ConvertResult(
-                        success=True,
-                        input_path=input_path,
-                        output_path=output_path,
-                        markdown=markdown_content,
-                        title=title,
+                        success=True, input_path=input_path, output_path=output_path
                     )
+            if self._table_writer(suffix) is not None:
+                return self._convert_table(stream, input_path, output_dir)
+            if suffix in LEGACY_TARGETS:
+                # The office-suite converters only work on real files.
+                size = _stream_size(stream)
+                with self.scratch.tempdir("any2md_stream_", reserve=size) as td:
+                    temp_path = td / input_path.name
+                    with self._timed("legacy"), temp_path.open("wb") as dst:
+                        shutil.copyfileobj(stream, dst)
+                    markdown_content, title = self._convert_legacy(temp_path)
+            else:
+                start = stream.tell()
 
-            result = self.md.convert(str(input_path))
-            markdown_content = result.text_content or ""
-            title = getattr(result, "title", None)
+                def convert(md):
+                    stream.seek(start)
+                    return md.convert_stream(
+                        stream,
+                        stream_info=StreamInfo(extension=suffix, filename=input_path.name),
+                    )
 
-            output_path = self._write_markdown(markdown_content, input_path, output_dir)
+                result = self._markitdown(suffix, stream, convert)
+                markdown_content = result.text_content or ""
+                title = _title(result)
 
+            output_path = self._write_markdown(markdown_content, input_path, output_dir)
             return ConvertResult(
                 success=True,
                 input_path=input_path,
@@ -421,73 +929,457 @@ throw "Office/WPS conversion failed"
                 markdown=markdown_content,
                 title=title,
             )
+        except MemoryError:
+            return ConvertResult(
+                success=False, input_path=input_path, error=MEMORY_ERROR
+            )
         except Exception as e:
             return ConvertResult(success=False, input_path=input_path, error=str(e))
 
+    def convert_zip(
+        self,
+        zip_path: Path,
+        output_dir: Path,
+        max_workers: Optional[int] = None,
+        merged_path: Optional[Path] = None,
+        spill_threshold: int = DEFAULT_SPILL_BYTES,
+        on_discovered: Optional[Callable[[Path], None]] = None,
+        on_started: Optional[Callable[[int, Path], None]] = None,
+        on_result: Optional[Callable[[ConvertResult], None]] = None,
+    ) -> list[ConvertResult]:
+        """
+        Convert the supported members of a ZIP archive, including nested
+        archives, without extracting it.
+
+        Members are read straight from the archive into memory (or a temporary
+        file above `spill_threshold` bytes) and converted on a thread pool.
+        Results carry virtual input paths below `zip_path` (`a.zip/dir/b.pdf`)
+        and output mirrors the archive layout under `output_dir`, the same as
+        extracting with `Unzipper.extract_recursive` first. Progress callbacks,
+        `merged_path` and the emptied `markdown` work as in `convert_directory`,
+        except that virtual paths cannot be stat'ed, so the member's
+        uncompressed size is passed along: `on_discovered(path, size)`.
+        """
+        zip_path = Path(zip_path)
+        output_dir = Path(output_dir)
+        unzipper = Unzipper(spill_threshold=spill_threshold, scratch=self.scratch)
+        results: list[ConvertResult] = []
+        order: dict[Path, int] = {}
+        clock = _QueueClock()
+
+        def started(lane: int, path: Path) -> None:
+            clock.started(path)
+            if on_started is not None:
+                on_started(lane, path)
+
+        with self._merge_callbacks(
+            merged_path, zip_path, on_discovered, on_result
+        ) as (discovered, finished):
+
+            def emit(result: ConvertResult) -> None:
+                clock.stamp(result)
+                if finished is not None:
+                    finished(result)
+                if result.output_path is not None:
+                    result.markdown = ""
+                results.append(result)
+
+            def members():
+                for member in unzipper.iter_members(
+                    zip_path, predicate=lambda p: self.can_convert(Path(p.name))
+                ):
+                    virtual_path = zip_path / member.path
+                    order[virtual_path] = len(order)
+                    if discovered is not None:
+                        discovered(virtual_path, member.size)
+                    # Read the member here so workers never touch the archive,
+                    # which is closed once iteration moves past it.
+                    buf = member.spool(wait=True)
+                    clock.queued(virtual_path)
+                    yield virtual_path, buf, output_dir / member.path.parent
+
+            self._run_threads(
+                members(),
+                max_workers or 4,
+                emit,
+                started,
+                convert=self._convert_spooled,
+            )
+
+        results.sort(key=lambda r: order.get(r.input_path, len(order)))
+        return results
+
+    def _convert_spooled(
+        self, input_path: Path, buf: IO[bytes], output_dir: Path
+    ) -> ConvertResult:
+        with buf:
+            return self.convert_stream(buf, input_path, output_dir)
+
+    @contextmanager
+    def _merge_callbacks(
+        self,
+        merged_path: Optional[Path],
+        base_dir: Path,
+        on_discovered: Optional[Callable[[Path], None]],
+        on_result: Optional[Callable[[ConvertResult], None]],
+    ):
+        """Chain a `MergeWriter` in front of the caller's progress callbacks."""
+        if merged_path is None:
+            yield on_discovered, on_result
+            return
+
+        with MergeWriter(merged_path, base_dir) as writer:
+
+            def discovered(path: Path, *size: int) -> None:
+                writer.expect(path)
+                if on_discovered is not None:
+                    on_discovered(path, *size)
+
+            def finished(result: ConvertResult) -> None:
+                writer.add(result)
+                if on_result is not None:
+                    on_result(result)
+
+            yield discovered, finished
+
     def convert_directory(
         self,
         input_dir: Path,
         output_dir: Path,
         recursive: bool = True,
-        max_workers: int = 4,
+        max_workers: Optional[int] = None,
+        executor: str = "thread",
+        merged_path: Optional[Path] = None,
+        retry_quarantined: bool = False,
+        on_discovered: Optional[Callable[[Path], None]] = None,
+        on_started: Optional[Callable[[int, Path], None]] = None,
+        on_result: Optional[Callable[[ConvertResult], None]] = None,
+        files: Optional[Iterable[Path]] = None,
+        archive: Optional[Path] = None,
     ) -> list[ConvertResult]:
+        """
+        Convert every supported file under `input_dir`.
+
+        Files are discovered with a streaming directory scan that feeds the
+        workers directly, so conversion starts before the scan has finished.
+        Results come back sorted by relative input path. With `merged_path`, every
+        document is also appended to one merged markdown file in that same order
+        as soon as it is ready.
+
+        `executor="thread"` shares this converter across a thread pool (4 workers
+        by default). `executor="process"` runs one converter per process (one per
+        CPU core by default); workers write their `.md` files themselves and only
+        send metadata back. In both modes `ConvertResult.markdown` is emptied once
+        the file is written and `on_result` has seen it; read `output_path` (or
+        use `merge.result_markdown`) for the content.
+
+        When the converter has a `timeout`, files always run in killable worker
+        processes. Files that time out are recorded in a quarantine list in
+        `output_dir` and skipped by later runs unless `retry_quarantined` is set.
+
+        Progress callbacks: `on_discovered(path)` fires as the scan finds a file,
+        `on_started(lane, path)` when a worker picks it up (`lane` is a stable
+        worker index from 0), and `on_result(result)` when it is done. Only
+        `on_started` may be called from a worker thread.
+
+        `files` replaces the directory scan with a known list of files under
+        `input_dir`, e.g. what `Unzipper.extract_selective` returned. Set
+        `archive` when `input_dir` is a temporary extraction of that ZIP, so
+        its quarantined members are recognised on later runs.
+        """
         input_dir = Path(input_dir)
         output_dir = Path(output_dir)
+        quarantine = Quarantine.for_output_dir(output_dir)
+        if archive is not None:
+            quarantine.add_archive(input_dir, archive)
 
-        pattern = "**/*" if recursive else "*"
-        files_to_convert = [
-            (file_path, output_dir / file_path.relative_to(input_dir).parent)
-            for file_path in input_dir.glob(pattern)
-            if file_path.is_file() and self.can_convert(file_path)
-        ]
+        if files is not None:
+            source = iter(files)
+        else:
+            source = self._iter_convertible(input_dir, recursive)
+        with Prefetcher(source) as found:
+            files_to_convert = (
+                (fp, output_dir / fp.relative_to(input_dir).parent) for fp in found
+            )
+            with self._merge_callbacks(
+                merged_path, input_dir, on_discovered, on_result
+            ) as (discovered, finished):
+                return self._convert_many(
+                    files_to_convert,
+                    max_workers,
+                    executor,
+                    on_result=finished,
+                    on_discovered=discovered,
+                    on_started=on_started,
+                    quarantine=quarantine,
+                    retry_quarantined=retry_quarantined,
+                )
+
+    def sync_directory(
+        self,
+        input_dir: Path,
+        output_dir: Path,
+        recursive: bool = True,
+        max_workers: Optional[int] = None,
+        executor: str = "thread",
+        retry_quarantined: bool = False,
+        on_discovered: Optional[Callable[[Path], None]] = None,
+        on_started: Optional[Callable[[int, Path], None]] = None,
+        on_result: Optional[Callable[[ConvertResult], None]] = None,
+    ) -> SyncReport:
+        """
+        Incremental `convert_directory`: only new or changed inputs are converted,
+        and outputs whose source disappeared are deleted. State is kept in a
+        manifest file inside `output_dir`. The progress callbacks work as in
+        `convert_directory` and only see files that actually need converting.
+        """
+        input_dir = Path(input_dir)
+        output_dir = Path(output_dir)
+        manifest = SyncManifest(output_dir).load()
+        report = SyncReport()
 
-        if not files_to_convert:
-            return []
+        seen: set[str] = set()
+        pending: dict[Path, str] = {}
+
+        def changed_files(files):
+            for file_path in files:
+                rel = file_path.relative_to(input_dir).as_posix()
+                seen.add(rel)
+                try:
+                    st = file_path.stat()
+                except OSError:
+                    continue
+                if manifest.is_current(rel, file_path, st):
+                    report.skipped += 1
+                    continue
+                pending[file_path] = rel
+                yield file_path, output_dir / file_path.relative_to(input_dir).parent
+
+        try:
+            with Prefetcher(self._iter_convertible(input_dir, recursive)) as files:
+                report.results = self._convert_many(
+                    changed_files(files),
+                    max_workers,
+                    executor,
+                    on_result=on_result,
+                    on_discovered=on_discovered,
+                    on_started=on_started,
+                    quarantine=Quarantine.for_output_dir(output_dir),
+                    retry_quarantined=retry_quarantined,
+                )
+            for r in report.results:
+                rel = pending[r.input_path]
+                if r.success:
+                    manifest.record(rel, r.input_path, r.output_path)
+                else:
+                    manifest.forget(rel)
+            report.removed = manifest.prune(seen, recursive=recursive)
+        finally:
+            manifest.save()
+        return report
+
+    def _iter_convertible(self, input_dir: Path, recursive: bool) -> Iterator[Path]:
+        return iter_files(input_dir, recursive=recursive, predicate=self.can_convert)
+
+    def _convert_many(
+        self,
+        files_to_convert: Iterable[tuple[Path, Path]],
+        max_workers: Optional[int],
+        executor: str,
+        on_result: Optional[Callable[[ConvertResult], None]] = None,
+        on_discovered: Optional[Callable[[Path], None]] = None,
+        on_started: Optional[Callable[[int, Path], None]] = None,
+        quarantine: Optional[Quarantine] = None,
+        retry_quarantined: bool = False,
+    ) -> list[ConvertResult]:
+        """
+        Convert `(input_path, output_dir)` pairs while they are still being
+        produced. Inputs are pulled lazily, so a directory scan feeding this
+        method overlaps with conversion and only a bounded window of pending
+        work is held at any time.
+        """
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor}")
+
+        use_processes = bool(
+            executor == "process" or self.timeout or self.worker_limits
+        )
+        if use_processes:
+            workers = max_workers or (4 if executor == "thread" else os.cpu_count() or 1)
+        else:
+            workers = max_workers or 4
 
         results: list[ConvertResult] = []
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(self.convert_file, fp, od): fp
-                for fp, od in files_to_convert
-            }
-            for future in as_completed(futures):
-                results.append(future.result())
+        order: dict[Path, int] = {}
+        clock = _QueueClock()
+
+        def started(lane: int, path: Path) -> None:
+            clock.started(path)
+            if on_started is not None:
+                on_started(lane, path)
+
+        def emit(result: ConvertResult) -> None:
+            clock.stamp(result)
+            if quarantine is not None:
+                if result.timed_out:
+                    quarantine.add(result.input_path, result.error or "timeout")
+                elif result.success:
+                    quarantine.discard(result.input_path)
+            if on_result is not None:
+                on_result(result)
+            # The .md file is on disk; don't keep the whole corpus in memory.
+            if result.output_path is not None:
+                result.markdown = ""
+            results.append(result)
+
+        def admitted():
+            for fp, od in files_to_convert:
+                order[fp] = len(order)
+                if on_discovered is not None:
+                    on_discovered(fp)
+                if (
+                    quarantine is not None
+                    and not retry_quarantined
+                    and quarantine.contains(fp)
+                ):
+                    emit(
+                        ConvertResult(
+                            success=False,
+                            input_path=fp,
+                            error="已跳过：该文件此前转换超时被隔离（可使用 --retry-quarantined 重试）",
+                        )
+                    )
+                    continue
+                clock.queued(fp)
+                yield fp, od
+
+        # Longest estimated job first among everything the scanner may have
+        # buffered, so a huge file found late still starts early; memory stays
+        # bounded by the window.
+        tasks = iter_by_cost(
+            admitted(),
+            window=max(PREFETCH_SIZE, workers * 4),
+            key=lambda item: item[0],
+            stats=self.throughput,
+        )
 
+        try:
+            if use_processes:
+                # Timeouts and memory limits need workers that can be killed,
+                # i.e. processes.
+                from .pool import WorkerPool
+
+                with WorkerPool(
+                    workers,
+                    self._worker_options(),
+                    timeout=self.timeout,
+                    limits=self.worker_limits,
+                ) as pool:
+
+                    def on_assign(lane: int, task: tuple[Path, Path]) -> None:
+                        started(lane, task[0])
+
+                    for result in pool.imap_unordered(tasks, on_assign=on_assign):
+                        emit(result)
+            else:
+                self._run_threads(tasks, workers, emit, started)
+        finally:
+            if quarantine is not None:
+                quarantine.save()
+            if self.throughput is not None:
+                self._record_throughput(results)
+
+        results.sort(key=lambda r: order.get(r.input_path, len(order)))
         return results
 
+    def _record_throughput(self, results: list[ConvertResult]) -> None:
+        for r in results:
+            if not r.success or r.elapsed <= 0:
+                continue
+            try:
+                size = r.input_path.stat().st_size
+            except OSError:
+                continue
+            self.throughput.record(r.input_path.suffix, size, r.elapsed)
+        try:
+            self.throughput.save()
+        except OSError:
+            pass
+
+    def _run_threads(
+        self,
+        tasks: Iterable[tuple],
+        workers: int,
+        emit: Callable[[ConvertResult], None],
+        on_started: Optional[Callable[[int, Path], None]] = None,
+        convert: Optional[Callable[..., ConvertResult]] = None,
+    ) -> None:
+        """
+        Run `convert(*task)` (default `convert_file(input_path, output_dir)`)
+        for every task on a thread pool; the first element of each task is the
+        input path.
+        """
+        convert = convert or self.convert_file
+        lanes = itertools.count()
+        local = threading.local()
+
+        own_soffice_pool = None
+        soffice = self._find_soffice() if self.soffice_pool is None else None
+        if soffice:
+            # Fewer soffice slots than threads, so concurrent legacy files queue
+            # up and get batched into one soffice run. Slots only start once a
+            # legacy file actually shows up. The pool is only handed to this
+            # batch's threads; other callers sharing the converter keep theirs.
+            own_soffice_pool = SofficePool(
+                soffice, size=max(1, workers // 2), timeout=self.timeout
+            )
+
+        def run(*task) -> ConvertResult:
+            self._local.soffice_pool = own_soffice_pool
+            try:
+                if on_started is not None:
+                    lane = getattr(local, "lane", None)
+                    if lane is None:
+                        lane = local.lane = next(lanes)
+                    on_started(lane, task[0])
+                return convert(*task)
+            finally:
+                self._local.soffice_pool = None
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                in_flight: set = set()
+                for task in tasks:
+                    if len(in_flight) >= workers * 2:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            emit(future.result())
+                    in_flight.add(pool.submit(run, *task))
+                for future in as_completed(in_flight):
+                    emit(future.result())
+        finally:
+            if own_soffice_pool is not None:
+                own_soffice_pool.close()
+
     def merge_markdown(
         self, results: list[ConvertResult], base_dir: Optional[Path]
     ) -> str:
         base_dir_path = Path(base_dir) if base_dir else None
 
-        parts: list[str] = []
-        parts.append("# Any2MD 合并文档\n")
-
+        parts: list[str] = [MERGE_HEADER]
         for r in results:
             if not r.success:
                 continue
-            try:
-                rel = (
-                    str(r.input_path.relative_to(base_dir_path))
-                    if base_dir_path is not None
-                    else r.input_path.name
-                )
-            except Exception:
-                rel = r.input_path.name
-
-            parts.append(f"\n---\n\n## {rel}\n")
-            if r.title:
-                parts.append(f"\n**标题**：{r.title}\n")
-            parts.append("\n")
-            parts.append((r.markdown or "").rstrip() + "\n")
+            rel = merge_section_title(r.input_path, base_dir_path)
+            parts.append(format_merge_section(rel, r.title, result_markdown(r)))
 
         return "".join(parts)
 
     def write_merged_markdown(
         self, results: list[ConvertResult], merged_path: Path, base_dir: Optional[Path]
     ) -> Path:
-        merged_path = Path(merged_path)
-        merged_path.parent.mkdir(parents=True, exist_ok=True)
-        content = self.merge_markdown(results=results, base_dir=base_dir)
-        merged_path.write_text(content, encoding="utf-8")
-        return merged_path
+        with MergeWriter(merged_path, base_dir) as writer:
+            for r in results:
+                writer.add(r)
+        return Path(merged_path)
+
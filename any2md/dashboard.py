@@ -0,0 +1,151 @@
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.progress_bar import ProgressBar
+from rich.table import Table
+from rich.text import Text
+
+from .converter import ConvertResult
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+class ConvertDashboard:
+    """
+    Live terminal view of a batch conversion.
+
+    Shows one lane per worker with the file it is on and for how long (lanes
+    busy for more than `stall_seconds` are highlighted), plus overall progress,
+    files/s, MB/s and an ETA based on the bytes still to convert. The
+    `discovered` / `started` / `finished` methods match the progress callbacks
+    of `Any2MDConverter.convert_directory` / `convert_zip` and are thread-safe.
+    """
+
+    def __init__(
+        self,
+        console: Optional[Console] = None,
+        refresh_per_second: float = 4,
+        stall_seconds: float = 30.0,
+    ):
+        self.stall_seconds = stall_seconds
+        self.files_total = 0
+        self.bytes_total = 0
+        self.files_done = 0
+        self.bytes_done = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._sizes: dict[Path, int] = {}
+        self._lanes: dict[int, Optional[tuple[Path, float]]] = {}
+        self._lane_of: dict[Path, int] = {}
+        self._started_at = time.monotonic()
+        self._live = Live(
+            self, console=console, refresh_per_second=refresh_per_second
+        )
+
+    def discovered(self, path: Path, size: Optional[int] = None) -> None:
+        if size is None:
+            try:
+                size = path.stat().st_size
+            except OSError:
+                size = 0
+        with self._lock:
+            self._sizes[path] = size
+            self.files_total += 1
+            self.bytes_total += size
+
+    def started(self, lane: int, path: Path) -> None:
+        with self._lock:
+            previous = self._lanes.get(lane)
+            if previous is not None:
+                self._lane_of.pop(previous[0], None)
+            self._lanes[lane] = (path, time.monotonic())
+            self._lane_of[path] = lane
+
+    def finished(self, result: ConvertResult) -> None:
+        with self._lock:
+            self.files_done += 1
+            self.bytes_done += self._sizes.pop(result.input_path, 0)
+            if not result.success:
+                self.failed += 1
+            lane = self._lane_of.pop(result.input_path, None)
+            if lane is not None:
+                self._lanes[lane] = None
+
+    def rates(self) -> tuple[float, float, Optional[float]]:
+        """Files per second, bytes per second and the estimated seconds left."""
+        elapsed = max(time.monotonic() - self._started_at, 1e-6)
+        with self._lock:
+            files_per_sec = self.files_done / elapsed
+            bytes_per_sec = self.bytes_done / elapsed
+            if self.bytes_done and self.bytes_total:
+                eta = (self.bytes_total - self.bytes_done) / bytes_per_sec
+            elif self.files_done:
+                eta = (self.files_total - self.files_done) / files_per_sec
+            else:
+                eta = None
+        return files_per_sec, bytes_per_sec, eta
+
+    def __rich__(self) -> Group:
+        files_per_sec, bytes_per_sec, eta = self.rates()
+        now = time.monotonic()
+        with self._lock:
+            summary = Text.assemble(
+                (f"{self.files_done}/{self.files_total}", "bold"),
+                "  ",
+                (f"{files_per_sec:.1f}", "cyan"),
+                " 文件/s  ",
+                (f"{bytes_per_sec / (1024 * 1024):.2f}", "cyan"),
+                " MB/s  剩余 ",
+                (format_eta(eta), "cyan"),
+            )
+            if self.failed:
+                summary.append(f"  失败 {self.failed}", style="red")
+            header = Table.grid(padding=(0, 2))
+            header.add_column(width=24)
+            header.add_column(no_wrap=True, overflow="ellipsis")
+            header.add_row(
+                ProgressBar(
+                    total=max(self.files_total, 1),
+                    completed=self.files_done,
+                ),
+                summary,
+            )
+
+            lanes = Table.grid(padding=(0, 2))
+            lanes.add_column(justify="right", style="dim")
+            lanes.add_column(justify="right")
+            lanes.add_column(no_wrap=True, overflow="ellipsis")
+            for lane in sorted(self._lanes):
+                current = self._lanes[lane]
+                if current is None:
+                    lanes.add_row(f"#{lane + 1}", "", Text("空闲", style="dim"))
+                    continue
+                path, started = current
+                busy = now - started
+                style = "yellow" if busy >= self.stall_seconds else ""
+                lanes.add_row(f"#{lane + 1}", Text(f"{busy:.0f}s", style=style), path.name)
+        return Group(header, lanes)
+
+    def __enter__(self):
+        self._started_at = time.monotonic()
+        self._live.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._live.stop()
+        if not self._live.console.is_terminal:
+            # Live leaves the final frame without a trailing newline in logs.
+            self._live.console.line()
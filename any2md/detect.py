@@ -0,0 +1,118 @@
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import BinaryIO, Callable, ContextManager, Iterator
+
+
+# Suffixes whose MarkItDown converter is chosen reliably from the extension
+# alone. Legacy Office formats are not listed: they are converted by an office
+# suite first, and exports named .xls are often HTML or CSV in disguise.
+TRUSTED_EXTENSIONS = frozenset(
+    {
+        ".pdf",
+        ".docx",
+        ".pptx",
+        ".xlsx",
+        ".html",
+        ".htm",
+        ".xml",
+        ".json",
+        ".csv",
+        ".txt",
+        ".md",
+    }
+)
+
+# Anything but status "ok" makes MarkItDown fall back to the extension guess.
+_SKIPPED = SimpleNamespace(status="skipped")
+
+
+class _SniffGate:
+    """
+    Stands in for MarkItDown's magika instance and skips content
+    identification for the calls made inside `extension_trusted()`.
+    """
+
+    def __init__(self, magika):
+        self._magika = magika
+        self._local = threading.local()
+
+    def identify_stream(self, stream):
+        if getattr(self._local, "skip", False):
+            return _SKIPPED
+        known = getattr(self._local, "known", None)
+        if known is not None:
+            return known
+        return self._magika.identify_stream(stream)
+
+    def __getattr__(self, name):
+        return getattr(self._magika, name)
+
+
+def install_sniff_gate(md) -> None:
+    """Let `extension_trusted()` bypass content sniffing on this instance."""
+    magika = getattr(md, "_magika", None)
+    if magika is not None and not isinstance(magika, _SniffGate):
+        md._magika = _SniffGate(magika)
+
+
+def time_detection(md, timer: Callable[[str], ContextManager]) -> None:
+    """
+    Run MarkItDown's format detection on this instance inside `timer("detect")`
+    so it can be told apart from parsing.
+    """
+    guesses = getattr(md, "_get_stream_info_guesses", None)
+    if guesses is None or getattr(guesses, "_any2md_timed", False):
+        return
+
+    def timed(*args, **kwargs):
+        with timer("detect"):
+            return guesses(*args, **kwargs)
+
+    timed._any2md_timed = True
+    md._get_stream_info_guesses = timed
+
+
+@contextmanager
+def extension_trusted(md) -> Iterator[None]:
+    """
+    Convert with MarkItDown's format detection limited to the file extension:
+    the magika model is not run on the content. Instances without the gate
+    (or MarkItDown versions that detect differently) convert as usual.
+    """
+    gate = getattr(md, "_magika", None)
+    if not isinstance(gate, _SniffGate):
+        yield
+        return
+    gate._local.skip = True
+    try:
+        yield
+    finally:
+        gate._local.skip = False
+
+
+@contextmanager
+def content_mismatch(md, stream: BinaryIO, suffix: str) -> Iterator[bool]:
+    """
+    Identify the content of `stream` and yield whether it looks like a format
+    other than `suffix`. Conversions inside the block reuse that result instead
+    of running the model again. Without the gate the answer is always True.
+    """
+    gate = getattr(md, "_magika", None)
+    if not isinstance(gate, _SniffGate):
+        yield True
+        return
+    pos = stream.tell()
+    try:
+        result = gate._magika.identify_stream(stream)
+    finally:
+        stream.seek(pos)
+    output = getattr(result, "prediction", None) and result.prediction.output
+    if result.status != "ok" or output is None or output.label == "unknown":
+        yield False
+        return
+    gate._local.known = result
+    try:
+        yield suffix.lstrip(".") not in output.extensions
+    finally:
+        gate._local.known = None
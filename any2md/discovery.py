@@ -0,0 +1,130 @@
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+# Items a `Prefetcher` buffers ahead of its consumer by default.
+PREFETCH_SIZE = 1024
+
+_DONE = object()
+
+
+def iter_files(
+    root: Path,
+    recursive: bool = True,
+    predicate: Optional[Callable[[Path], bool]] = None,
+    skip_hidden_dirs: bool = False,
+    follow_symlinks: bool = False,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[Path]:
+    """
+    Yield files under `root` as the directory tree is scanned.
+
+    Uses `os.scandir` with an explicit stack, so memory stays proportional to the
+    tree depth rather than the file count. Entries of each directory are visited
+    in name order, which makes the output order deterministic (the same order as
+    `sorted()` on the resulting paths). Symlinked directories are followed only
+    with `follow_symlinks` (each directory at most once, so links back up the
+    tree do not loop) and unreadable directories are skipped.
+    """
+    root = Path(root)
+    stack: list[Iterator[os.DirEntry]] = []
+    seen: set[tuple[int, int]] = set()
+
+    def open_dir(path: Path) -> None:
+        try:
+            if follow_symlinks:
+                st = path.stat()
+                if (st.st_dev, st.st_ino) in seen:
+                    return
+                seen.add((st.st_dev, st.st_ino))
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return
+        stack.append(iter(entries))
+
+    open_dir(root)
+    while stack:
+        if should_stop is not None and should_stop():
+            return
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=follow_symlinks):
+                if recursive and not (skip_hidden_dirs and entry.name.startswith(".")):
+                    open_dir(Path(entry.path))
+                continue
+            if not entry.is_file():
+                continue
+        except OSError:
+            continue
+        path = Path(entry.path)
+        if predicate is None or predicate(path):
+            yield path
+
+
+class Prefetcher(Iterator[T]):
+    """
+    Runs an iterator in a background thread and hands its items over through a
+    bounded queue, so a slow producer (e.g. a directory scan) overlaps with the
+    consumer while holding at most `maxsize` items in memory.
+    """
+
+    def __init__(self, source: Iterable[T], maxsize: int = PREFETCH_SIZE):
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run, args=(iter(source),), name="any2md-discovery", daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, source: Iterator[T]) -> None:
+        try:
+            for item in source:
+                if not self._put(item):
+                    return
+        except BaseException as e:  # re-raised in the consumer
+            self._error = e
+        finally:
+            self._put(_DONE)
+
+    def __iter__(self) -> "Prefetcher[T]":
+        return self
+
+    def __next__(self) -> T:
+        if self._stop.is_set():
+            raise StopIteration
+        item = self._queue.get()
+        if item is _DONE:
+            self._stop.set()
+            if self._error is not None:
+                raise self._error
+            raise StopIteration
+        return item
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
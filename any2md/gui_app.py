@@ -2,6 +2,9 @@ import sys
 from pathlib import Path
 from typing import Optional, List, Dict
 import os
+import threading
+import time
+from collections import deque
 
 from PyQt6.QtWidgets import (
     QApplication,
@@ -27,7 +30,7 @@ from PyQt6.QtWidgets import (
     QTableWidgetItem,
     QHeaderView,
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl, QPoint
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal, QUrl, QPoint
 from PyQt6.QtGui import (
     QDragEnterEvent,
     QDropEvent,
@@ -38,6 +41,9 @@ from PyQt6.QtGui import (
 )
 
 from .converter import Any2MDConverter, ConvertResult
+from .discovery import iter_files
+from .merge import MergeWriter
+from .pool import WorkerPool
 
 
 # --- 2025 Design System: "Morning Light" ---
@@ -308,140 +314,214 @@ class PreScanner(QThread):
         self._stop = True
 
     def run(self):
-        found = []
-        # Support extensions from Any2MDConverter (mocked list here as we don't import internals of converter easily)
-        # Assuming we know typical extensions
-        valid_exts = Any2MDConverter.SUPPORTED_EXTENSIONS
+        valid_exts = set(Any2MDConverter.SUPPORTED_EXTENSIONS) | {".zip"}
+        batch: List[FileItemData] = []
+        last_emit = time.monotonic()
 
-        def scan_dir(d: Path, root: Path):
-            try:
-                for entry in os.scandir(d):
-                    if self._stop:
-                        return
-                    p = Path(entry.path)
-                    if entry.is_dir() and not entry.name.startswith("."):
-                        scan_dir(p, root)
-                    elif entry.is_file():
-                        if p.suffix.lower() in valid_exts or p.suffix.lower() == ".zip":
-                            found.append(FileItemData(p, relative_to=root))
-            except PermissionError:
-                pass
+        def flush():
+            nonlocal batch, last_emit
+            if batch:
+                self.files_found.emit(batch)
+                batch = []
+            last_emit = time.monotonic()
 
         for path in self.raw_paths:
             if self._stop:
                 break
             if path.is_file():
-                found.append(FileItemData(path, relative_to=path.parent))
+                batch.append(FileItemData(path, relative_to=path.parent))
             elif path.is_dir():
-                scan_dir(path, path)
-
-        self.files_found.emit(found)
+                # Hand results to the list in small batches while the scan is
+                # still running, so large folders show up immediately.
+                for p in iter_files(
+                    path,
+                    predicate=lambda p: p.suffix.lower() in valid_exts,
+                    skip_hidden_dirs=True,
+                    follow_symlinks=True,
+                    should_stop=lambda: self._stop,
+                ):
+                    batch.append(FileItemData(p, relative_to=path))
+                    if len(batch) >= 500 or time.monotonic() - last_emit > 0.2:
+                        flush()
+
+        flush()
         self.finished_scan.emit()
 
 
+class SessionPool:
+    """
+    The worker pool shared by every conversion of a GUI session.
+
+    `warm_up()` starts a few workers in the background right after the window
+    is shown, so they have MarkItDown loaded by the time the first batch is
+    dropped in. A cancelled run kills its workers; the pool is then replaced.
+    """
+
+    WARM_WORKERS = 2
+
+    def __init__(self):
+        self._pool: Optional[WorkerPool] = None
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        threading.Thread(target=self.get, name="any2md-warmup", daemon=True).start()
+
+    def get(self) -> WorkerPool:
+        with self._lock:
+            if self._pool is None or self._pool.cancelled:
+                if self._pool is not None:
+                    self._pool.close()
+                pool = WorkerPool(os.cpu_count() or 1, preload=True)
+                pool.start(self.WARM_WORKERS)
+                self._pool = pool
+            return self._pool
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
+
 class ConvertWorker(QThread):
-    file_started = pyqtSignal(str)  # path string
-    file_finished = pyqtSignal(str, bool, str)  # path string, success, error_msg
+    files_started = pyqtSignal(list)  # [path string]
+    files_finished = pyqtSignal(list)  # [(path string, success, error_msg)]
     progress_global = pyqtSignal(int, int)  # current, total
     finished_all = pyqtSignal(list)  # list[ConvertResult]
     error_critical = pyqtSignal(str)
 
+    # Per-file events are queued by the conversion thread and delivered to the UI
+    # in batches by a timer, so thousands of small files do not flood the event
+    # loop with signals.
+    FLUSH_INTERVAL_MS = 33
+
     def __init__(
-        self, items: List[FileItemData], output_path: Path, merge: bool, merge_name: str
+        self,
+        items: List[FileItemData],
+        output_path: Path,
+        merge: bool,
+        merge_name: str,
+        session: SessionPool,
     ):
         super().__init__()
         self.items = items
+        self.session = session
         self.output_path = output_path
         self.merge = merge
         self.merge_name = merge_name
         self._stop = False
+        self._pool: Optional[WorkerPool] = None
+        self._events: deque = deque()
+        self._done = 0
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._stop
+
+    def start(self, *args, **kwargs):
+        self._flush_timer.start()
+        super().start(*args, **kwargs)
 
     def stop(self):
+        """Cancel the run; conversions already in progress are killed."""
         self._stop = True
-
-    def run(self):
-        try:
-            converter = Any2MDConverter()
-            results = []
-
-            total = len(self.items)
-
-            # For merge base dir, verify logic
-            if self.items:
-                # Find common ancestor? Simplification: use the relative_to of the first item main request?
-                # Actually, Converter's merge needs relative paths.
-                # We can't easily guess the "session root" if mixed files are dropped.
-                # So we pass None as base_dir to write_merged_markdown to disable structure preservation inside merge?
-                # OR we try to determine common path.
-                try:
-                    common_path = Path(
-                        os.path.commonpath([str(i.path.parent) for i in self.items])
-                    )
-                except Exception:
-                    common_path = None
+        pool = self._pool
+        if pool is not None:
+            pool.cancel()
+
+    def _flush(self):
+        started: List[str] = []
+        finished: List[tuple] = []
+        final = None
+        while self._events:
+            kind, payload = self._events.popleft()
+            if kind == "started":
+                started.append(payload)
+            elif kind == "finished":
+                finished.append(payload)
             else:
-                common_path = None
-
-            for i, item in enumerate(self.items):
-                if self._stop:
-                    break
-
-                self.progress_global.emit(i + 1, total)
-                self.file_started.emit(str(item.path))
-
-                try:
-                    # Logic needs to handle Zips?
-                    # If item is a zip, we should probably handle it specially or let converter handle it.
-                    # Current Converter `convert_file` doesn't auto-unpack zips unless using `convert_directory` logic.
-                    # But for now let's assume `convert_file` handles simple files.
-                    # If it's a zip and user wants to convert content, we might have complexity here.
-                    # Simplification: If zip, we just ignore for now or treat as file if backend supports it.
-                    # Assuming backend supports generic file conversion.
-
-                    if item.path.suffix.lower() == ".zip":
-                        # If it's a zip, extracting it might generate MULTIPLE results from ONE item.
-                        # This complicates 1-1 mapping in list.
-                        # For V5, lets stick to direct conversion. If Any2MDConverter supports zip->folder conversion, strict 1-1.
-                        pass
-
-                    res = converter.convert_file(item.path, self.output_path)
-
-                    # Update status
-                    if res.success:
-                        self.file_finished.emit(str(item.path), True, "")
-                    else:
-                        self.file_finished.emit(
-                            str(item.path), False, res.error or "Unknown error"
-                        )
-
-                    results.append(res)
+                final = (kind, payload)
+                break
 
-                except Exception as e:
-                    self.file_finished.emit(str(item.path), False, str(e))
-                    # Mock result for exception
-                    results.append(
-                        ConvertResult(
-                            success=False,
-                            input_path=item.path,
-                            output_path=None,
-                            error=str(e),
-                        )
-                    )
+        if started:
+            self.files_started.emit(started)
+        if finished:
+            self._done += len(finished)
+            self.files_finished.emit(finished)
+            self.progress_global.emit(self._done, len(self.items))
+        if final is not None:
+            self._flush_timer.stop()
+            kind, payload = final
+            if kind == "done":
+                self.finished_all.emit(payload)
+            else:
+                self.error_critical.emit(payload)
 
+    def run(self):
+        try:
+            results = self._convert_all()
             if self.merge and results and not self._stop:
                 try:
-                    name = (self.merge_name or "").strip() or "Any2MD-Merged.md"
-                    if not name.lower().endswith(".md"):
-                        name += ".md"
-                    converter.write_merged_markdown(
-                        results, self.output_path / name, common_path
-                    )
+                    self._write_merged(results)
                 except Exception as e:
                     print(f"Merge failed: {e}")
-
-            self.finished_all.emit(results)
+            self._events.append(("done", results))
         except Exception as e:
-            self.error_critical.emit(str(e))
+            self._events.append(("error", str(e)))
+
+    def _convert_all(self) -> List[ConvertResult]:
+        order = {item.path: i for i, item in enumerate(self.items)}
+        results: List[ConvertResult] = []
+
+        def on_assign(_slot, task):
+            self._events.append(("started", str(task[0])))
+
+        # Each file runs in a worker process, so Cancel can kill a long
+        # conversion instead of waiting for it to finish. The pool outlives the
+        # run; waits here if it is still being warmed up.
+        pool = self.session.get()
+        self._pool = pool
+        if self._stop:
+            pool.cancel()
+        try:
+            tasks = ((item.path, self.output_path) for item in self.items)
+            for res in pool.imap_unordered(tasks, on_assign=on_assign):
+                self._events.append(
+                    (
+                        "finished",
+                        (
+                            str(res.input_path),
+                            res.success,
+                            "" if res.success else res.error or "Unknown error",
+                        ),
+                    )
+                )
+                results.append(res)
+        finally:
+            self._pool = None
+
+        results.sort(key=lambda r: order.get(r.input_path, len(order)))
+        return results
+
+    def _write_merged(self, results: List[ConvertResult]) -> None:
+        # The merged document keeps paths relative to the common folder of
+        # everything that was dropped in.
+        try:
+            common_path = Path(
+                os.path.commonpath([str(i.path.parent) for i in self.items])
+            )
+        except ValueError:
+            common_path = None
+
+        name = (self.merge_name or "").strip() or "Any2MD-Merged.md"
+        if not name.lower().endswith(".md"):
+            name += ".md"
+        with MergeWriter(self.output_path / name, common_path) as writer:
+            for res in results:
+                writer.add(res)
 
 
 class ResultDialog(QDialog):
@@ -690,6 +770,8 @@ class ZenWindow(QMainWindow):
         # State
         self.file_items: List[FileItemData] = []
         self.map_path_to_item: Dict[str, QListWidgetItem] = {}
+        self.worker: Optional[ConvertWorker] = None
+        self.session = SessionPool()
 
         self.setup_ui()
 
@@ -979,12 +1061,17 @@ class ZenWindow(QMainWindow):
         self.merge_input.setEnabled(self.merge_check.isChecked())
 
     def start_convert(self):
+        if self.worker is not None:
+            self.worker.stop()
+            self.convert_btn.setEnabled(False)
+            self.convert_btn.setText("正在取消...")
+            return
+
         if not self.file_items:
             QMessageBox.warning(self, "提示", "列表中没有可转换的文件。")
             return
 
-        self.convert_btn.setEnabled(False)
-        self.convert_btn.setText("正在转换...")
+        self.convert_btn.setText("取消转换")
         self.flp_add.setEnabled(False)
         self.flp_clear.setEnabled(False)
         self.progress_bar.setRange(0, len(self.file_items))
@@ -1002,33 +1089,46 @@ class ZenWindow(QMainWindow):
             Path(self.out_edit.text()),
             self.merge_check.isChecked(),
             self.merge_input.text(),
+            self.session,
         )
         self.worker.progress_global.connect(self.progress_bar.setValue)
-        self.worker.file_started.connect(self.on_file_started)
-        self.worker.file_finished.connect(self.on_file_finished)
+        self.worker.files_started.connect(self.on_files_started)
+        self.worker.files_finished.connect(self.on_files_finished)
         self.worker.finished_all.connect(self.on_finished_all)
         self.worker.error_critical.connect(self.on_error_critical)
         self.worker.start()
 
-    def on_file_started(self, path: str):
-        item = self.map_path_to_item.get(path)
-        if item:
-            item.setForeground(QBrush(QColor(MorningTheme.PROCESSING)))
-            item.setText("🔄 " + item.text()[2:])  # Hacky replace icon
-            self.file_list_widget.scrollToItem(item)
-
-    def on_file_finished(self, path: str, success: bool, error: str):
-        item = self.map_path_to_item.get(path)
-        if item:
-            if success:
-                item.setForeground(QBrush(QColor(MorningTheme.SUCCESS)))
-                item.setText("✅ " + item.text()[2:])
-            else:
-                item.setForeground(QBrush(QColor(MorningTheme.ERROR)))
-                item.setText("❌ " + item.text()[2:])
-                item.setToolTip(f"失败: {error}")
+    def on_files_started(self, paths: List[str]):
+        last = None
+        for path in paths:
+            item = self.map_path_to_item.get(path)
+            if item:
+                item.setForeground(QBrush(QColor(MorningTheme.PROCESSING)))
+                item.setText("🔄 " + item.text()[2:])  # Hacky replace icon
+                last = item
+        if last is not None:
+            self.file_list_widget.scrollToItem(last)
+
+    def on_files_finished(self, rows: List[tuple]):
+        self.file_list_widget.setUpdatesEnabled(False)
+        try:
+            for path, success, error in rows:
+                item = self.map_path_to_item.get(path)
+                if not item:
+                    continue
+                if success:
+                    item.setForeground(QBrush(QColor(MorningTheme.SUCCESS)))
+                    item.setText("✅ " + item.text()[2:])
+                else:
+                    item.setForeground(QBrush(QColor(MorningTheme.ERROR)))
+                    item.setText("❌ " + item.text()[2:])
+                    item.setToolTip(f"失败: {error}")
+        finally:
+            self.file_list_widget.setUpdatesEnabled(True)
 
     def on_finished_all(self, results):
+        cancelled = self.worker is not None and self.worker.cancelled
+        self.worker = None
         self.convert_btn.setEnabled(True)
         self.convert_btn.setText("开始转换")
         self.flp_add.setEnabled(True)
@@ -1038,6 +1138,15 @@ class ZenWindow(QMainWindow):
         success_count = sum(1 for r in results if r.success)
         fail_count = len(results) - success_count
 
+        if cancelled:
+            # The cancelled pool lost its workers; have a new one ready.
+            self.session.warm_up()
+            self.status_label.setText(f"已取消，{success_count} 个文件已完成转换")
+            self.status_label.setStyleSheet(
+                f"color: {MorningTheme.TEXT_PRIMARY}; font-weight: 500;"
+            )
+            return
+
         if fail_count == 0:
             self.status_label.setText(f"✨ 全部完成！共 {len(results)} 个文件")
             self.status_label.setStyleSheet(
@@ -1063,6 +1172,7 @@ class ZenWindow(QMainWindow):
             dlg.exec()
 
     def on_error_critical(self, err):
+        self.worker = None
         self.convert_btn.setEnabled(True)
         self.convert_btn.setText("开始转换")
         self.flp_add.setEnabled(True)
@@ -1075,7 +1185,11 @@ class ZenWindow(QMainWindow):
 def run_gui():
     app = QApplication(sys.argv)
     window = ZenWindow()
+    app.aboutToQuit.connect(window.session.close)
     window.show()
+    # Start the conversion workers only once the window is on screen.
+    QTimer.singleShot(0, window.session.warm_up)
+
     sys.exit(app.exec())
 
 
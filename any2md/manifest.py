@@ -0,0 +1,105 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from .cache import hash_file
+
+
+MANIFEST_NAME = ".any2md-manifest.json"
+_MANIFEST_VERSION = 1
+
+
+@dataclass
+class ManifestEntry:
+    size: int
+    mtime_ns: int
+    sha256: str
+    output: Optional[str] = None
+
+
+class SyncManifest:
+    """
+    Records every converted input of an output directory so that later runs only
+    convert new or changed files.
+
+    Keys are input paths relative to the input root (POSIX style). A file is
+    unchanged when size and mtime match; when only the mtime moved, the stored
+    sha256 decides, so a `touch` does not trigger a re-conversion.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_NAME
+        self.entries: dict[str, ManifestEntry] = {}
+
+    def load(self) -> "SyncManifest":
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self
+        if data.get("version") != _MANIFEST_VERSION:
+            return self
+        self.entries = {
+            rel: ManifestEntry(**entry) for rel, entry in data.get("files", {}).items()
+        }
+        return self
+
+    def save(self) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": _MANIFEST_VERSION,
+            "files": {rel: asdict(e) for rel, e in sorted(self.entries.items())},
+        }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def is_current(self, rel: str, path: Path, st: os.stat_result) -> bool:
+        entry = self.entries.get(rel)
+        if entry is None or entry.size != st.st_size:
+            return False
+        if entry.output and not (self.output_dir / entry.output).exists():
+            return False
+        if entry.mtime_ns == st.st_mtime_ns:
+            return True
+        if hash_file(path) == entry.sha256:
+            entry.mtime_ns = st.st_mtime_ns
+            return True
+        return False
+
+    def record(self, rel: str, path: Path, output_path: Optional[Path]) -> None:
+        st = path.stat()
+        output = None
+        if output_path is not None:
+            try:
+                output = Path(output_path).relative_to(self.output_dir).as_posix()
+            except ValueError:
+                output = str(output_path)
+        self.entries[rel] = ManifestEntry(
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            sha256=hash_file(path),
+            output=output,
+        )
+
+    def forget(self, rel: str) -> None:
+        self.entries.pop(rel, None)
+
+    def prune(self, seen: set[str], recursive: bool = True) -> list[Path]:
+        """Drop entries whose source is gone and delete their outputs."""
+        removed: list[Path] = []
+        for rel in list(self.entries):
+            if rel in seen or (not recursive and "/" in rel):
+                continue
+            entry = self.entries.pop(rel)
+            if not entry.output:
+                continue
+            output = self.output_dir / entry.output
+            try:
+                output.unlink()
+                removed.append(output)
+            except OSError:
+                pass
+        return removed
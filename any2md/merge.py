@@ -0,0 +1,124 @@
+from collections import deque
+from dataclasses import replace
+from pathlib import Path
+from typing import IO, Optional
+
+
+MERGE_HEADER = "# Any2MD 合并文档\n"
+
+
+def merge_section_title(input_path: Path, base_dir: Optional[Path]) -> str:
+    if base_dir is None:
+        return input_path.name
+    try:
+        return str(input_path.relative_to(base_dir))
+    except Exception:
+        return input_path.name
+
+
+def format_merge_section(rel: str, title: Optional[str], markdown: str) -> str:
+    parts = [f"\n---\n\n## {rel}\n"]
+    if title:
+        parts.append(f"\n**标题**：{title}\n")
+    parts.append("\n")
+    parts.append(markdown.rstrip() + "\n")
+    return "".join(parts)
+
+
+def result_markdown(result) -> str:
+    # Process workers and streaming converters leave `markdown` empty and keep
+    # the content on disk only.
+    if not result.markdown and result.output_path and Path(result.output_path).exists():
+        return Path(result.output_path).read_text(encoding="utf-8")
+    return result.markdown or ""
+
+
+class MergeWriter:
+    """
+    Appends converted documents to a merged markdown file in a fixed order.
+
+    Inputs are registered with `expect()` in the order they should appear.
+    Results may arrive in any order through `add()`; a section is written as soon
+    as every earlier input has been written, so only out-of-order results are
+    held back. Held results whose markdown is already on disk keep just their
+    metadata in memory and are read back when their turn comes.
+    """
+
+    def __init__(self, merged_path: Path, base_dir: Optional[Path] = None):
+        self.merged_path = Path(merged_path)
+        self.base_dir = Path(base_dir) if base_dir is not None else None
+        self._order: deque[Path] = deque()
+        self._expected: set[Path] = set()
+        self._held: dict[Path, object] = {}
+        self._fh: Optional[IO[str]] = None
+
+    def open(self) -> "MergeWriter":
+        if self._fh is None:
+            self.merged_path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.merged_path.open("w", encoding="utf-8")
+            self._fh.write(MERGE_HEADER)
+        return self
+
+    def expect(self, input_path: Path) -> None:
+        input_path = Path(input_path)
+        self._order.append(input_path)
+        self._expected.add(input_path)
+
+    def add(self, result) -> None:
+        self.open()
+        path = Path(result.input_path)
+        if path not in self._expected:
+            # Unregistered results are appended in arrival order.
+            self._write(result)
+            return
+        if self._order and self._order[0] == path:
+            self._order.popleft()
+            self._expected.discard(path)
+            self._write(result)
+            self._drain()
+            return
+        if result.markdown and result.output_path and Path(result.output_path).exists():
+            result = replace(result, markdown="")
+        self._held[path] = result
+
+    def skip(self, input_path: Path) -> None:
+        """Give up the slot of an input that will never produce a result."""
+        self.open()
+        self._held[Path(input_path)] = None
+        self._drain()
+
+    def close(self) -> Path:
+        self.open()
+        # Anything still outstanding is written in registration order.
+        while self._order:
+            path = self._order.popleft()
+            self._expected.discard(path)
+            result = self._held.pop(path, None)
+            if result is not None:
+                self._write(result)
+        self._fh.close()
+        self._fh = None
+        return self.merged_path
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._fh is not None:
+            self.close()
+
+    def _drain(self) -> None:
+        while self._order and self._order[0] in self._held:
+            path = self._order.popleft()
+            self._expected.discard(path)
+            result = self._held.pop(path)
+            if result is not None:
+                self._write(result)
+
+    def _write(self, result) -> None:
+        if not result.success:
+            return
+        rel = merge_section_title(Path(result.input_path), self.base_dir)
+        self._fh.write(
+            format_merge_section(rel, result.title, result_markdown(result))
+        )
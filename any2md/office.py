@@ -0,0 +1,319 @@
+import os
+import signal
+import shutil
+import subprocess
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+
+LEGACY_TARGETS = {".doc": "docx", ".ppt": "pptx", ".xls": "xlsx"}
+
+
+def _kill_group(pid: int) -> None:
+    """Kill the process group led by `pid` (the process tree on Windows)."""
+    try:
+        if os.name == "posix":
+            os.killpg(pid, signal.SIGKILL)
+        else:
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(pid)],
+                capture_output=True,
+            )
+    except Exception:
+        pass
+
+
+def _kill_tree(proc: subprocess.Popen) -> None:
+    _kill_group(proc.pid)
+    try:
+        proc.kill()
+    except Exception:
+        pass
+
+
+class ToolGroups:
+    """
+    Process groups of the external tools a worker process is running, kept in
+    shared memory so the parent can kill them after killing the worker: the
+    tools run in their own sessions and would otherwise outlive it.
+    """
+
+    SLOTS = 8
+
+    def __init__(self, ctx):
+        self._ids = ctx.Array("q", self.SLOTS)
+
+    def add(self, pid: int) -> None:
+        with self._ids.get_lock():
+            for i, value in enumerate(self._ids):
+                if value == 0:
+                    self._ids[i] = pid
+                    return
+
+    def discard(self, pid: int) -> None:
+        with self._ids.get_lock():
+            for i, value in enumerate(self._ids):
+                if value == pid:
+                    self._ids[i] = 0
+                    return
+
+    def kill(self) -> None:
+        with self._ids.get_lock():
+            pids = [pid for pid in self._ids if pid]
+            for i in range(self.SLOTS):
+                self._ids[i] = 0
+        for pid in pids:
+            _kill_group(pid)
+
+
+# Set in worker processes (see pool._worker_main) to report running tools.
+_tool_groups: Optional[ToolGroups] = None
+
+
+def track_tool_groups(groups: Optional[ToolGroups]) -> None:
+    """Register every command `run_command` starts in this process with `groups`."""
+    global _tool_groups
+    _tool_groups = groups
+
+
+def run_command(
+    cmd: list[str], timeout: Optional[float] = None
+) -> subprocess.CompletedProcess:
+    """
+    `subprocess.run(cmd, capture_output=True, text=True)` with a wall-clock limit.
+
+    The command runs in its own process group so that helpers it spawns (e.g.
+    soffice.bin behind the soffice launcher) are killed with it on timeout.
+    """
+    if os.name == "posix":
+        kwargs = {"start_new_session": True}
+    else:
+        kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    groups = _tool_groups
+    with subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, **kwargs
+    ) as proc:
+        if groups is not None:
+            groups.add(proc.pid)
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_tree(proc)
+            proc.communicate()
+            raise RuntimeError(
+                f"外部转换程序超时 (>{timeout:g}s): {Path(cmd[0]).name}"
+            ) from None
+        finally:
+            if groups is not None:
+                groups.discard(proc.pid)
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+@dataclass
+class _Job:
+    input_path: Path
+    out_dir: Path
+    target_ext: str
+    future: Future = field(default_factory=Future)
+    error: Optional[str] = None
+
+
+class SofficePool:
+    """
+    A fixed set of LibreOffice slots for legacy .doc/.ppt/.xls conversion.
+
+    Every slot owns a private `-env:UserInstallation` profile that survives across
+    calls, so the expensive first-run profile setup happens once per slot and
+    parallel callers never contend for the shared default profile. Jobs submitted
+    while a slot is busy are batched into a single `soffice --convert-to` call.
+    A slot whose soffice process crashes gets a fresh profile and retries the
+    affected files one by one.
+    """
+
+    def __init__(
+        self,
+        soffice: str,
+        size: int = 2,
+        batch_size: int = 8,
+        profile_root: Optional[Path] = None,
+        timeout: Optional[float] = None,
+    ):
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self.soffice = soffice
+        self.size = size
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.restarts = 0
+
+        self._own_root = profile_root is None
+        self._root = Path(
+            profile_root
+            if profile_root is not None
+            else tempfile.mkdtemp(prefix="any2md_lo_pool_")
+        )
+        self._pending: deque[_Job] = deque()
+        self._cond = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+
+    def submit(self, input_path: Path, out_dir: Path) -> "Future[Path]":
+        input_path = Path(input_path)
+        suffix = input_path.suffix.lower()
+        if suffix not in LEGACY_TARGETS:
+            raise ValueError(f"Unsupported legacy suffix: {suffix}")
+
+        job = _Job(input_path, Path(out_dir), LEGACY_TARGETS[suffix])
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("SofficePool is closed")
+            self._start_slots()
+            self._pending.append(job)
+            self._cond.notify()
+        return job.future
+
+    def convert(self, input_path: Path, out_dir: Path) -> Path:
+        return self.submit(input_path, out_dir).result()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join()
+        self._threads.clear()
+        if self._own_root:
+            shutil.rmtree(self._root, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _start_slots(self) -> None:
+        if self._threads:
+            return
+        for slot in range(self.size):
+            t = threading.Thread(
+                target=self._slot_loop,
+                args=(slot,),
+                name=f"any2md-soffice-{slot}",
+                daemon=True,
+            )
+            t.start()
+            self._threads.append(t)
+
+    def _take_batch(self) -> Optional[list[_Job]]:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+
+            first = self._pending.popleft()
+            batch = [first]
+            stems = {first.input_path.stem}
+            skipped: list[_Job] = []
+            while self._pending and len(batch) < self.batch_size:
+                job = self._pending.popleft()
+                # soffice names outputs by stem, so a batch must not contain duplicates.
+                if job.target_ext == first.target_ext and job.input_path.stem not in stems:
+                    batch.append(job)
+                    stems.add(job.input_path.stem)
+                else:
+                    skipped.append(job)
+            self._pending.extendleft(reversed(skipped))
+            return batch
+
+    def _slot_loop(self, slot: int) -> None:
+        profile = self._root / f"profile{slot}"
+        work = self._root / f"out{slot}"
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+
+            try:
+                self._process_batch(batch, profile, work)
+            except Exception as e:
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+
+    def _process_batch(self, batch: list[_Job], profile: Path, work: Path) -> None:
+        failed = self._run_batch(batch, profile, work)
+        if failed and len(batch) > 1:
+            # Treat a partial batch as a crashed instance: reset the profile and
+            # give every remaining file its own run.
+            self._reset_profile(profile)
+            for job in failed:
+                if self._run_batch([job], profile, work):
+                    self._reset_profile(profile)
+                    self._fail(job)
+        elif failed:
+            self._reset_profile(profile)
+            self._fail(failed[0])
+
+    def _reset_profile(self, profile: Path) -> None:
+        shutil.rmtree(profile, ignore_errors=True)
+        with self._cond:
+            self.restarts += 1
+
+    def _fail(self, job: _Job) -> None:
+        job.future.set_exception(
+            RuntimeError(job.error or "LibreOffice 转换未生成输出文件")
+        )
+
+    def _run_batch(self, batch: list[_Job], profile: Path, work: Path) -> list[_Job]:
+        shutil.rmtree(work, ignore_errors=True)
+        work.mkdir(parents=True, exist_ok=True)
+
+        cmd = [
+            self.soffice,
+            f"-env:UserInstallation={profile.resolve().as_uri()}",
+            "--headless",
+            "--nologo",
+            "--nolockcheck",
+            "--norestore",
+            "--convert-to",
+            batch[0].target_ext,
+            "--outdir",
+            str(work),
+            *[str(job.input_path) for job in batch],
+        ]
+        # A batch gets the per-file limit once per file it contains.
+        timeout = self.timeout * len(batch) if self.timeout else None
+        error = None
+        try:
+            proc = run_command(cmd, timeout=timeout)
+            if proc.returncode != 0:
+                stderr = (proc.stderr or "").strip()
+                stdout = (proc.stdout or "").strip()
+                error = "LibreOffice 转换失败" + (
+                    f": {stderr}" if stderr else f": {stdout}" if stdout else ""
+                )
+        except (OSError, RuntimeError) as e:
+            error = f"LibreOffice 转换失败: {e}"
+
+        failed: list[_Job] = []
+        for job in batch:
+            produced = work / f"{job.input_path.stem}.{job.target_ext}"
+            if not produced.exists():
+                job.error = error
+                failed.append(job)
+                continue
+            try:
+                job.out_dir.mkdir(parents=True, exist_ok=True)
+                dest = job.out_dir / produced.name
+                shutil.move(str(produced), str(dest))
+            except Exception as e:
+                job.future.set_exception(e)
+                continue
+            job.future.set_result(dest)
+        return failed
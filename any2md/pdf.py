@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+
+DEFAULT_PAGE_THRESHOLD = 200
+# Ranges smaller than this cost more in per-process PDF parsing than they save.
+_MIN_PAGES_PER_RANGE = 20
+
+
+def count_pages(path: Path) -> int:
+    """Page count from the PDF's page tree, without parsing any page content."""
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+
+    with open(path, "rb") as f:
+        document = PDFDocument(PDFParser(f))
+        pages = resolve1(document.catalog.get("Pages"))
+        return int(resolve1(pages.get("Count", 0))) if pages else 0
+
+
+def page_ranges(pages: int, parts: int, min_pages: int = _MIN_PAGES_PER_RANGE) -> list[range]:
+    """Split `pages` into at most `parts` contiguous ranges of similar size."""
+    if pages <= 0:
+        return []
+    parts = max(1, min(parts, pages // max(min_pages, 1) or 1))
+    size, extra = divmod(pages, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append(range(start, stop))
+        start = stop
+    return ranges
+
+
+def _extract_range(path: str, pages: range) -> str:
+    from pdfminer.high_level import extract_text
+
+    return extract_text(path, page_numbers=pages)
+
+
+class PdfSplitter:
+    """
+    Converts large PDFs by splitting them into page ranges that are extracted
+    in parallel worker processes and joined back in page order.
+
+    Only PDFs with at least `page_threshold` pages, or at least `byte_threshold`
+    bytes, are split, and only if they have enough pages for two ranges of
+    `min_pages_per_range`; everything else stays on the normal MarkItDown path.
+    Ranges are extracted with pdfminer, the same engine MarkItDown uses for
+    plain-text PDFs; table detection is not applied to split documents. The
+    process pool is created on first use and shared by all conversions, so
+    concurrent large PDFs queue up instead of oversubscribing the CPU. Inside
+    daemonic worker processes (see `pool.WorkerPool`), which cannot start
+    children, nothing is split.
+    """
+
+    def __init__(
+        self,
+        page_threshold: Optional[int] = DEFAULT_PAGE_THRESHOLD,
+        byte_threshold: Optional[int] = None,
+        workers: Optional[int] = None,
+        min_pages_per_range: int = _MIN_PAGES_PER_RANGE,
+    ):
+        self.page_threshold = page_threshold
+        self.byte_threshold = byte_threshold
+        self.workers = workers or os.cpu_count() or 1
+        self.min_pages_per_range = min_pages_per_range
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def cache_tag(self) -> list:
+        return [self.page_threshold, self.byte_threshold]
+
+    def should_split(self, path: Path) -> bool:
+        if self.workers < 2 or multiprocessing.current_process().daemon:
+            return False
+        try:
+            size = Path(path).stat().st_size
+        except OSError:
+            return False
+        large = self.byte_threshold is not None and size >= self.byte_threshold
+        if not large and self.page_threshold is None:
+            return False
+        try:
+            pages = count_pages(path)
+        except Exception:
+            # Let the regular converter report broken files.
+            return False
+        if not large and pages < self.page_threshold:
+            return False
+        # A single range gains no parallelism and loses MarkItDown's tables.
+        return len(page_ranges(pages, self.workers, self.min_pages_per_range)) > 1
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def convert(self, path: Path) -> str:
+        ranges = page_ranges(count_pages(path), self.workers, self.min_pages_per_range)
+        if len(ranges) <= 1:
+            return _extract_range(str(path), ranges[0] if ranges else range(0))
+        texts = self._pool().map(_extract_range, [str(path)] * len(ranges), ranges)
+        return "\n\n".join(t.strip() for t in texts if t.strip()) + "\n"
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,385 @@
+import multiprocessing
+import multiprocessing.util
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from .converter import MEMORY_ERROR, Any2MDConverter, ConvertResult
+from .office import SofficePool, ToolGroups, track_tool_groups
+
+
+Task = tuple[Path, Optional[Path]]
+
+_RSS_POLL_INTERVAL = 0.5
+
+
+@dataclass
+class WorkerLimits:
+    """
+    Resource limits for worker processes.
+
+    `max_memory_mb` caps each worker's memory on top of what it uses after
+    start-up, which then includes loading MarkItDown: on POSIX it is applied as
+    an address-space rlimit, so oversized allocations raise `MemoryError`
+    inside the worker, and the parent also polls resident memory and kills a
+    worker that grows past the limit anyway.
+    `max_files` / `max_mb` recycle a worker after that many files or input
+    megabytes, which returns memory held by parser caches.
+    """
+
+    max_memory_mb: Optional[int] = None
+    max_files: Optional[int] = None
+    max_mb: Optional[int] = None
+
+    def __bool__(self) -> bool:
+        return any(
+            v is not None for v in (self.max_memory_mb, self.max_files, self.max_mb)
+        )
+
+
+def _vm_bytes(pid: Optional[int] = None) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size of `pid`, or None when it cannot be determined."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil  # type: ignore
+
+        return psutil.Process(pid).memory_info().rss
+    except Exception:
+        return None
+
+
+def _apply_memory_limit(max_memory_mb: int) -> None:
+    try:
+        import resource
+    except ImportError:
+        return
+    baseline = _vm_bytes()
+    if baseline is None:
+        try:
+            baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except Exception:
+            return
+    limit = baseline + max_memory_mb * 1024 * 1024
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError, AttributeError):
+        pass
+
+
+def _worker_main(
+    conn,
+    options: dict,
+    max_memory_mb: Optional[int] = None,
+    preload: bool = False,
+    tools: Optional[ToolGroups] = None,
+    baseline=None,
+    profile_root: Optional[Path] = None,
+) -> None:
+    track_tool_groups(tools)
+    converter = Any2MDConverter(**options)
+    if preload or max_memory_mb:
+        try:
+            # Pay for importing markitdown now rather than on the first file.
+            # Under a memory limit this is required: the limit is measured
+            # from here, and mapping magika/onnxruntime later would fail.
+            converter.md
+        except Exception:
+            pass
+    soffice = converter._find_soffice()
+    if soffice and converter.soffice_pool is None:
+        # One private LibreOffice profile per worker process, in a directory
+        # the parent removes even if this process is killed.
+        pool = SofficePool(
+            soffice, size=1, profile_root=profile_root, timeout=converter.timeout
+        )
+        converter.soffice_pool = pool
+        multiprocessing.util.Finalize(pool, pool.close, exitpriority=10)
+    if max_memory_mb:
+        _apply_memory_limit(max_memory_mb)
+    if baseline is not None:
+        baseline.value = rss_bytes(os.getpid()) or 0
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        input_path, output_dir = task
+        result = converter.convert_file(input_path, output_dir)
+        # The worker already wrote the .md file; only ship metadata back.
+        if output_dir is not None:
+            result.markdown = ""
+        exhausted = result.error == MEMORY_ERROR
+        conn.send((result, exhausted))
+        if exhausted:
+            # The heap may be fragmented or half-freed; let the parent start fresh.
+            return
+
+
+class _Worker:
+    def __init__(
+        self, ctx, options: dict, max_memory_mb: Optional[int], preload: bool = False
+    ):
+        parent_conn, child_conn = ctx.Pipe()
+        self.conn = parent_conn
+        # soffice & co. started by this worker, killed along with it.
+        self.tools = ToolGroups(ctx)
+        # Resident memory once the worker is ready; 0 while it starts up.
+        self.baseline = ctx.Value("q", 0, lock=False)
+        self.profile_root = Path(tempfile.mkdtemp(prefix="any2md_lo_pool_"))
+        self.proc = ctx.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                options,
+                max_memory_mb,
+                preload,
+                self.tools,
+                self.baseline,
+                self.profile_root,
+            ),
+            daemon=True,
+        )
+        self.proc.start()
+        child_conn.close()
+        self.task: Optional[Task] = None
+        self.deadline: Optional[float] = None
+        self.files_done = 0
+        self.bytes_done = 0
+
+    def assign(self, task: Task, timeout: Optional[float]) -> None:
+        self.task = task
+        self.deadline = time.monotonic() + timeout if timeout else None
+        try:
+            self.bytes_done += Path(task[0]).stat().st_size
+        except OSError:
+            pass
+        self.conn.send(task)
+
+    def kill(self) -> None:
+        if self.proc.is_alive():
+            self.proc.kill()
+        self.proc.join()
+        self.tools.kill()
+        self.conn.close()
+        shutil.rmtree(self.profile_root, ignore_errors=True)
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.proc.join(timeout=5)
+        if self.proc.is_alive():
+            self.proc.kill()
+            self.proc.join()
+            self.tools.kill()
+        self.conn.close()
+        shutil.rmtree(self.profile_root, ignore_errors=True)
+
+
+class WorkerPool:
+    """
+    A process pool whose workers can be killed individually.
+
+    Each worker process builds one `Any2MDConverter(**converter_options)` and
+    writes its `.md` output itself. A file that runs longer than `timeout`
+    seconds gets its worker killed and replaced, and comes back as a failed
+    `ConvertResult` with `timed_out=True`; a worker that dies for any other
+    reason, or outgrows `limits.max_memory_mb`, is reported and replaced the
+    same way. Workers are also retired after `limits.max_files` files or
+    `limits.max_mb` input megabytes.
+
+    A pool can serve several `imap_unordered` runs in a row (but not after
+    `cancel()`). With `preload`, workers load MarkItDown as soon as they
+    start, and `start()` launches them ahead of the first run.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        converter_options: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        limits: Optional[WorkerLimits] = None,
+        preload: bool = False,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.preload = preload
+        self.options = converter_options or {}
+        self.timeout = timeout
+        self.limits = limits or WorkerLimits()
+        self.recycled = 0
+        self._ctx = multiprocessing.get_context()
+        self._slots: list[Optional[_Worker]] = [None] * self.workers
+        self._cancelled = False
+
+    def _spawn(self, index: int) -> _Worker:
+        worker = _Worker(
+            self._ctx, self.options, self.limits.max_memory_mb, self.preload
+        )
+        self._slots[index] = worker
+        return worker
+
+    def start(self, count: Optional[int] = None) -> None:
+        """Launch up to `count` workers (all by default) before any task arrives."""
+        for i in range(min(count or self.workers, self.workers)):
+            if self._slots[i] is None:
+                self._spawn(i)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def _needs_recycle(self, worker: _Worker) -> bool:
+        limits = self.limits
+        if limits.max_files and worker.files_done >= limits.max_files:
+            return True
+        return bool(limits.max_mb and worker.bytes_done >= limits.max_mb * 1024 * 1024)
+
+    def imap_unordered(
+        self,
+        tasks: Iterable[Task],
+        on_assign: Optional[Callable[[int, Task], None]] = None,
+    ) -> Iterator[ConvertResult]:
+        """
+        Run `tasks` and yield their results as they finish. `on_assign(slot,
+        task)` is called whenever a task is handed to the worker in `slot`.
+        """
+        tasks = iter(tasks)
+        exhausted = False
+
+        while True:
+            if not exhausted and not self._cancelled:
+                for i, worker in enumerate(self._slots):
+                    if worker is not None and worker.task is not None:
+                        continue
+                    try:
+                        task = next(tasks)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    if worker is not None and not worker.proc.is_alive():
+                        # An idle worker died between runs; start a new one.
+                        worker.kill()
+                        worker = None
+                    if worker is None:
+                        worker = self._spawn(i)
+                    worker.assign(task, self.timeout)
+                    if on_assign is not None:
+                        on_assign(i, task)
+
+            busy = [w for w in self._slots if w is not None and w.task is not None]
+            if not busy:
+                return
+
+            deadlines = [w.deadline for w in busy if w.deadline is not None]
+            if self.limits.max_memory_mb:
+                deadlines.append(time.monotonic() + _RSS_POLL_INTERVAL)
+            wait_for = (
+                max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            )
+            wait([w.conn for w in busy] + [w.proc.sentinel for w in busy], wait_for)
+
+            now = time.monotonic()
+            for worker in busy:
+                result = self._collect(worker, now)
+                if result is not None:
+                    yield result
+
+    def _collect(self, worker: _Worker, now: float) -> Optional[ConvertResult]:
+        input_path = Path(worker.task[0])
+        try:
+            if worker.conn.poll():
+                result, exhausted = worker.conn.recv()
+                worker.task = None
+                worker.deadline = None
+                worker.files_done += 1
+                if exhausted or self._needs_recycle(worker):
+                    self._retire(worker)
+                return result
+        except (EOFError, OSError):
+            pass
+
+        # Like the rlimit, the cap applies on top of the worker's start-up size.
+        baseline = worker.baseline.value
+        max_rss = (self.limits.max_memory_mb or 0) * 1024 * 1024
+        rss = (
+            rss_bytes(worker.proc.pid)
+            if max_rss and baseline and worker.proc.is_alive()
+            else None
+        )
+
+        if self._cancelled:
+            error, timed_out = "已取消", False
+        elif rss is not None and rss > baseline + max_rss:
+            error = f"{MEMORY_ERROR} (>{self.limits.max_memory_mb} MB)，已终止"
+            timed_out = False
+        elif not worker.proc.is_alive():
+            error = f"工作进程异常退出 (exit code {worker.proc.exitcode})"
+            timed_out = False
+        elif worker.deadline is not None and now >= worker.deadline:
+            error, timed_out = f"转换超时 (>{self.timeout:g}s)，已终止", True
+        else:
+            return None
+
+        self._replace(worker)
+        return ConvertResult(
+            success=False, input_path=input_path, error=error, timed_out=timed_out
+        )
+
+    def _replace(self, worker: _Worker) -> None:
+        worker.kill()
+        index = self._slots.index(worker)
+        self._slots[index] = None
+
+    def _retire(self, worker: _Worker) -> None:
+        worker.stop()
+        index = self._slots.index(worker)
+        self._slots[index] = None
+        self.recycled += 1
+
+    def cancel(self) -> None:
+        """Stop handing out tasks and kill in-flight conversions immediately."""
+        self._cancelled = True
+        for worker in list(self._slots):
+            if worker is not None and worker.proc.is_alive():
+                worker.proc.kill()
+                worker.tools.kill()
+
+    def close(self) -> None:
+        for i, worker in enumerate(self._slots):
+            if worker is None:
+                continue
+            if worker.task is not None or self._cancelled:
+                worker.kill()
+            else:
+                worker.stop()
+            self._slots[i] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,106 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+
+QUARANTINE_NAME = ".any2md-quarantine.json"
+
+
+class Quarantine:
+    """
+    Persistent list of inputs whose conversion timed out.
+
+    Entries remember the file's size and mtime; once the file changes it is no
+    longer considered quarantined and will be tried again. Entries whose file
+    is gone are dropped when the list is saved.
+
+    Files extracted from an archive into a fresh directory each run are
+    registered with `add_archive()`: they are then recorded as members of the
+    archive (`a.zip/dir/b.pdf`) and tied to the archive's size and mtime.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = {}
+        self._archives: list[tuple[Path, Path]] = []
+        self.load()
+
+    @classmethod
+    def for_output_dir(cls, output_dir: Path) -> "Quarantine":
+        return cls(Path(output_dir) / QUARANTINE_NAME)
+
+    def add_archive(self, extracted_dir: Path, archive: Path) -> None:
+        """Treat files under `extracted_dir` as members of `archive`."""
+        self._archives.append((Path(extracted_dir).resolve(), Path(archive).resolve()))
+
+    def _identity(self, input_path: Path) -> tuple[str, Path]:
+        """The entry key and the file whose size and mtime the entry tracks."""
+        resolved = Path(input_path).resolve()
+        for extracted_dir, archive in self._archives:
+            try:
+                member = resolved.relative_to(extracted_dir)
+            except ValueError:
+                continue
+            return str(archive / member), archive
+        return str(resolved), resolved
+
+    def _key(self, input_path: Path) -> str:
+        return self._identity(input_path)[0]
+
+    def load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self.entries = data
+
+    def save(self) -> None:
+        if not self.entries and not self.path.exists():
+            return
+        self.entries = {
+            key: entry
+            for key, entry in self.entries.items()
+            if Path(entry.get("source", key)).exists()
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(
+            json.dumps(self.entries, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        os.replace(tmp, self.path)
+
+    def contains(self, input_path: Path) -> bool:
+        key, source = self._identity(input_path)
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        try:
+            st = source.stat()
+        except OSError:
+            return False
+        return entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns
+
+    def reason(self, input_path: Path) -> Optional[str]:
+        entry = self.entries.get(self._key(input_path))
+        return entry.get("reason") if entry else None
+
+    def add(self, input_path: Path, reason: str) -> None:
+        key, source = self._identity(input_path)
+        try:
+            st = source.stat()
+            size, mtime_ns = st.st_size, st.st_mtime_ns
+        except OSError:
+            size, mtime_ns = None, None
+        self.entries[key] = {
+            "reason": reason,
+            "source": str(source),
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "quarantined_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+    def discard(self, input_path: Path) -> None:
+        self.entries.pop(self._key(input_path), None)
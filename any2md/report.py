@@ -0,0 +1,114 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .converter import STAGES, ConvertResult
+
+
+PERCENTILES = (50, 90, 99)
+SLOWEST = 10
+
+
+def percentile(values: list[float], q: float) -> float:
+    """The `q`-th percentile of sorted `values`, interpolated linearly."""
+    if not values:
+        return 0.0
+    pos = (len(values) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def _distribution(values: Iterable[float]) -> dict:
+    values = sorted(values)
+    summary = {"files": len(values), "total": round(float(sum(values)), 4)}
+    for q in PERCENTILES:
+        summary[f"p{q}"] = round(percentile(values, q), 4)
+    summary["max"] = round(values[-1], 4) if values else 0.0
+    return summary
+
+
+def _display_path(path: Path, base_dir: Optional[Path]) -> str:
+    if base_dir is not None:
+        try:
+            return Path(path).relative_to(base_dir).as_posix()
+        except ValueError:
+            pass
+    return str(path)
+
+
+def _file_entry(result: ConvertResult, base_dir: Optional[Path]) -> dict:
+    entry = {
+        "path": _display_path(result.input_path, base_dir),
+        "seconds": round(result.elapsed, 4),
+        "stages": {s: round(result.timings[s], 4) for s in STAGES if s in result.timings},
+        "input_bytes": result.input_bytes,
+        "output_bytes": result.output_bytes,
+    }
+    if not result.success:
+        entry["error"] = result.error
+    return entry
+
+
+def _summary(results: list[ConvertResult], base_dir: Optional[Path], top: int) -> dict:
+    slowest = sorted(results, key=lambda r: r.elapsed, reverse=True)[:top]
+    return {
+        "files": len(results),
+        "failed": sum(1 for r in results if not r.success),
+        "input_bytes": sum(r.input_bytes for r in results),
+        "output_bytes": sum(r.output_bytes for r in results),
+        "seconds": _distribution(r.elapsed for r in results),
+        "stages": {
+            stage: _distribution(r.timings[stage] for r in results if stage in r.timings)
+            for stage in STAGES
+        },
+        "slowest": [_file_entry(r, base_dir) for r in slowest],
+    }
+
+
+def build_report(
+    results: Iterable[ConvertResult],
+    base_dir: Optional[Path] = None,
+    wall_seconds: Optional[float] = None,
+    top: int = SLOWEST,
+) -> dict:
+    """
+    Aggregate a run's results: per-file seconds and per-stage seconds as
+    totals and percentiles, byte counts and the `top` slowest files, for the
+    whole run and for each input format (by suffix). Stage distributions only
+    include files that went through that stage. Paths are shown relative to
+    `base_dir` when they are below it.
+    """
+    results = list(results)
+    by_format: dict[str, list[ConvertResult]] = {}
+    for r in results:
+        by_format.setdefault(r.input_path.suffix.lower() or "(none)", []).append(r)
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "wall_seconds": round(wall_seconds, 4) if wall_seconds is not None else None,
+    }
+    report.update(_summary(results, base_dir, top))
+    report["formats"] = {
+        fmt: _summary(items, base_dir, top) for fmt, items in sorted(by_format.items())
+    }
+    return report
+
+
+def write_report(
+    path: Path,
+    results: Iterable[ConvertResult],
+    base_dir: Optional[Path] = None,
+    wall_seconds: Optional[float] = None,
+    top: int = SLOWEST,
+) -> Path:
+    """Write `build_report(...)` to `path` as JSON."""
+    path = Path(path)
+    report = build_report(results, base_dir, wall_seconds, top)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
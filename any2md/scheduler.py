@@ -0,0 +1,147 @@
+import heapq
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TypeVar
+
+from .cache import default_cache_dir
+
+
+# Relative cost of converting one byte of each format, compared to HTML. Legacy
+# formats also pay for an office-suite round trip, modelled as a fixed overhead.
+COST_FACTORS = {
+    ".pdf": 4.0,
+    ".docx": 1.5,
+    ".doc": 2.0,
+    ".pptx": 1.2,
+    ".ppt": 1.5,
+    ".xlsx": 3.0,
+    ".xls": 3.0,
+    ".html": 1.0,
+    ".htm": 1.0,
+    ".xml": 0.5,
+    ".json": 0.5,
+    ".csv": 0.8,
+    ".txt": 0.1,
+    ".md": 0.1,
+    ".rtf": 1.0,
+    ".zip": 1.0,
+}
+FIXED_COST_BYTES = {".doc": 4 << 20, ".ppt": 4 << 20, ".xls": 4 << 20}
+_DEFAULT_FIXED_COST = 16 << 10
+_NOMINAL_BYTES_PER_SEC = 2 << 20
+
+T = TypeVar("T")
+
+
+class ThroughputStats:
+    """
+    Per-format conversion throughput (bytes per second) measured in earlier runs.
+
+    Each run's measurement is blended into the stored rate with an exponential
+    moving average, so the estimate follows hardware or version changes.
+    """
+
+    def __init__(self, path: Optional[Path] = None, smoothing: float = 0.3):
+        self.path = (
+            Path(path)
+            if path is not None
+            else default_cache_dir() / "throughput.json"
+        )
+        self.smoothing = smoothing
+        self.rates: dict[str, float] = {}
+        self._pending: dict[str, list[float]] = {}
+        self.load()
+
+    def load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        self.rates = {
+            k: float(v) for k, v in data.get("bytes_per_sec", {}).items() if v > 0
+        }
+
+    def save(self) -> None:
+        self.flush()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(
+            json.dumps({"bytes_per_sec": self.rates}, indent=2), encoding="utf-8"
+        )
+        os.replace(tmp, self.path)
+
+    def record(self, suffix: str, size: int, seconds: float) -> None:
+        if size <= 0 or seconds <= 0:
+            return
+        totals = self._pending.setdefault(suffix.lower(), [0.0, 0.0])
+        totals[0] += size
+        totals[1] += seconds
+
+    def flush(self) -> None:
+        for suffix, (size, seconds) in self._pending.items():
+            measured = size / seconds
+            previous = self.rates.get(suffix)
+            self.rates[suffix] = (
+                measured
+                if previous is None
+                else previous + self.smoothing * (measured - previous)
+            )
+        self._pending.clear()
+
+    def estimate(self, suffix: str, size: int) -> Optional[float]:
+        rate = self.rates.get(suffix.lower())
+        if not rate:
+            return None
+        return size / rate
+
+
+def estimate_cost(
+    path: Path, size: Optional[int] = None, stats: Optional[ThroughputStats] = None
+) -> float:
+    """Estimated conversion time of `path` in seconds."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if size is None:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+    if stats is not None:
+        learned = stats.estimate(suffix, size)
+        if learned is not None:
+            return learned
+    fixed = FIXED_COST_BYTES.get(suffix, _DEFAULT_FIXED_COST)
+    return (size + fixed) * COST_FACTORS.get(suffix, 1.0) / _NOMINAL_BYTES_PER_SEC
+
+
+def order_by_cost(
+    items: Iterable[T],
+    key=lambda item: item,
+    stats: Optional[ThroughputStats] = None,
+) -> list[T]:
+    """Sort items longest-estimated-job first; `key` maps an item to its path."""
+    return sorted(
+        items, key=lambda item: estimate_cost(key(item), stats=stats), reverse=True
+    )
+
+
+def iter_by_cost(
+    items: Iterable[T],
+    window: int,
+    key=lambda item: item,
+    stats: Optional[ThroughputStats] = None,
+) -> Iterator[T]:
+    """
+    Streaming variant of `order_by_cost` for inputs that are still being
+    discovered: keeps a heap of up to `window` pending items and always hands out
+    the most expensive one, so long jobs start early without waiting for the
+    complete list.
+    """
+    heap: list[tuple[float, int, T]] = []
+    for seq, item in enumerate(items):
+        heapq.heappush(heap, (-estimate_cost(key(item), stats=stats), seq, item))
+        if len(heap) > window:
+            yield heapq.heappop(heap)[2]
+    while heap:
+        yield heapq.heappop(heap)[2]
@@ -0,0 +1,159 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional
+
+
+# A member that expands more than this many times over its compressed size is
+# treated as a decompression bomb. Text compresses ~10x, so this leaves room.
+DEFAULT_MAX_RATIO = 200
+# Small members are exempt from the ratio check; a few KB of zeros is harmless.
+_RATIO_MIN_BYTES = 1024 * 1024
+
+
+class ScratchSpaceError(RuntimeError):
+    pass
+
+
+class ScratchQuotaError(ScratchSpaceError):
+    pass
+
+
+class ArchiveBombError(ScratchSpaceError):
+    pass
+
+
+def _env_quota_bytes() -> Optional[int]:
+    value = os.environ.get("ANY2MD_SCRATCH_QUOTA_MB")
+    if not value:
+        return None
+    try:
+        return int(value) * 1024 * 1024
+    except ValueError:
+        return None
+
+
+class ScratchSpace:
+    """
+    Budget for temporary files written while converting.
+
+    Everything that extracts archive members or runs external converters
+    reserves the bytes it is about to write and releases them once the files
+    are gone, so the total stays under `quota_bytes`. `root` places the scratch
+    directories on a chosen volume (e.g. a tmpfs); it defaults to
+    `$ANY2MD_SCRATCH_DIR`, then the system temp directory. The quota defaults to
+    `$ANY2MD_SCRATCH_QUOTA_MB` and is unlimited otherwise. Accounting is per
+    process.
+
+    `reserve(..., wait=True)` turns the quota into a governor for pipelines
+    that release space as they go: the caller blocks until enough is released,
+    for up to `wait_seconds`, as long as something else currently holds space.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        quota_bytes: Optional[int] = None,
+        max_ratio: float = DEFAULT_MAX_RATIO,
+        wait_seconds: float = 300.0,
+    ):
+        if root is None and os.environ.get("ANY2MD_SCRATCH_DIR"):
+            root = Path(os.environ["ANY2MD_SCRATCH_DIR"])
+        self.root = Path(root) if root is not None else None
+        self.quota_bytes = quota_bytes if quota_bytes is not None else _env_quota_bytes()
+        self.max_ratio = max_ratio
+        self.wait_seconds = wait_seconds
+        self.used_bytes = 0
+        self._lock = threading.Condition()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["used_bytes"] = 0
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Condition()
+
+    def _fits(self, nbytes: int) -> bool:
+        return self.quota_bytes is None or self.used_bytes + nbytes <= self.quota_bytes
+
+    def reserve(self, nbytes: int, wait: bool = False) -> None:
+        with self._lock:
+            if wait and not self._fits(nbytes):
+                deadline = time.monotonic() + self.wait_seconds
+                while not self._fits(nbytes) and self.used_bytes > 0:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._lock.wait(remaining)
+            if not self._fits(nbytes):
+                raise ScratchQuotaError(
+                    f"临时空间不足：需要 {nbytes / 1048576:.1f} MB，"
+                    f"已用 {self.used_bytes / 1048576:.1f} MB / "
+                    f"上限 {self.quota_bytes / 1048576:.1f} MB"
+                )
+            self.used_bytes += nbytes
+
+    def release(self, nbytes: int) -> None:
+        with self._lock:
+            self.used_bytes = max(0, self.used_bytes - nbytes)
+            self._lock.notify_all()
+
+    def check_member(self, info: zipfile.ZipInfo) -> None:
+        """Refuse archive members whose compression ratio looks like a bomb."""
+        if info.file_size < _RATIO_MIN_BYTES:
+            return
+        if info.file_size > max(info.compress_size, 1) * self.max_ratio:
+            raise ArchiveBombError(
+                f"疑似压缩炸弹，已停止解压：{info.filename} "
+                f"({info.compress_size} → {info.file_size} 字节)"
+            )
+
+    def _ensure_root(self) -> None:
+        if self.root is not None:
+            self.root.mkdir(parents=True, exist_ok=True)
+
+    def mkdtemp(self, prefix: str = "any2md_") -> Path:
+        self._ensure_root()
+        return Path(tempfile.mkdtemp(prefix=prefix, dir=self.root))
+
+    def temporary_file(self) -> IO[bytes]:
+        """An anonymous temporary file under `root`; not charged to the quota."""
+        self._ensure_root()
+        return tempfile.TemporaryFile(dir=self.root)
+
+    @contextmanager
+    def tempdir(self, prefix: str = "any2md_", reserve: int = 0) -> Iterator[Path]:
+        """
+        A temporary directory under `root`, charged `reserve` bytes while it
+        exists. Waits for other temporary space to be released when full.
+        """
+        self.reserve(reserve, wait=True)
+        try:
+            path = self.mkdtemp(prefix)
+            try:
+                yield path
+            finally:
+                shutil.rmtree(path, ignore_errors=True)
+        finally:
+            self.release(reserve)
+
+
+_default: Optional[ScratchSpace] = None
+_default_lock = threading.Lock()
+
+
+def default_scratch() -> ScratchSpace:
+    """The process-wide scratch space, configured from the environment."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ScratchSpace()
+        return _default
@@ -0,0 +1,290 @@
+import codecs
+import csv
+import io
+import itertools
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable, Iterable, Optional, Sequence, Union
+
+
+Rows = Iterable[Sequence[object]]
+Source = Union[Path, IO[bytes]]
+
+# Bytes inspected to pick the encoding and the CSV dialect.
+_CSV_SAMPLE_BYTES = 64 * 1024
+_CSV_READ_BUFFER = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class TableOptions:
+    """
+    How spreadsheet-like inputs are turned into markdown tables.
+
+    `max_rows` caps the body rows written per sheet (the header row is always
+    kept). With `sample`, the rows kept are a random sample spread over the
+    whole sheet instead of the first ones; the sample is reproducible for a
+    given `seed` and keeps the original row order. `drop_empty_cols` needs a
+    second pass over each sheet to find the columns that are empty.
+    """
+
+    drop_empty_rows: bool = True
+    drop_empty_cols: bool = False
+    max_rows: Optional[int] = None
+    sample: bool = False
+    seed: int = 0
+
+
+def format_cell(value: object) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value)
+    if "|" in text:
+        text = text.replace("|", "\\|")
+    if "\n" in text or "\r" in text:
+        text = " ".join(text.splitlines())
+    return text
+
+
+def _cells(row: Sequence[object]) -> list[str]:
+    cells = [format_cell(value) for value in row]
+    while cells and not cells[-1]:
+        cells.pop()
+    return cells
+
+
+def non_empty_columns(rows: Rows) -> list[int]:
+    """Indexes of the columns that have at least one non-empty cell."""
+    seen: set[int] = set()
+    for row in rows:
+        for i, value in enumerate(row):
+            if i not in seen and format_cell(value):
+                seen.add(i)
+    return sorted(seen)
+
+
+def _sample_rows(rows: Iterable[list[str]], k: int, seed: int) -> tuple[list[list[str]], int]:
+    # Reservoir sampling: memory is bounded by `k`, whatever the row count.
+    rng = random.Random(seed)
+    reservoir: list[tuple[int, list[str]]] = []
+    total = 0
+    for i, row in enumerate(rows):
+        total += 1
+        if len(reservoir) < k:
+            reservoir.append((i, row))
+        else:
+            j = rng.randrange(total)
+            if j < k:
+                reservoir[j] = (i, row)
+    reservoir.sort(key=lambda item: item[0])
+    return [row for _, row in reservoir], total
+
+
+def write_table(
+    rows: Callable[[], Rows],
+    out: IO[str],
+    options: TableOptions = TableOptions(),
+    width: Optional[int] = None,
+) -> None:
+    """
+    Write one sheet as a markdown table, row by row.
+
+    `rows` returns a fresh iterator over the sheet's rows. The first row left
+    after dropping empty rows becomes the header, padded to the sheet's column
+    count `width`: renderers drop cells past the header. Unless `width` is
+    given, `rows` is called twice and the first pass measures it over the rows
+    that will be shown; with `options.drop_empty_cols` the pass that finds the
+    non-empty columns does it.
+    """
+    limit = options.max_rows
+    columns = non_empty_columns(rows()) if options.drop_empty_cols else None
+
+    def cells() -> Iterable[list[str]]:
+        for row in rows():
+            if columns is not None:
+                row = [row[i] if i < len(row) else None for i in columns]
+            values = _cells(row)
+            if options.drop_empty_rows and not values:
+                continue
+            yield values
+
+    if columns is not None:
+        width = len(columns)
+    elif width is None:
+        shown = cells()
+        if limit is not None and not options.sample:
+            shown = itertools.islice(shown, limit + 1)
+        width = max((len(values) for values in shown), default=0)
+
+    body = iter(cells())
+    header = next(body, None)
+    if header is None:
+        return
+    width = max(len(header), width, 1)
+    header += [""] * (width - len(header))
+
+    def line(values: list[str]) -> str:
+        if len(values) < width:
+            values = values + [""] * (width - len(values))
+        return "| " + " | ".join(values) + " |\n"
+
+    out.write(line(header))
+    out.write("| " + " | ".join(["---"] * width) + " |\n")
+
+    if limit is not None and options.sample:
+        sample, total = _sample_rows(body, limit, options.seed)
+        for values in sample:
+            out.write(line(values))
+        if total > len(sample):
+            out.write(f"\n*抽样显示 {len(sample)} / {total} 行*\n")
+        return
+
+    written = 0
+    for values in body:
+        if limit is not None and written >= limit:
+            out.write(f"\n*仅显示前 {limit} 行*\n")
+            return
+        out.write(line(values))
+        written += 1
+
+
+def write_xlsx(source: Source, out: IO[str], options: TableOptions = TableOptions()) -> None:
+    """
+    Stream every worksheet of an .xlsx workbook as `## <sheet>` plus a table.
+
+    The workbook is read with openpyxl's read-only mode, so rows are parsed
+    from the sheet XML as they are written and memory does not grow with the
+    sheet size. Formula cells show their last cached value.
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        for i, ws in enumerate(wb.worksheets):
+            if i:
+                out.write("\n")
+            out.write(f"## {ws.title}\n")
+            # The <dimension> element is often wrong (many exporters write
+            # "A1"), and read-only mode would clip every row to it.
+            ws.reset_dimensions()
+            write_table(lambda: ws.iter_rows(values_only=True), out, options)
+    finally:
+        wb.close()
+
+
+def _xls_rows(sheet, datemode: int) -> Rows:
+    import xlrd
+
+    for r in range(sheet.nrows):
+        row = []
+        for cell in sheet.row(r):
+            if cell.ctype == xlrd.XL_CELL_DATE:
+                try:
+                    row.append(xlrd.xldate_as_datetime(cell.value, datemode))
+                    continue
+                except (ValueError, OverflowError):
+                    pass
+            elif cell.ctype == xlrd.XL_CELL_BOOLEAN:
+                row.append(bool(cell.value))
+                continue
+            elif cell.ctype in (xlrd.XL_CELL_ERROR, xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+                row.append(None)
+                continue
+            row.append(cell.value)
+        yield row
+
+
+def write_xls(source: Path, out: IO[str], options: TableOptions = TableOptions()) -> None:
+    """
+    Stream every sheet of a legacy .xls workbook with xlrd.
+
+    Sheets are loaded on demand and unloaded once written, so only one sheet
+    is held in memory at a time; rows are formatted as they are written.
+    """
+    import xlrd
+
+    book = xlrd.open_workbook(str(source), on_demand=True)
+    try:
+        for i in range(book.nsheets):
+            sheet = book.sheet_by_index(i)
+            if i:
+                out.write("\n")
+            out.write(f"## {sheet.name}\n")
+            write_table(
+                lambda: _xls_rows(sheet, book.datemode), out, options, sheet.ncols
+            )
+            book.unload_sheet(i)
+    finally:
+        book.release_resources()
+
+
+def _decodes_as(sample: bytes, encoding: str) -> bool:
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        # A multi-byte character may be cut off at the end of the sample.
+        decoder.decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _sniff_encoding(sample: bytes) -> str:
+    # UTF-8 first, then the Chinese Windows code page most exports use.
+    if _decodes_as(sample, "utf-8"):
+        return "utf-8-sig"
+    if _decodes_as(sample, "gb18030"):
+        return "gb18030"
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:
+        return "latin-1"
+    best = from_bytes(sample).best()
+    return best.encoding if best is not None else "latin-1"
+
+
+def _sniff_dialect(sample: str) -> type[csv.Dialect]:
+    # Drop the last, possibly incomplete, line before sniffing.
+    head = sample.rsplit("\n", 1)[0] if "\n" in sample else sample
+    try:
+        return csv.Sniffer().sniff(head, delimiters=",;\t|")
+    except csv.Error:
+        return csv.excel
+
+
+def write_csv(source: Source, out: IO[str], options: TableOptions = TableOptions()) -> None:
+    """
+    Stream a CSV file as a markdown table.
+
+    The encoding and dialect are sniffed from the first 64 KB; the rest is
+    read through a fixed-size buffer and written row by row, so memory does
+    not depend on the file size.
+    """
+    raw = source.open("rb", buffering=_CSV_READ_BUFFER) if isinstance(source, Path) else source
+    try:
+        start = raw.tell()
+        sample = raw.read(_CSV_SAMPLE_BYTES)
+        encoding = _sniff_encoding(sample)
+        dialect = _sniff_dialect(sample.decode(encoding, errors="ignore"))
+
+        def rows() -> Rows:
+            raw.seek(start)
+            text = io.TextIOWrapper(raw, encoding=encoding, errors="replace", newline="")
+            try:
+                yield from csv.reader(text, dialect)
+            finally:
+                # Keep the underlying file open for the next pass.
+                text.detach()
+
+        write_table(rows, out, options)
+    finally:
+        if isinstance(source, Path):
+            raw.close()
+
+
+# Formats converted by streaming straight into the output file.
+TABLE_WRITERS: dict[str, Callable[[Source, IO[str], TableOptions], None]] = {
+    ".xlsx": write_xlsx,
+    ".csv": write_csv,
+}
@@ -1,8 +1,20 @@
+import io
 import zipfile
 import tempfile
 import shutil
-from pathlib import Path
-from typing import Optional
+import posixpath
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import IO, Callable, Iterator, Optional, Union
+
+from .scratch import ScratchSpace, default_scratch
+
+
+# Members up to this size are buffered in memory when read from an archive;
+# larger ones spill to a temporary file.
+DEFAULT_SPILL_BYTES = 32 * 1024 * 1024
 
 
 _MOJIBAKE_HINT_CHARS = set("╬║═╔╦╩╚╠╣╧╨╤┐┘┌└─│▒▓░╪╫╘╛╒╓╜╞╟╢╖╕╝╗")
@@ -32,26 +44,186 @@ def _safe_join(root: Path, relative: str) -> Path:
     return dest
 
 
+def _safe_member_path(prefix: PurePosixPath, name: str) -> PurePosixPath:
+    normalized = posixpath.normpath(name.replace("\\", "/"))
+    if normalized.startswith(("/", "../")) or normalized == "..":
+        raise ValueError(f"Unsafe zip path: {name}")
+    return prefix / normalized
+
+
+class _ReservedFile(io.BufferedIOBase):
+    """
+    A spilled member's scratch file. Its reservation is returned as soon as it
+    is closed rather than when the last reference to it goes away, so a
+    pipeline waiting for scratch space is not held up by stale references.
+    """
+
+    def __init__(self, file: IO[bytes], release: Callable[[], None]):
+        self._file = file
+        self._release = release
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        return self._file.read(size)
+
+    def read1(self, size: int = -1) -> bytes:
+        return self._file.read1(size)
+
+    def readinto(self, b) -> int:
+        return self._file.readinto(b)
+
+    def write(self, b) -> int:
+        return self._file.write(b)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def flush(self) -> None:
+        if not self.closed:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            super().close()
+            self._file.close()
+        finally:
+            self._release()
+
+
+@dataclass
+class ZipMember:
+    """
+    A file inside a (possibly nested) archive. `path` is relative to the
+    outermost archive, with nested archives shown as a folder named after the
+    archive, the same layout `extract_recursive` produces on disk. A member can
+    only be read while the iteration that produced it is still on its archive.
+    """
+
+    path: PurePosixPath
+    size: int
+    _zf: zipfile.ZipFile
+    _info: zipfile.ZipInfo
+    _owner: "Unzipper"
+
+    def open(self) -> IO[bytes]:
+        return self._zf.open(self._info, "r")
+
+    def spool(self, wait: bool = False) -> IO[bytes]:
+        """
+        Copy the member into a seekable buffer that outlives the archive: in
+        memory up to the spill threshold, in a scratch file above it. Scratch
+        files are charged to the scratch budget until the buffer is closed;
+        `wait` blocks for earlier buffers to be released when the
+        budget is full.
+        """
+        return self._owner._spool(self._zf, self._info, wait=wait)
+
+
 class Unzipper:
-    def __init__(self, temp_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        temp_dir: Optional[Path] = None,
+        spill_threshold: int = DEFAULT_SPILL_BYTES,
+        scratch: Optional[ScratchSpace] = None,
+    ):
+        """
+        Everything written is charged to `scratch` (the process-wide scratch
+        space by default): members are checked for bomb-like compression
+        ratios and their sizes reserved against the quota before they are
+        decompressed. `release()` gives a file's bytes back early; `cleanup()`
+        releases the rest.
+        """
         self.temp_dir = temp_dir
+        self.spill_threshold = spill_threshold
+        self.scratch = scratch or default_scratch()
         self._temp_dirs: list[Path] = []
+        self._charged: dict[Path, int] = {}
+        self._charged_lock = threading.Lock()
 
-    def is_zip(self, file_path: Path) -> bool:
-        return file_path.suffix.lower() == ".zip" and zipfile.is_zipfile(file_path)
+    def _charge(self, info: zipfile.ZipInfo, dest: Optional[Path] = None) -> None:
+        self.scratch.check_member(info)
+        self.scratch.reserve(info.file_size)
+        if dest is not None:
+            with self._charged_lock:
+                self._charged[dest] = self._charged.get(dest, 0) + info.file_size
 
-    def _extract_internal(
-        self, zip_path: Path, output_dir: Optional[Path] = None
-    ) -> tuple[Path, list[Path]]:
-        zip_path = Path(zip_path)
+    def release(self, path: Path) -> None:
+        """Delete an extracted file and return its bytes to the scratch budget."""
+        path = Path(path)
+        with self._charged_lock:
+            nbytes = self._charged.pop(path, None)
+            if nbytes is None:
+                nbytes = self._charged.pop(path.resolve(), 0)
+        path.unlink(missing_ok=True)
+        self.scratch.release(nbytes)
 
+    def _spool(
+        self, zf: zipfile.ZipFile, info: zipfile.ZipInfo, wait: bool = False
+    ) -> IO[bytes]:
+        # The size comes from the central directory, so the buffer kind can be
+        # chosen upfront; parsers also get a real io.BufferedIOBase this way,
+        # which SpooledTemporaryFile is not on every Python version.
+        self.scratch.check_member(info)
+        if info.file_size <= self.spill_threshold:
+            buf: IO[bytes] = io.BytesIO()
+        else:
+            self.scratch.reserve(info.file_size, wait=wait)
+            try:
+                if self.temp_dir is not None:
+                    file = tempfile.TemporaryFile(dir=self.temp_dir)
+                else:
+                    file = self.scratch.temporary_file()
+            except BaseException:
+                self.scratch.release(info.file_size)
+                raise
+            buf = _ReservedFile(
+                file, lambda: self.scratch.release(info.file_size)
+            )
+        try:
+            with zf.open(info, "r") as src:
+                shutil.copyfileobj(src, buf, 1024 * 1024)
+        except BaseException:
+            buf.close()
+            raise
+        buf.seek(0)
+        return buf
+
+    def _prepare_output_dir(self, output_dir: Optional[Path]) -> Path:
         if output_dir is None:
-            temp = tempfile.mkdtemp(prefix="any2md_")
-            output_dir = Path(temp)
+            if self.temp_dir is not None:
+                output_dir = Path(tempfile.mkdtemp(prefix="any2md_", dir=self.temp_dir))
+            else:
+                output_dir = self.scratch.mkdtemp("any2md_")
             self._temp_dirs.append(output_dir)
         else:
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
+        return output_dir
+
+    def is_zip(self, file_path: Path) -> bool:
+        return file_path.suffix.lower() == ".zip" and zipfile.is_zipfile(file_path)
+
+    def _extract_internal(
+        self, zip_path: Path, output_dir: Optional[Path] = None
+    ) -> tuple[Path, list[Path]]:
+        zip_path = Path(zip_path)
+        output_dir = self._prepare_output_dir(output_dir)
 
         nested_zips: list[Path] = []
 
@@ -64,6 +236,7 @@ class Unzipper:
                     dest_path.mkdir(parents=True, exist_ok=True)
                     continue
 
+                self._charge(info, dest_path)
                 dest_path.parent.mkdir(parents=True, exist_ok=True)
                 with zf.open(info, "r") as src, dest_path.open("wb") as dst:
                     shutil.copyfileobj(src, dst)
@@ -86,15 +259,152 @@ class Unzipper:
             if zipfile.is_zipfile(nested_zip):
                 nested_output = nested_zip.parent / nested_zip.stem
                 self.extract_recursive(nested_zip, nested_output)
-                nested_zip.unlink()
+                self.release(nested_zip)
 
         return extracted_dir
 
+    def extract_selective(
+        self,
+        zip_path: Path,
+        output_dir: Optional[Path] = None,
+        predicate: Optional[Callable[[Path], bool]] = None,
+        max_workers: Optional[int] = None,
+    ) -> list[Path]:
+        """
+        Extract only the members accepted by `predicate`, including those of
+        nested archives, and return the extracted paths (sorted).
+
+        `predicate` is called with each member's path relative to `output_dir`;
+        rejected members are never decompressed. Members are decompressed on a
+        thread pool, each thread with its own handle on every archive, and a
+        nested archive's members are queued as soon as the archive itself is
+        out. Nested archives are removed afterwards and their contents land in
+        a folder named after them, as with `extract_recursive`.
+        """
+        output_dir = self._prepare_output_dir(output_dir)
+        root = output_dir.resolve()
+        local = threading.local()
+        handles: list[zipfile.ZipFile] = []
+        handles_lock = threading.Lock()
+
+        def open_archive(archive: Path) -> zipfile.ZipFile:
+            archives = local.__dict__.setdefault("archives", {})
+            zf = archives.get(archive)
+            if zf is None:
+                zf = archives[archive] = zipfile.ZipFile(archive, "r")
+                with handles_lock:
+                    handles.append(zf)
+            return zf
+
+        def extract_member(archive: Path, info: zipfile.ZipInfo, dest: Path) -> Path:
+            self._charge(info, dest)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            with open_archive(archive).open(info, "r") as src, dest.open("wb") as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            return dest
+
+        def accepted(dest: Path) -> bool:
+            return predicate is None or predicate(dest.relative_to(root))
+
+        extracted: list[Path] = []
+        nested_zips: list[Path] = []
+        pending: set = set()
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+
+        def schedule(archive: Path, archive_root: Path) -> None:
+            with zipfile.ZipFile(archive, "r") as zf:
+                infos = zf.infolist()
+            for info in infos:
+                decoded_name = _decode_legacy_zip_name(info.filename)
+                dest = _safe_join(archive_root, decoded_name)
+                if info.is_dir():
+                    continue
+                # Archives are always opened; they may hold wanted files.
+                if dest.suffix.lower() != ".zip" and not accepted(dest):
+                    continue
+                pending.add(pool.submit(extract_member, archive, info, dest))
+
+        try:
+            schedule(Path(zip_path), root)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    dest = future.result()
+                    if dest.suffix.lower() == ".zip" and zipfile.is_zipfile(dest):
+                        nested_zips.append(dest)
+                        schedule(dest, dest.parent / dest.stem)
+                    elif accepted(dest):
+                        extracted.append(dest)
+                    else:
+                        self.release(dest)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            for zf in handles:
+                zf.close()
+            for nested_zip in nested_zips:
+                self.release(nested_zip)
+
+        return sorted(extracted)
+
+    def iter_members(
+        self,
+        zip_path: Union[Path, IO[bytes]],
+        predicate: Optional[Callable[[PurePosixPath], bool]] = None,
+    ) -> Iterator[ZipMember]:
+        """
+        Walk the archive's central directory without extracting anything.
+
+        Nested archives are opened from the parent's stream (spooled like any
+        other member) and walked in place. Members come in path order, the
+        order `sorted()` gives the same files extracted to disk. `predicate`
+        filters members by their virtual path; rejected members are never
+        decompressed.
+        """
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            yield from self._iter_archive(zf, PurePosixPath(), predicate)
+
+    def _iter_archive(
+        self,
+        zf: zipfile.ZipFile,
+        prefix: PurePosixPath,
+        predicate: Optional[Callable[[PurePosixPath], bool]],
+    ) -> Iterator[ZipMember]:
+        members = []
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            path = _safe_member_path(prefix, _decode_legacy_zip_name(info.filename))
+            # A nested archive's members go where it is extracted: a folder
+            # named after it.
+            layout = path.parent / path.stem if path.suffix.lower() == ".zip" else path
+            members.append((layout.parts, path, info))
+        members.sort(key=lambda item: item[0])
+
+        for _, path, info in members:
+            member = ZipMember(path, info.file_size, zf, info, self)
+
+            if path.suffix.lower() == ".zip":
+                with member.spool() as buf:
+                    if zipfile.is_zipfile(buf):
+                        with zipfile.ZipFile(buf, "r") as inner:
+                            yield from self._iter_archive(
+                                inner, path.parent / path.stem, predicate
+                            )
+                        continue
+
+            if predicate is None or predicate(path):
+                yield member
+
     def cleanup(self) -> None:
         for temp_dir in self._temp_dirs:
             if temp_dir.exists():
                 shutil.rmtree(temp_dir)
         self._temp_dirs.clear()
+        with self._charged_lock:
+            charged = sum(self._charged.values())
+            self._charged.clear()
+        self.scratch.release(charged)
 
     def __enter__(self):
         return self
@@ -0,0 +1 @@
+"""Reproducible throughput benchmarks: `python -m benchmarks --help`."""
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+
+from .corpus import MANIFEST, available_formats, generate, load_manifest
+from .runner import OPERATIONS, compare, measure
+
+
+def _print_table(cases: dict[str, dict]) -> None:
+    print(f"{'case':<32}{'files/s':>10}{'MB/s':>10}{'peak RSS MB':>14}{'failed':>8}")
+    for case, r in cases.items():
+        rss = "-" if r["peak_rss_mb"] is None else f"{r['peak_rss_mb']:.1f}"
+        print(
+            f"{case:<32}{r['files_per_s']:>10.2f}{r['mb_per_s']:>10.3f}"
+            f"{rss:>14}{r['failures']:>8}"
+        )
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="any2md throughput benchmarks"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="write the synthetic corpus")
+    gen.add_argument("corpus", type=Path)
+    gen.add_argument("--scale", type=int, default=1)
+    gen.add_argument("--seed", type=int, default=0)
+
+    run = sub.add_parser("run", help="measure the corpus, generating it if missing")
+    run.add_argument("corpus", type=Path)
+    run.add_argument("--scale", type=int, default=1, help="used when generating")
+    run.add_argument("--seed", type=int, default=0, help="used when generating")
+    run.add_argument("--formats", nargs="+", choices=available_formats())
+    run.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--baseline", type=Path, help="fail on regressions against this file")
+    run.add_argument(
+        "--tolerance", type=float, default=0.2, help="allowed regression (0.2 = 20%%)"
+    )
+    run.add_argument("--save", type=Path, help="write the results here (e.g. a new baseline)")
+    run.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv[1:])
+
+    if args.command == "generate":
+        manifest = generate(args.corpus, scale=args.scale, seed=args.seed)
+        for name, info in manifest["formats"].items():
+            print(f"{name:<6}{info['files']:>6} files {info['bytes'] / 1e6:>9.2f} MB")
+        return 0
+
+    if not (args.corpus / MANIFEST).exists():
+        generate(args.corpus, scale=args.scale, seed=args.seed)
+    manifest = load_manifest(args.corpus)
+    formats = [f for f in args.formats or manifest["formats"] if f in manifest["formats"]]
+
+    report = {
+        "corpus": manifest,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": measure(args.corpus, formats, tuple(args.operations), args.repeat),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_table(report["cases"])
+    if args.save:
+        args.save.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        problems = compare(report, baseline, args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        if problems:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
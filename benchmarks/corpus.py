@@ -0,0 +1,195 @@
+"""Deterministic synthetic corpus for the benchmarks.
+
+The same `seed` and `scale` always produce byte-identical files, so results
+from different runs and machines measure the same input.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import random
+import re
+import zipfile
+from pathlib import Path
+from typing import Callable
+
+# Fixed timestamp for zip entries and OOXML document properties.
+_EPOCH = (2024, 1, 1, 0, 0, 0)
+_EPOCH_ISO = "2024-01-01T00:00:00Z"
+_CORE_DATES = re.compile(
+    rb"(<dcterms:(created|modified)[^>]*>)[^<]*(</dcterms:\2>)"
+)
+
+_WORDS = (
+    "alpha beta gamma delta report budget quarter revenue market customer "
+    "project schedule review meeting summary result design system network "
+    "文档 转换 表格 数据 项目 报告 会议 总结 市场 客户"
+).split()
+
+MANIFEST = "corpus.json"
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _entry(name: str) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, _EPOCH)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+
+def _normalize_zip(data: bytes) -> bytes:
+    """Rewrite a zip container with fixed timestamps and creation dates."""
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(out, "w") as dst:
+        for info in src.infolist():
+            body = src.read(info)
+            if info.filename == "docProps/core.xml":
+                body = _CORE_DATES.sub(
+                    lambda m: m.group(1) + _EPOCH_ISO.encode() + m.group(3), body
+                )
+            dst.writestr(_entry(info.filename), body)
+    return out.getvalue()
+
+
+def _html(rng: random.Random, i: int) -> bytes:
+    parts = [f"<html><head><title>Page {i}</title></head><body><h1>Page {i}</h1>"]
+    for s in range(rng.randint(5, 40)):
+        parts.append(f"<h2>Section {s}</h2><p>{_sentence(rng, rng.randint(20, 80))}</p>")
+        if rng.random() < 0.3:
+            rows = "".join(
+                f"<tr><td>{r}</td><td>{rng.randint(0, 9999)}</td></tr>" for r in range(10)
+            )
+            parts.append(f"<table><tr><th>n</th><th>v</th></tr>{rows}</table>")
+    parts.append("</body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+def _csv(rng: random.Random, i: int) -> bytes:
+    lines = ["id,name,amount,date"]
+    for r in range(rng.randint(200, 5000)):
+        lines.append(
+            f"{r},{rng.choice(_WORDS)},{rng.uniform(0, 1e5):.2f},"
+            f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        )
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _xlsx(rng: random.Random, i: int) -> bytes:
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    for s in range(rng.randint(1, 3)):
+        ws = wb.active if s == 0 else wb.create_sheet()
+        ws.title = f"Sheet{s + 1}"
+        ws.append(["id", "name", "amount", "ratio"])
+        for r in range(rng.randint(100, 2000)):
+            ws.append([r, rng.choice(_WORDS), rng.randint(0, 10**6), round(rng.random(), 4)])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return _normalize_zip(buf.getvalue())
+
+
+def _pptx(rng: random.Random, i: int) -> bytes:
+    from pptx import Presentation
+
+    prs = Presentation()
+    for s in range(rng.randint(3, 20)):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Deck {i} slide {s}"
+        body = slide.placeholders[1].text_frame
+        body.text = _sentence(rng, 8)
+        for _ in range(rng.randint(1, 5)):
+            body.add_paragraph().text = _sentence(rng, rng.randint(5, 15))
+    buf = io.BytesIO()
+    prs.save(buf)
+    return _normalize_zip(buf.getvalue())
+
+
+def _docx(rng: random.Random, i: int) -> bytes:
+    import docx
+
+    document = docx.Document()
+    document.add_heading(f"Document {i}", level=1)
+    for s in range(rng.randint(5, 40)):
+        if rng.random() < 0.2:
+            document.add_heading(f"Section {s}", level=2)
+        document.add_paragraph(_sentence(rng, rng.randint(20, 120)))
+        if rng.random() < 0.1:
+            table = document.add_table(rows=6, cols=3)
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text = str(rng.randint(0, 999))
+    buf = io.BytesIO()
+    document.save(buf)
+    return _normalize_zip(buf.getvalue())
+
+
+def _zip(rng: random.Random, i: int) -> bytes:
+    """An archive of HTML and CSV files holding two levels of nested zips."""
+
+    def archive(depth: int) -> bytes:
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            for n in range(rng.randint(2, 6)):
+                zf.writestr(_entry(f"d{depth}/page{n}.html"), _html(rng, n))
+            zf.writestr(_entry(f"d{depth}/table.csv"), _csv(rng, depth))
+            if depth < 2:
+                zf.writestr(_entry(f"d{depth}/inner.zip"), archive(depth + 1))
+        return buf.getvalue()
+
+    return archive(0)
+
+
+# format -> (suffix, files per unit of scale, generator, required module)
+FORMATS: dict[str, tuple[str, int, Callable[[random.Random, int], bytes], str | None]] = {
+    "html": (".html", 40, _html, None),
+    "csv": (".csv", 10, _csv, None),
+    "xlsx": (".xlsx", 5, _xlsx, "openpyxl"),
+    "pptx": (".pptx", 10, _pptx, "pptx"),
+    "docx": (".docx", 20, _docx, "docx"),
+    "zip": (".zip", 4, _zip, None),
+}
+
+
+def available_formats() -> list[str]:
+    """Formats whose generator dependencies are importable here."""
+    import importlib.util
+
+    return [
+        name
+        for name, (_, _, _, module) in FORMATS.items()
+        if module is None or importlib.util.find_spec(module) is not None
+    ]
+
+
+def generate(
+    root: Path, scale: int = 1, seed: int = 0, formats: list[str] | None = None
+) -> dict:
+    """
+    Write the corpus to `root/<format>/` and return its manifest, which is also
+    saved as `root/corpus.json`. Formats whose generator needs a module that is
+    not installed (DOCX uses python-docx) are left out of the manifest.
+    """
+    root = Path(root)
+    manifest = {"seed": seed, "scale": scale, "formats": {}}
+    for name in formats or available_formats():
+        suffix, per_scale, make, _ = FORMATS[name]
+        rng = random.Random(f"{seed}:{name}")
+        fmt_dir = root / name
+        fmt_dir.mkdir(parents=True, exist_ok=True)
+        total = 0
+        count = per_scale * scale
+        for i in range(count):
+            data = make(rng, i)
+            (fmt_dir / f"{name}_{i:04d}{suffix}").write_bytes(data)
+            total += len(data)
+        manifest["formats"][name] = {"files": count, "bytes": total}
+    (root / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def load_manifest(root: Path) -> dict:
+    return json.loads((Path(root) / MANIFEST).read_text(encoding="utf-8"))
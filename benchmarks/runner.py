@@ -0,0 +1,156 @@
+"""Throughput and memory measurements over a generated corpus.
+
+Each (operation, format) case runs in a fresh interpreter so its peak RSS is
+not inflated by the cases before it. One untimed pass warms imports and the
+MarkItDown instance; the reported time is the best of `repeat` timed passes.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+OPERATIONS = ("convert_file", "convert_directory", "extract_recursive")
+
+# Higher is better for throughput, lower is better for memory.
+THROUGHPUT_METRICS = ("files_per_s", "mb_per_s")
+MEMORY_METRICS = ("peak_rss_mb",)
+
+
+def applies(operation: str, fmt: str) -> bool:
+    """Archives are measured by extraction, documents by conversion."""
+    return (operation == "extract_recursive") == (fmt == "zip")
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process, or None where unavailable."""
+    # On Linux ru_maxrss can carry over the parent's peak through fork/exec;
+    # VmHWM belongs to this process image only.
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _run_once(operation: str, files: list[Path], source: Path, out: Path) -> int:
+    """Run one pass and return the number of failed files."""
+    if operation == "extract_recursive":
+        from any2md.unzipper import Unzipper
+
+        with Unzipper() as unzipper:
+            for i, path in enumerate(files):
+                unzipper.extract_recursive(path, out / str(i))
+        return 0
+
+    from any2md.converter import Any2MDConverter
+
+    converter = Any2MDConverter()
+    if operation == "convert_directory":
+        results = converter.convert_directory(source, out)
+    else:
+        results = [converter.convert_file(path, out) for path in files]
+    return sum(not r.success for r in results)
+
+
+def run_case(operation: str, source: Path, repeat: int = 3) -> dict:
+    """Measure `operation` over every file in `source` in this process."""
+    files = sorted(p for p in Path(source).iterdir() if p.is_file())
+    size = sum(p.stat().st_size for p in files)
+
+    with tempfile.TemporaryDirectory(prefix="any2md_bench_") as td:
+        _run_once(operation, files[:1], source, Path(td) / "warmup")
+        best = float("inf")
+        failures = 0
+        for n in range(repeat):
+            started = time.perf_counter()
+            failures = _run_once(operation, files, source, Path(td) / f"run{n}")
+            best = min(best, time.perf_counter() - started)
+
+    return {
+        "files": len(files),
+        "bytes": size,
+        "seconds": round(best, 4),
+        "files_per_s": round(len(files) / best, 2),
+        "mb_per_s": round(size / best / 1e6, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "failures": failures,
+    }
+
+
+def measure(
+    corpus: Path,
+    formats: list[str],
+    operations: tuple[str, ...] = OPERATIONS,
+    repeat: int = 3,
+) -> dict[str, dict]:
+    """Run every applicable case in its own process, keyed `operation/format`."""
+    results = {}
+    for operation in operations:
+        for fmt in formats:
+            if not applies(operation, fmt):
+                continue
+            out = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.runner",
+                    operation,
+                    str(Path(corpus) / fmt),
+                    str(repeat),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+                cwd=_REPO_ROOT,
+            )
+            results[f"{operation}/{fmt}"] = json.loads(out.stdout.splitlines()[-1])
+    return results
+
+
+def _corpus_key(report: dict) -> tuple:
+    return report["corpus"]["seed"], report["corpus"]["scale"]
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Regressions of `current` against `baseline`: throughput that dropped, or
+    peak memory that grew, by more than `tolerance` (0.1 = 10%). Cases missing
+    from either side are not compared.
+    """
+    if _corpus_key(current) != _corpus_key(baseline):
+        return ["corpus seed/scale differ from the baseline's; regenerate it"]
+    problems = []
+    for case, base in baseline["cases"].items():
+        now = current["cases"].get(case)
+        if now is None:
+            continue
+        if now.get("failures", 0) > base.get("failures", 0):
+            problems.append(f"{case}: {now['failures']} failed files (baseline {base['failures']})")
+        for metric in THROUGHPUT_METRICS:
+            if base.get(metric) and now[metric] < base[metric] * (1 - tolerance):
+                problems.append(f"{case}: {metric} {now[metric]} < baseline {base[metric]}")
+        for metric in MEMORY_METRICS:
+            if base.get(metric) and now.get(metric) and now[metric] > base[metric] * (1 + tolerance):
+                problems.append(f"{case}: {metric} {now[metric]} > baseline {base[metric]}")
+    return problems
+
+
+if __name__ == "__main__":
+    operation, source, repeat = sys.argv[1], Path(sys.argv[2]), int(sys.argv[3])
+    print(json.dumps(run_case(operation, source, repeat)))
@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 from unittest.mock import MagicMock
 
@@ -16,5 +17,7 @@ sys.modules["magika"].Magika = MockMagika
 from any2md.gui_app import run_gui
 
 if __name__ == "__main__":
+    # Conversion runs in worker processes; frozen builds need this to start them.
+    multiprocessing.freeze_support()
     run_gui()
 
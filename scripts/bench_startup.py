@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules that must only be imported once a file needs them.
+HEAVY_MODULES = ("markitdown", "magika", "pdfminer", "pptx", "openpyxl", "xlrd", "pandas")
+
+COMMANDS = {
+    "import": [sys.executable, "-c", "import any2md.cli"],
+    "help": [sys.executable, "-m", "any2md", "--help"],
+}
+
+_PROBE = (
+    "import json, sys, any2md.cli; "
+    "print(json.dumps([m for m in {mods!r} if m in sys.modules]))"
+)
+
+# Runs the GUI with a window that reports launch-to-window time and exits.
+_GUI_PROBE = """
+import os, sys, time
+from PyQt6.QtCore import QTimer
+from any2md import gui_app
+
+launched = float(sys.argv[1])
+
+
+class ProbeWindow(gui_app.ZenWindow):
+    def show(self):
+        super().show()
+
+        def report():
+            print(f"{(time.time() - launched) * 1000:.1f}", flush=True)
+            os._exit(0)
+
+        QTimer.singleShot(0, report)
+
+
+gui_app.ZenWindow = ProbeWindow
+gui_app.run_gui()
+"""
+
+
+def _time_command(cmd: list[str], runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _time_gui(runs: int) -> list[float]:
+    """Launch-to-window times of the GUI, reported by `_GUI_PROBE`."""
+    env = dict(os.environ)
+    if sys.platform.startswith("linux") and not env.get("DISPLAY"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _GUI_PROBE, repr(time.time())],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def heavy_imports() -> list[str]:
+    """Heavy modules pulled in by importing the CLI (should be empty)."""
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(mods=HEAVY_MODULES)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout)
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Measure any2md CLI and GUI startup time")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--max-ms", type=float, default=None, help="fail if a median exceeds this"
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument(
+        "--gui", action="store_true", help="also time the GUI until its window is shown"
+    )
+    args = parser.parse_args(argv[1:])
+
+    # One untimed run warms the bytecode and filesystem caches.
+    subprocess.run(COMMANDS["import"], check=True)
+
+    results = {}
+    for name, cmd in COMMANDS.items():
+        samples = _time_command(cmd, args.runs)
+        results[name] = {
+            "median_ms": round(statistics.median(samples), 1),
+            "min_ms": round(min(samples), 1),
+        }
+    timed = list(COMMANDS)
+    if args.gui:
+        if importlib.util.find_spec("PyQt6") is None:
+            print("PyQt6 is not installed; skipping --gui", file=sys.stderr)
+        else:
+            samples = _time_gui(args.runs)
+            results["gui"] = {
+                "median_ms": round(statistics.median(samples), 1),
+                "min_ms": round(min(samples), 1),
+            }
+            timed.append("gui")
+    results["heavy_imports"] = heavy_imports()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name in timed:
+            r = results[name]
+            print(f"{name:<8} median {r['median_ms']:>7.1f} ms   min {r['min_ms']:>7.1f} ms")
+        print(f"heavy imports: {', '.join(results['heavy_imports']) or 'none'}")
+
+    if results["heavy_imports"]:
+        return 1
+    if args.max_ms is not None and any(
+        results[name]["median_ms"] > args.max_ms for name in timed
+    ):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,53 @@
+import zipfile
+
+from benchmarks.corpus import generate, load_manifest
+from benchmarks.runner import compare, run_case
+
+
+def _report(**case):
+    base = {"files_per_s": 10.0, "mb_per_s": 1.0, "peak_rss_mb": 100.0, "failures": 0}
+    return {"corpus": {"seed": 0, "scale": 1}, "cases": {"convert_file/html": {**base, **case}}}
+
+
+class TestCorpus:
+    def test_generation_is_deterministic(self, tmp_path):
+        first = generate(tmp_path / "a", formats=["html", "xlsx", "zip"])
+        generate(tmp_path / "b", formats=["html", "xlsx", "zip"])
+
+        assert first == load_manifest(tmp_path / "a")
+        files = sorted(p.relative_to(tmp_path / "a") for p in (tmp_path / "a").rglob("*"))
+        assert files == sorted(p.relative_to(tmp_path / "b") for p in (tmp_path / "b").rglob("*"))
+        for rel in files:
+            if (tmp_path / "a" / rel).is_file():
+                assert (tmp_path / "a" / rel).read_bytes() == (tmp_path / "b" / rel).read_bytes()
+
+    def test_zip_archives_are_nested(self, tmp_path):
+        generate(tmp_path, formats=["zip"])
+
+        with zipfile.ZipFile(tmp_path / "zip" / "zip_0000.zip") as zf:
+            assert "d0/inner.zip" in zf.namelist()
+
+
+class TestRunner:
+    def test_run_case_reports_throughput(self, tmp_path):
+        generate(tmp_path, formats=["csv"])
+
+        result = run_case("convert_file", tmp_path / "csv", repeat=1)
+
+        assert result["files"] == 10
+        assert result["failures"] == 0
+        assert result["files_per_s"] > 0 and result["mb_per_s"] > 0
+
+    def test_compare_flags_regressions_beyond_tolerance(self):
+        baseline = _report()
+
+        assert compare(_report(files_per_s=9.0), baseline, 0.2) == []
+        assert len(compare(_report(files_per_s=7.0), baseline, 0.2)) == 1
+        assert len(compare(_report(peak_rss_mb=130.0), baseline, 0.2)) == 1
+        assert len(compare(_report(failures=1), baseline, 0.2)) == 1
+
+    def test_compare_rejects_a_different_corpus(self):
+        current = _report()
+        current["corpus"]["scale"] = 2
+
+        assert compare(current, _report(), 0.2)
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import pickle
+
+from any2md.cache import ConversionCache, hash_file
+
+
+class TestHashFile:
+    def test_matches_sha256(self, tmp_path):
+        f = tmp_path / "data.bin"
+        data = os.urandom(300_000)
+        f.write_bytes(data)
+
+        assert hash_file(f, chunk_size=4096) == hashlib.sha256(data).hexdigest()
+
+    def test_empty_file(self, tmp_path):
+        f = tmp_path / "empty.txt"
+        f.write_bytes(b"")
+
+        assert hash_file(f) == hashlib.sha256(b"").hexdigest()
+
+
+class TestConversionCache:
+    def test_roundtrip(self, tmp_path):
+        src = tmp_path / "a.txt"
+        src.write_text("hello")
+        cache = ConversionCache(tmp_path / "cache")
+
+        key = cache.key_for(src)
+        assert cache.get(key) is None
+
+        cache.put(key, "# hello", "Title")
+        assert cache.get(key) == ("# hello", "Title")
+
+    def test_key_depends_on_content_suffix_and_options(self, tmp_path):
+        a = tmp_path / "a.txt"
+        b = tmp_path / "b.txt"
+        c = tmp_path / "c.csv"
+        a.write_text("same")
+        b.write_text("same")
+        c.write_text("same")
+        cache = ConversionCache(tmp_path / "cache")
+
+        assert cache.key_for(a) == cache.key_for(b)
+        assert cache.key_for(a) != cache.key_for(c)
+        assert cache.key_for(a, {"x": 1}) != cache.key_for(a, {"x": 2})
+
+        b.write_text("different")
+        assert cache.key_for(a) != cache.key_for(b)
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ConversionCache(tmp_path / "cache", max_bytes=2500)
+        keys = [f"{i:02d}" + "0" * 62 for i in range(3)]
+
+        cache.put(keys[0], "a" * 1000, None)
+        cache.put(keys[1], "b" * 1000, None)
+        md0 = cache._paths(keys[0])[0]
+        md1 = cache._paths(keys[1])[0]
+        os.utime(md1, (1, 1))
+        os.utime(md0, (2, 2))
+
+        cache.put(keys[2], "c" * 1000, None)
+
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is not None
+        assert cache.total_bytes() <= 2500
+
+    def test_eviction_leaves_headroom(self, tmp_path):
+        cache = ConversionCache(tmp_path / "cache", max_bytes=10_000)
+        for i in range(10):
+            cache.put(f"{i:02d}" + "0" * 62, "x" * 985, None)
+        assert cache.total_bytes() <= 10_000
+
+        cache.put("10" + "0" * 62, "x" * 985, None)
+
+        assert cache.total_bytes() <= 9_000
+        assert cache.get("10" + "0" * 62) is not None
+
+    def test_budget_is_shared_between_instances(self, tmp_path):
+        # Like process workers: one directory, one index per process.
+        first = ConversionCache(tmp_path / "cache", max_bytes=5_000)
+        second = ConversionCache(tmp_path / "cache", max_bytes=5_000)
+        first.total_bytes()
+        second.total_bytes()
+        for i in range(4):
+            first.put(f"a{i}" + "0" * 62, "x" * 1000, None)
+            second.put(f"b{i}" + "0" * 62, "x" * 1000, None)
+
+        assert ConversionCache(tmp_path / "cache").total_bytes() <= 5_000
+
+    def test_index_rebuilt_from_disk(self, tmp_path):
+        cache = ConversionCache(tmp_path / "cache")
+        cache.put("ab" + "0" * 62, "x" * 100, "t")
+
+        reopened = ConversionCache(tmp_path / "cache")
+        assert reopened.total_bytes() == cache.total_bytes()
+
+        reopened.clear()
+        assert reopened.total_bytes() == 0
+        assert reopened.get("ab" + "0" * 62) is None
+
+    def test_picklable(self, tmp_path):
+        cache = ConversionCache(tmp_path / "cache", max_bytes=123)
+        clone = pickle.loads(pickle.dumps(cache))
+
+        assert clone.root == cache.root
+        assert clone.max_bytes == 123
@@ -0,0 +1,98 @@
+import json
+import threading
+from pathlib import Path
+
+import openpyxl
+from pptx import Presentation
+
+from any2md.converter import Any2MDConverter
+
+
+def _write_corpus(root: Path, copies: int) -> None:
+    for i in range(copies):
+        d = root / f"set{i}"
+        d.mkdir(parents=True)
+        (d / "page.html").write_text(
+            f"<html><body><h1>Page {i}</h1><ul><li>a</li><li>b</li></ul>"
+            f"<table><tr><th>k</th></tr><tr><td>{i}</td></tr></table></body></html>",
+            encoding="utf-8",
+        )
+        (d / "data.json").write_text(json.dumps({"id": i, "tags": ["x", "y"]}))
+        (d / "feed.xml").write_text(f"<root><item>{i}</item></root>")
+        (d / "legacy.txt").write_bytes(f"第 {i} 行中文\n".encode("gbk"))
+        (d / "notes.md").write_text(f"# Note {i}\n", encoding="utf-8")
+        (d / "table.csv").write_text(f"a,b\n{i},{i * 2}\n")
+
+        wb = openpyxl.Workbook()
+        wb.active.append(["n", "sq"])
+        for n in range(20):
+            wb.active.append([n, n * n + i])
+        wb.save(d / "sheet.xlsx")
+
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {i}"
+        slide.placeholders[1].text = "bullet"
+        prs.save(d / "deck.pptx")
+
+        try:
+            import docx
+        except ImportError:
+            continue
+        document = docx.Document()
+        document.add_heading(f"Doc {i}", level=1)
+        document.add_paragraph("paragraph")
+        document.save(d / "doc.docx")
+
+
+def _outputs(root: Path) -> dict:
+    return {p.relative_to(root): p.read_bytes() for p in sorted(root.rglob("*.md"))}
+
+
+class TestConcurrentConversion:
+    def test_parallel_output_matches_serial(self, tmp_path):
+        src = tmp_path / "src"
+        _write_corpus(src, copies=6)
+        converter = Any2MDConverter()
+
+        serial = converter.convert_directory(src, tmp_path / "serial", max_workers=1)
+        parallel = converter.convert_directory(src, tmp_path / "parallel", max_workers=8)
+
+        assert all(r.success for r in serial), [r.error for r in serial if not r.success]
+        assert all(r.success for r in parallel)
+        assert len(parallel) == len(serial) >= 48
+        assert _outputs(tmp_path / "parallel") == _outputs(tmp_path / "serial")
+
+    def test_each_thread_gets_its_own_markitdown(self):
+        converter = Any2MDConverter()
+        seen = []
+
+        def grab():
+            seen.append((converter.md, converter.md))
+
+        threads = [threading.Thread(target=grab) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert all(a is b for a, b in seen)
+        assert len({id(a) for a, _ in seen}) == 3
+        assert converter.md is not seen[0][0]
+
+    def test_batch_soffice_pool_stays_with_the_batch(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Any2MDConverter, "_find_soffice", lambda self: "soffice")
+        (tmp_path / "in").mkdir()
+        (tmp_path / "in" / "page.html").write_text("<p>x</p>")
+        converter = Any2MDConverter()
+        seen = []
+
+        def started(lane, path):
+            seen.append((converter.soffice_pool, converter._local.soffice_pool))
+
+        converter.convert_directory(tmp_path / "in", tmp_path / "out", on_started=started)
+
+        # Other threads sharing the converter never see (or lose) the batch's pool.
+        shared, batch = seen[0]
+        assert shared is None and batch is not None
+        assert converter.soffice_pool is None
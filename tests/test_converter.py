@@ -1,7 +1,9 @@
 import pytest
+import zipfile
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from any2md.converter import Any2MDConverter, ConvertResult
+from any2md.unzipper import Unzipper
 
 
 class TestAny2MDConverter:
@@ -50,7 +52,7 @@ class TestAny2MDConverter:
 
     @patch("any2md.converter.MarkItDown")
     def test_convert_file_success(self, mock_markitdown_class, tmp_path):
-        test_file = tmp_path / "test.txt"
+        test_file = tmp_path / "test.html"
         test_file.write_text("Hello World")
         output_dir = tmp_path / "output"
 
@@ -136,6 +138,53 @@ class TestAny2MDConverter:
         converter._convert_via_windows_com.assert_called_once()
         mock_md.convert.assert_called_once_with(str(converted))
 
+    @patch("any2md.converter.MarkItDown")
+    def test_convert_doc_via_soffice_pool(self, mock_markitdown_class, tmp_path):
+        test_file = tmp_path / "test.doc"
+        test_file.write_bytes(b"fake doc")
+
+        converted = tmp_path / "converted.docx"
+        converted.write_bytes(b"fake docx")
+
+        mock_result = Mock()
+        mock_result.text_content = "converted markdown"
+        mock_result.title = None
+        mock_markitdown_class.return_value.convert.return_value = mock_result
+
+        pool = Mock()
+        pool.convert.return_value = converted
+
+        converter = Any2MDConverter(soffice_pool=pool)
+        result = converter.convert_file(test_file)
+
+        assert result.success
+        pool.convert.assert_called_once()
+        assert pool.convert.call_args[0][0] == test_file
+
+    @patch("any2md.converter.MarkItDown")
+    def test_convert_file_cache_hit_skips_parsing(self, mock_markitdown_class, tmp_path):
+        from any2md.cache import ConversionCache
+
+        test_file = tmp_path / "test.html"
+        test_file.write_text("<p>hi</p>")
+
+        mock_result = Mock()
+        mock_result.text_content = "hi"
+        mock_result.title = "Cached"
+        mock_md = mock_markitdown_class.return_value
+        mock_md.convert.return_value = mock_result
+
+        converter = Any2MDConverter(cache=ConversionCache(tmp_path / "cache"))
+        first = converter.convert_file(test_file, tmp_path / "out1")
+        second = converter.convert_file(test_file, tmp_path / "out2")
+
+        assert mock_md.convert.call_count == 1
+        assert second.success
+        assert second.markdown == "hi"
+        assert second.title == "Cached"
+        assert (tmp_path / "out2" / "test.md").read_text() == "hi"
+        assert first.markdown == second.markdown
+
     @patch("any2md.converter.MarkItDown")
     def test_convert_directory(self, mock_markitdown_class, tmp_path):
         input_dir = tmp_path / "input"
@@ -185,6 +234,208 @@ class TestAny2MDConverter:
         assert len(results) == 1
 
 
+    def test_convert_directory_process_executor(self, tmp_path):
+        input_dir = tmp_path / "input"
+        (input_dir / "subdir").mkdir(parents=True)
+        (input_dir / "file1.txt").write_text("content1")
+        (input_dir / "subdir" / "file2.txt").write_text("content2")
+
+        output_dir = tmp_path / "output"
+
+        converter = Any2MDConverter()
+        results = converter.convert_directory(
+            input_dir, output_dir, max_workers=2, executor="process"
+        )
+
+        assert len(results) == 2
+        assert all(r.success for r in results)
+        assert all(r.markdown == "" for r in results)
+        assert (output_dir / "file1.md").read_text().strip() == "content1"
+        assert (output_dir / "subdir" / "file2.md").read_text().strip() == "content2"
+
+        merged = converter.merge_markdown(results, input_dir)
+        assert "content1" in merged and "content2" in merged
+
+    def test_thread_results_do_not_keep_written_markdown(self, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        for i in range(3):
+            (input_dir / f"page{i}.html").write_text(f"<p>content{i}</p>")
+        output_dir = tmp_path / "output"
+        seen = []
+
+        results = Any2MDConverter().convert_directory(
+            input_dir,
+            output_dir,
+            merged_path=output_dir / "merged.md",
+            on_result=lambda r: seen.append(r.markdown),
+        )
+
+        assert all("content" in m for m in seen)
+        assert all(r.success and r.markdown == "" for r in results)
+        merged = (output_dir / "merged.md").read_text(encoding="utf-8")
+        assert all(f"content{i}" in merged for i in range(3))
+
+    def test_convert_directory_progress_callbacks(self, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        for i in range(6):
+            (input_dir / f"file{i}.txt").write_text(f"content{i}")
+
+        discovered, started, finished = [], [], []
+        converter = Any2MDConverter()
+        results = converter.convert_directory(
+            input_dir,
+            tmp_path / "output",
+            max_workers=2,
+            on_discovered=discovered.append,
+            on_started=lambda lane, path: started.append((lane, path)),
+            on_result=finished.append,
+        )
+
+        assert sorted(discovered) == [r.input_path for r in results]
+        assert sorted(p for _, p in started) == sorted(discovered)
+        assert {lane for lane, _ in started} <= {0, 1}
+        assert len(finished) == 6
+
+    def test_convert_zip_without_extracting(self, tmp_path):
+        inner = tmp_path / "inner.zip"
+        with zipfile.ZipFile(inner, "w") as zf:
+            zf.writestr("deep.txt", "deep content")
+        zip_path = tmp_path / "notes.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("a.txt", "content a")
+            zf.writestr("skip.bin", b"\x00")
+            zf.write(inner, "sub/inner.zip")
+
+        output_dir = tmp_path / "output"
+        converter = Any2MDConverter()
+        results = converter.convert_zip(
+            zip_path, output_dir, merged_path=output_dir / "merged.md"
+        )
+
+        assert [r.input_path for r in results] == [
+            zip_path / "a.txt",
+            zip_path / "sub" / "inner" / "deep.txt",
+        ]
+        assert all(r.success for r in results)
+        assert (output_dir / "a.md").read_text().strip() == "content a"
+        assert (output_dir / "sub" / "inner" / "deep.md").exists()
+        merged = (output_dir / "merged.md").read_text(encoding="utf-8")
+        assert "## sub/inner/deep.txt" in merged
+
+    def test_convert_zip_merges_in_extracted_order(self, tmp_path):
+        inner = tmp_path / "inner.zip"
+        with zipfile.ZipFile(inner, "w") as zf:
+            zf.writestr("deep.txt", "deep")
+        zip_path = tmp_path / "in.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("z.txt", "z")
+            zf.writestr("a/b.txt", "ab")
+            zf.write(inner, "a/inner.zip")
+            zf.writestr("a.txt", "a")
+        converter = Any2MDConverter()
+
+        streamed = converter.convert_zip(
+            zip_path, tmp_path / "streamed", merged_path=tmp_path / "streamed.md"
+        )
+        extracted_dir = tmp_path / "extracted"
+        files = Unzipper().extract_selective(zip_path, extracted_dir)
+        extracted = converter.convert_directory(
+            extracted_dir,
+            tmp_path / "extracted_out",
+            files=files,
+            merged_path=tmp_path / "extracted.md",
+        )
+
+        def rel(results, base):
+            return [r.input_path.relative_to(base).as_posix() for r in results]
+
+        assert rel(streamed, zip_path) == ["a/b.txt", "a/inner/deep.txt", "a.txt", "z.txt"]
+        assert rel(extracted, extracted_dir) == rel(streamed, zip_path)
+        assert (tmp_path / "streamed.md").read_text(encoding="utf-8") == (
+            tmp_path / "extracted.md"
+        ).read_text(encoding="utf-8")
+
+    @patch("any2md.converter.MarkItDown")
+    def test_utf8_text_is_copied_without_parsing(self, mock_markitdown_class, tmp_path):
+        src = tmp_path / "notes.md"
+        src.write_text("# 标题\n\n正文\n", encoding="utf-8")
+
+        result = Any2MDConverter().convert_file(src, tmp_path / "out")
+
+        assert result.success
+        assert result.output_path.read_bytes() == src.read_bytes()
+        mock_markitdown_class.return_value.convert.assert_not_called()
+
+    def test_text_hardlink(self, tmp_path):
+        src = tmp_path / "notes.txt"
+        src.write_text("plain", encoding="utf-8")
+
+        result = Any2MDConverter(link_text=True).convert_file(src, tmp_path / "out")
+
+        assert result.output_path.samefile(src)
+
+    @patch("any2md.converter.MarkItDown")
+    def test_linked_output_never_overwrites_source(self, mock_markitdown_class, tmp_path):
+        src = tmp_path / "in" / "b.txt"
+        src.parent.mkdir()
+        src.write_text("plain", encoding="utf-8")
+        converter = Any2MDConverter(link_text=True)
+        converter.convert_file(src, tmp_path / "out")
+        gbk = "中文内容".encode("gbk")
+        with src.open("r+b") as f:  # rewritten in place: same inode
+            f.write(gbk)
+            f.truncate()
+        mock_markitdown_class.return_value.convert.return_value = Mock(
+            text_content="中文内容", title=None
+        )
+
+        result = converter.convert_file(src, tmp_path / "out")
+
+        assert src.read_bytes() == gbk
+        assert not result.output_path.samefile(src)
+        assert result.output_path.read_text(encoding="utf-8") == "中文内容"
+
+    def test_text_in_place_is_left_alone(self, tmp_path):
+        src = tmp_path / "notes.md"
+        src.write_text("keep me", encoding="utf-8")
+
+        result = Any2MDConverter().convert_file(src, tmp_path)
+
+        assert result.success
+        assert src.read_text(encoding="utf-8") == "keep me"
+
+    @patch("any2md.converter.MarkItDown")
+    def test_non_utf8_text_is_decoded(self, mock_markitdown_class, tmp_path):
+        src = tmp_path / "legacy.txt"
+        src.write_bytes("中文".encode("gbk"))
+        mock_md = mock_markitdown_class.return_value
+        mock_md.convert.return_value = Mock(text_content="中文", title=None)
+
+        result = Any2MDConverter().convert_file(src, tmp_path / "out")
+
+        mock_md.convert.assert_called_once()
+        assert result.output_path.read_text(encoding="utf-8") == "中文"
+
+    def test_convert_directory_unknown_executor(self, tmp_path):
+        converter = Any2MDConverter()
+
+        with pytest.raises(ValueError):
+            converter.convert_directory(tmp_path, tmp_path / "out", executor="fiber")
+
+    def test_html_title_survives_pickling(self, tmp_path):
+        import pickle
+
+        src = tmp_path / "page.html"
+        src.write_text("<html><head><title>T</title></head><body><p>x</p></body></html>")
+
+        result = Any2MDConverter().convert_file(src, tmp_path / "out")
+
+        assert type(result.title) is str
+        assert pickle.loads(pickle.dumps(result)).title == "T"
+
+
 class TestConvertResult:
     def test_success_result(self):
         result = ConvertResult(
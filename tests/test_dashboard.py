@@ -0,0 +1,88 @@
+import io
+import zipfile
+from pathlib import Path
+
+from rich.console import Console
+
+from any2md.converter import Any2MDConverter, ConvertResult
+from any2md.dashboard import ConvertDashboard, format_eta
+
+
+def _render(dashboard: ConvertDashboard) -> str:
+    console = Console(file=io.StringIO(), width=100, color_system=None)
+    console.print(dashboard)
+    return console.file.getvalue()
+
+
+class TestConvertDashboard:
+    def test_lanes_follow_workers(self, tmp_path):
+        a = tmp_path / "a.txt"
+        b = tmp_path / "b.txt"
+        a.write_bytes(b"x" * 100)
+        b.write_bytes(b"x" * 300)
+
+        dashboard = ConvertDashboard()
+        dashboard.discovered(a)
+        dashboard.discovered(b)
+        dashboard.started(0, a)
+        dashboard.started(1, b)
+
+        out = _render(dashboard)
+        assert "a.txt" in out and "b.txt" in out
+        assert "0/2" in out
+
+        dashboard.finished(ConvertResult(success=True, input_path=a))
+        out = _render(dashboard)
+        assert "a.txt" not in out
+        assert "空闲" in out
+        assert dashboard.bytes_done == 100
+
+    def test_failures_are_counted(self, tmp_path):
+        dashboard = ConvertDashboard()
+        dashboard.finished(
+            ConvertResult(success=False, input_path=Path("x.pdf"), error="boom")
+        )
+
+        assert dashboard.failed == 1
+        assert "失败 1" in _render(dashboard)
+
+    def test_eta_uses_remaining_bytes(self, tmp_path):
+        a = tmp_path / "a.txt"
+        b = tmp_path / "b.txt"
+        a.write_bytes(b"x" * 100)
+        b.write_bytes(b"x" * 100)
+
+        dashboard = ConvertDashboard()
+        dashboard.discovered(a)
+        dashboard.discovered(b)
+        assert dashboard.rates()[2] is None
+
+        dashboard.finished(ConvertResult(success=True, input_path=a))
+        files_per_sec, bytes_per_sec, eta = dashboard.rates()
+        assert files_per_sec > 0 and bytes_per_sec > 0
+        assert eta is not None and eta >= 0
+
+    def test_zip_members_count_their_size(self, tmp_path):
+        archive = tmp_path / "docs.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("a.html", "<p>" + "x" * 500 + "</p>")
+            zf.writestr("sub/b.txt", "y" * 300)
+
+        dashboard = ConvertDashboard()
+        Any2MDConverter().convert_zip(
+            archive,
+            tmp_path / "out",
+            merged_path=tmp_path / "out" / "merged.md",
+            on_discovered=dashboard.discovered,
+            on_started=dashboard.started,
+            on_result=dashboard.finished,
+        )
+
+        assert dashboard.bytes_total == 507 + 300
+        assert dashboard.bytes_done == dashboard.bytes_total
+
+
+def test_format_eta():
+    assert format_eta(None) == "--:--"
+    assert format_eta(75) == "01:15"
+    assert format_eta(3725) == "1:02:05"
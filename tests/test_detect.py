@@ -0,0 +1,97 @@
+import threading
+import zipfile
+from unittest.mock import Mock, patch
+
+import magika
+import markitdown
+import pytest
+
+from any2md.converter import Any2MDConverter
+from any2md.detect import extension_trusted, install_sniff_gate
+
+HTML = "<html><body><h1>Title</h1><p>Body text</p></body></html>"
+
+
+@pytest.fixture
+def identify_calls():
+    real = magika.Magika.identify_stream
+    calls = []
+
+    def spy(self, stream):
+        calls.append(stream)
+        return real(self, stream)
+
+    with patch.object(magika.Magika, "identify_stream", spy):
+        yield calls
+
+
+class TestExtensionTrust:
+    def test_trusted_suffix_skips_content_sniffing(self, identify_calls, tmp_path):
+        src = tmp_path / "page.html"
+        src.write_text(HTML, encoding="utf-8")
+
+        result = Any2MDConverter().convert_file(src)
+
+        assert result.success
+        assert "# Title" in result.markdown
+        assert identify_calls == []
+
+    def test_sniffing_can_be_forced(self, identify_calls, tmp_path):
+        src = tmp_path / "page.html"
+        src.write_text(HTML, encoding="utf-8")
+
+        result = Any2MDConverter(trust_extensions=False).convert_file(src)
+
+        assert result.success
+        assert len(identify_calls) == 1
+
+    def test_misnamed_file_falls_back_to_detection(self, identify_calls, tmp_path):
+        src = tmp_path / "report.pdf"
+        src.write_text(HTML, encoding="utf-8")
+
+        result = Any2MDConverter().convert_file(src)
+
+        assert result.success
+        assert "Body text" in result.markdown
+        assert len(identify_calls) == 1
+
+    def test_corrupt_file_is_parsed_once(self, identify_calls, tmp_path):
+        src = tmp_path / "broken.docx"
+        with zipfile.ZipFile(src, "w") as zf:
+            zf.writestr(
+                "[Content_Types].xml",
+                '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                '<Override PartName="/word/document.xml" ContentType="application/'
+                'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+                "</Types>",
+            )
+            zf.writestr("word/document.xml", "<w:document><broken")
+        real = markitdown.MarkItDown._convert
+        parses = []
+
+        def spy(self, *args, **kwargs):
+            parses.append(args)
+            return real(self, *args, **kwargs)
+
+        with patch.object(markitdown.MarkItDown, "_convert", spy):
+            result = Any2MDConverter().convert_file(src)
+
+        assert not result.success
+        assert len(parses) == 1
+        assert len(identify_calls) == 1
+
+    def test_gate_only_applies_to_calling_thread(self):
+        md = Mock()
+        md._magika.identify_stream.return_value = "sniffed"
+        install_sniff_gate(md)
+        seen = []
+
+        with extension_trusted(md):
+            inside = md._magika.identify_stream(None)
+            other = threading.Thread(target=lambda: seen.append(md._magika.identify_stream(None)))
+            other.start()
+            other.join()
+
+        assert inside.status == "skipped"
+        assert seen == ["sniffed"]
+        assert md._magika.identify_stream(None) == "sniffed"
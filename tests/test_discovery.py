@@ -0,0 +1,114 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from any2md.discovery import Prefetcher, iter_files
+from any2md.scheduler import iter_by_cost
+
+
+def _touch(path: Path, data: bytes = b"x") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for rel in ["b.txt", "a.txt", "a/z.txt", "a-b/c.txt", "a/sub/y.txt", ".hidden/h.txt"]:
+        _touch(tmp_path / rel)
+    return tmp_path
+
+
+class TestIterFiles:
+    def test_same_order_as_sorted(self, tree):
+        files = list(iter_files(tree))
+
+        assert files == sorted(files)
+        assert len(files) == 6
+
+    def test_non_recursive(self, tree):
+        assert [p.name for p in iter_files(tree, recursive=False)] == ["a.txt", "b.txt"]
+
+    def test_predicate_and_skip_hidden_dirs(self, tree):
+        _touch(tree / "c.pdf")
+        _touch(tree / "a" / ".dotfile.txt")
+
+        files = list(
+            iter_files(tree, predicate=lambda p: p.suffix == ".txt", skip_hidden_dirs=True)
+        )
+
+        assert all(p.suffix == ".txt" for p in files)
+        assert not any(".hidden" in p.parts for p in files)
+        assert tree / "a" / ".dotfile.txt" in files
+
+    def test_symlinked_dirs_followed_on_request(self, tmp_path):
+        root = tmp_path / "root"
+        _touch(root / "a.txt")
+        _touch(tmp_path / "elsewhere" / "o.txt")
+        (root / "link").symlink_to(tmp_path / "elsewhere", target_is_directory=True)
+        (root / "loop").symlink_to(root, target_is_directory=True)
+
+        assert list(iter_files(root)) == [root / "a.txt"]
+        assert list(iter_files(root, follow_symlinks=True)) == [
+            root / "a.txt",
+            root / "link" / "o.txt",
+        ]
+
+    def test_should_stop(self, tree):
+        seen = []
+        for p in iter_files(tree, should_stop=lambda: len(seen) >= 2):
+            seen.append(p)
+
+        assert len(seen) == 2
+
+    def test_missing_root(self, tmp_path):
+        assert list(iter_files(tmp_path / "missing")) == []
+
+
+class TestPrefetcher:
+    def test_yields_all_items_in_order(self):
+        with Prefetcher(range(100), maxsize=4) as items:
+            assert list(items) == list(range(100))
+
+    def test_producer_error_is_reraised(self):
+        def source():
+            yield 1
+            raise OSError("boom")
+
+        with Prefetcher(source()) as items:
+            assert next(items) == 1
+            with pytest.raises(OSError, match="boom"):
+                next(items)
+
+    def test_runs_ahead_of_consumer_up_to_maxsize(self):
+        produced = []
+        blocked = threading.Event()
+
+        def source():
+            for i in range(10):
+                produced.append(i)
+                if i == 3:
+                    blocked.set()
+                yield i
+
+        with Prefetcher(source(), maxsize=2) as items:
+            blocked.wait(2)
+            assert next(items) == 0
+            # The queue holds at most two items while nobody consumes them.
+            assert len(produced) <= 5
+
+
+class TestIterByCost:
+    def test_window_orders_locally(self, tmp_path):
+        small = _touch(tmp_path / "small.txt", b"x")
+        big = _touch(tmp_path / "big.pdf", b"x" * 100_000)
+        mid = _touch(tmp_path / "mid.docx", b"x" * 10_000)
+
+        assert list(iter_by_cost([small, mid, big], window=3)) == [big, mid, small]
+
+    def test_window_bounds_lookahead(self, tmp_path):
+        small = _touch(tmp_path / "small.txt", b"x")
+        big = _touch(tmp_path / "big.pdf", b"x" * 100_000)
+
+        assert list(iter_by_cost([small, big], window=0)) == [small, big]
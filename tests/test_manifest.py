@@ -0,0 +1,114 @@
+import os
+from unittest.mock import Mock, patch
+
+from any2md.converter import Any2MDConverter
+from any2md.manifest import MANIFEST_NAME, SyncManifest
+
+
+def _mock_md(mock_markitdown_class):
+    mock_result = Mock()
+    mock_result.text_content = "converted"
+    mock_result.title = None
+    mock_md = mock_markitdown_class.return_value
+    mock_md.convert.return_value = mock_result
+    return mock_md
+
+
+class TestSyncManifest:
+    def test_roundtrip(self, tmp_path):
+        src = tmp_path / "a.txt"
+        src.write_text("a")
+        out = tmp_path / "out"
+        out.mkdir()
+        (out / "a.md").write_text("a")
+
+        manifest = SyncManifest(out)
+        manifest.record("a.txt", src, out / "a.md")
+        manifest.save()
+
+        reloaded = SyncManifest(out).load()
+        assert reloaded.entries["a.txt"].output == "a.md"
+        assert reloaded.is_current("a.txt", src, src.stat())
+
+    def test_touch_without_change_is_current(self, tmp_path):
+        src = tmp_path / "a.txt"
+        src.write_text("a")
+        manifest = SyncManifest(tmp_path / "out")
+        manifest.record("a.txt", src, None)
+
+        st = src.stat()
+        os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        assert manifest.is_current("a.txt", src, src.stat())
+
+        src.write_text("b")
+        assert not manifest.is_current("a.txt", src, src.stat())
+
+    def test_corrupt_manifest_is_ignored(self, tmp_path):
+        (tmp_path / MANIFEST_NAME).write_text("{not json")
+        assert SyncManifest(tmp_path).load().entries == {}
+
+
+class TestSyncDirectory:
+    @patch("any2md.converter.MarkItDown")
+    def test_only_changed_files_are_converted(self, mock_markitdown_class, tmp_path):
+        mock_md = _mock_md(mock_markitdown_class)
+        input_dir = tmp_path / "input"
+        (input_dir / "sub").mkdir(parents=True)
+        (input_dir / "a.txt").write_text("a")
+        (input_dir / "sub" / "b.html").write_text("<p>b</p>")
+        output_dir = tmp_path / "output"
+
+        converter = Any2MDConverter()
+        first = converter.sync_directory(input_dir, output_dir)
+        assert len(first.results) == 2
+        assert first.skipped == 0
+        assert (output_dir / MANIFEST_NAME).exists()
+
+        mock_md.convert.reset_mock()
+        second = converter.sync_directory(input_dir, output_dir)
+        assert second.results == []
+        assert second.skipped == 2
+        mock_md.convert.assert_not_called()
+
+        (input_dir / "a.txt").write_text("changed")
+        (input_dir / "c.txt").write_text("new")
+        third = converter.sync_directory(input_dir, output_dir)
+        assert sorted(r.input_path.name for r in third.results) == ["a.txt", "c.txt"]
+        assert third.skipped == 1
+
+    @patch("any2md.converter.MarkItDown")
+    def test_deleted_sources_remove_outputs(self, mock_markitdown_class, tmp_path):
+        _mock_md(mock_markitdown_class)
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        (input_dir / "a.txt").write_text("a")
+        (input_dir / "b.txt").write_text("b")
+        output_dir = tmp_path / "output"
+
+        converter = Any2MDConverter()
+        converter.sync_directory(input_dir, output_dir)
+        assert (output_dir / "b.md").exists()
+
+        (input_dir / "b.txt").unlink()
+        report = converter.sync_directory(input_dir, output_dir)
+
+        assert report.removed == [output_dir / "b.md"]
+        assert not (output_dir / "b.md").exists()
+        assert (output_dir / "a.md").exists()
+        assert "b.txt" not in SyncManifest(output_dir).load().entries
+
+    @patch("any2md.converter.MarkItDown")
+    def test_missing_output_is_reconverted(self, mock_markitdown_class, tmp_path):
+        _mock_md(mock_markitdown_class)
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        (input_dir / "a.txt").write_text("a")
+        output_dir = tmp_path / "output"
+
+        converter = Any2MDConverter()
+        converter.sync_directory(input_dir, output_dir)
+        (output_dir / "a.md").unlink()
+
+        report = converter.sync_directory(input_dir, output_dir)
+        assert len(report.results) == 1
+        assert (output_dir / "a.md").exists()
@@ -0,0 +1,97 @@
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from any2md.converter import Any2MDConverter, ConvertResult
+from any2md.merge import MERGE_HEADER, MergeWriter
+
+
+def _result(path: Path, markdown: str, **kwargs) -> ConvertResult:
+    return ConvertResult(success=True, input_path=path, markdown=markdown, **kwargs)
+
+
+class TestMergeWriter:
+    def test_out_of_order_results_are_written_in_order(self, tmp_path):
+        base = tmp_path / "in"
+        paths = [base / "a.txt", base / "b.txt", base / "c.txt"]
+        merged = tmp_path / "merged.md"
+
+        with MergeWriter(merged, base) as writer:
+            for p in paths:
+                writer.expect(p)
+            writer.add(_result(paths[2], "C"))
+            writer.add(_result(paths[0], "A"))
+            writer.add(_result(paths[1], "B", title="Bee"))
+
+        text = merged.read_text(encoding="utf-8")
+        assert text.startswith(MERGE_HEADER)
+        assert text.index("## a.txt") < text.index("## b.txt") < text.index("## c.txt")
+        assert "**标题**：Bee" in text
+
+    def test_held_results_are_read_back_from_disk(self, tmp_path):
+        first = tmp_path / "a.txt"
+        second = tmp_path / "b.txt"
+        out = tmp_path / "b.md"
+        out.write_text("from disk", encoding="utf-8")
+        held = _result(second, "in memory", output_path=out)
+
+        writer = MergeWriter(tmp_path / "merged.md", tmp_path)
+        writer.expect(first)
+        writer.expect(second)
+        writer.add(held)
+
+        assert held.markdown == "in memory"
+        assert writer._held[second].markdown == ""
+
+        writer.add(_result(first, "A"))
+        writer.close()
+        assert "from disk" in (tmp_path / "merged.md").read_text(encoding="utf-8")
+
+    def test_failed_and_skipped_entries_do_not_block(self, tmp_path):
+        paths = [tmp_path / "a.txt", tmp_path / "b.txt", tmp_path / "c.txt"]
+        merged = tmp_path / "merged.md"
+
+        writer = MergeWriter(merged, tmp_path)
+        for p in paths:
+            writer.expect(p)
+        writer.add(_result(paths[2], "C"))
+        writer.add(ConvertResult(success=False, input_path=paths[0], error="x"))
+        writer.skip(paths[1])
+        assert writer._held == {}
+        writer.close()
+
+        text = merged.read_text(encoding="utf-8")
+        assert "## a.txt" not in text
+        assert "## c.txt" in text
+
+
+class TestConvertDirectoryMerge:
+    @patch("any2md.converter.MarkItDown")
+    def test_merged_output_is_deterministic(self, mock_markitdown_class, tmp_path):
+        input_dir = tmp_path / "input"
+        (input_dir / "sub").mkdir(parents=True)
+        names = ["z.txt", "a.txt", "sub/m.txt", "b.html"]
+        for name in names:
+            (input_dir / name).write_text(name)
+
+        def convert(path):
+            return Mock(text_content=f"content of {Path(path).name}", title=None)
+
+        mock_markitdown_class.return_value.convert.side_effect = convert
+
+        converter = Any2MDConverter()
+        outputs = []
+        for run in range(3):
+            merged = tmp_path / f"merged{run}.md"
+            results = converter.convert_directory(
+                input_dir, tmp_path / f"out{run}", max_workers=4, merged_path=merged
+            )
+            outputs.append(merged.read_text(encoding="utf-8"))
+
+        assert outputs[0] == outputs[1] == outputs[2]
+        assert [r.input_path.relative_to(input_dir).as_posix() for r in results] == [
+            "a.txt",
+            "b.html",
+            "sub/m.txt",
+            "z.txt",
+        ]
+        assert outputs[0].index("## a.txt") < outputs[0].index("## z.txt")
@@ -0,0 +1,122 @@
+import threading
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from any2md.office import SofficePool
+
+
+def _fake_soffice(calls, fail_batches=False):
+    def run(cmd, timeout=None):
+        outdir = Path(cmd[cmd.index("--outdir") + 1])
+        ext = cmd[cmd.index("--convert-to") + 1]
+        inputs = cmd[cmd.index("--outdir") + 2 :]
+        calls.append((cmd[1], inputs))
+        if fail_batches and len(inputs) > 1:
+            return Mock(returncode=1, stdout="", stderr="crashed")
+        for name in inputs:
+            (outdir / f"{Path(name).stem}.{ext}").write_bytes(b"converted")
+        return Mock(returncode=0, stdout="", stderr="")
+
+    return run
+
+
+class TestSofficePool:
+    def test_convert_uses_private_profile(self, tmp_path):
+        src = tmp_path / "a.doc"
+        src.write_bytes(b"doc")
+        calls = []
+
+        with patch("any2md.office.run_command", side_effect=_fake_soffice(calls)):
+            with SofficePool("soffice", size=1, profile_root=tmp_path / "lo") as pool:
+                out = pool.convert(src, tmp_path / "out")
+
+        assert out == tmp_path / "out" / "a.docx"
+        assert out.exists()
+        assert calls[0][0].startswith("-env:UserInstallation=file://")
+
+    def test_concurrent_jobs_are_batched(self, tmp_path):
+        sources = []
+        for i in range(6):
+            p = tmp_path / f"f{i}.doc"
+            p.write_bytes(b"doc")
+            sources.append(p)
+
+        calls = []
+        gate = threading.Event()
+        fake = _fake_soffice(calls)
+
+        def slow_first(cmd, timeout=None):
+            gate.wait(5)
+            return fake(cmd, timeout)
+
+        with patch("any2md.office.run_command", side_effect=slow_first):
+            with SofficePool("soffice", size=1, batch_size=8) as pool:
+                futures = [pool.submit(p, tmp_path / "out") for p in sources]
+                gate.set()
+                outputs = [f.result(timeout=5) for f in futures]
+
+        assert all(o.exists() for o in outputs)
+        assert len(calls) < len(sources)
+
+    def test_duplicate_stems_not_batched_together(self, tmp_path):
+        (tmp_path / "x").mkdir()
+        (tmp_path / "y").mkdir()
+        a = tmp_path / "x" / "same.doc"
+        b = tmp_path / "y" / "same.doc"
+        a.write_bytes(b"doc")
+        b.write_bytes(b"doc")
+        calls = []
+
+        with patch("any2md.office.run_command", side_effect=_fake_soffice(calls)):
+            with SofficePool("soffice", size=1) as pool:
+                fa = pool.submit(a, tmp_path / "out_a")
+                fb = pool.submit(b, tmp_path / "out_b")
+                assert fa.result(timeout=5).exists()
+                assert fb.result(timeout=5).exists()
+
+        assert all(len(inputs) == 1 for _, inputs in calls)
+
+    def test_crashed_batch_restarts_and_retries(self, tmp_path):
+        sources = []
+        for i in range(3):
+            p = tmp_path / f"f{i}.ppt"
+            p.write_bytes(b"ppt")
+            sources.append(p)
+
+        calls = []
+        gate = threading.Event()
+        fake = _fake_soffice(calls, fail_batches=True)
+
+        def slow_first(cmd, timeout=None):
+            gate.wait(5)
+            return fake(cmd, timeout)
+
+        with patch("any2md.office.run_command", side_effect=slow_first):
+            with SofficePool("soffice", size=1) as pool:
+                futures = [pool.submit(p, tmp_path / "out") for p in sources]
+                gate.set()
+                outputs = [f.result(timeout=5) for f in futures]
+
+        assert [o.name for o in outputs] == ["f0.pptx", "f1.pptx", "f2.pptx"]
+        if any(len(inputs) > 1 for _, inputs in calls):
+            assert pool.restarts >= 1
+
+    def test_failure_is_reported(self, tmp_path):
+        src = tmp_path / "a.xls"
+        src.write_bytes(b"xls")
+
+        with patch(
+            "any2md.office.run_command",
+            return_value=Mock(returncode=1, stdout="", stderr="boom"),
+        ):
+            with SofficePool("soffice", size=1) as pool:
+                with pytest.raises(RuntimeError, match="boom"):
+                    pool.convert(src, tmp_path / "out")
+                assert pool.restarts == 1
+
+    def test_rejects_unsupported_suffix(self, tmp_path):
+        with SofficePool("soffice") as pool:
+            with pytest.raises(ValueError):
+                pool.submit(tmp_path / "a.docx", tmp_path)
@@ -0,0 +1,107 @@
+from pathlib import Path
+
+from any2md.converter import Any2MDConverter
+from any2md.pdf import PdfSplitter, count_pages, page_ranges
+
+
+def _write_pdf(path: Path, pages: int) -> Path:
+    """A minimal PDF whose page i shows the text `Page i`."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None]
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for i in range(pages):
+        page_id = len(objects) + 1
+        content = f"BT /F1 12 Tf 72 720 Td (Page {i}) Tj ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+        )
+        kids.append(f"{page_id} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(bytes(out))
+    return path
+
+
+class TestPageRanges:
+    def test_covers_all_pages_in_order(self):
+        ranges = page_ranges(1000, 4)
+
+        assert [len(r) for r in ranges] == [250, 250, 250, 250]
+        assert [p for r in ranges for p in r] == list(range(1000))
+
+    def test_uneven_split(self):
+        assert [len(r) for r in page_ranges(10, 3, min_pages=1)] == [4, 3, 3]
+
+    def test_min_pages_limits_parts(self):
+        assert len(page_ranges(50, 8, min_pages=20)) == 2
+        assert len(page_ranges(10, 8, min_pages=20)) == 1
+
+    def test_empty(self):
+        assert page_ranges(0, 4) == []
+
+
+class TestPdfSplitter:
+    def test_count_pages(self, tmp_path):
+        assert count_pages(_write_pdf(tmp_path / "a.pdf", 7)) == 7
+
+    def test_should_split_thresholds(self, tmp_path):
+        pdf = _write_pdf(tmp_path / "a.pdf", 6)
+
+        def splitter(**kwargs):
+            return PdfSplitter(min_pages_per_range=1, **kwargs)
+
+        assert splitter(page_threshold=5, workers=2).should_split(pdf)
+        assert not splitter(page_threshold=10, workers=2).should_split(pdf)
+        assert splitter(page_threshold=None, byte_threshold=1, workers=2).should_split(pdf)
+        assert not splitter(page_threshold=5, workers=1).should_split(pdf)
+
+    def test_too_few_pages_for_two_ranges_is_not_split(self, tmp_path):
+        pdf = _write_pdf(tmp_path / "a.pdf", 6)
+
+        big = PdfSplitter(page_threshold=None, byte_threshold=1, workers=4, min_pages_per_range=4)
+        assert not big.should_split(pdf)
+        assert not PdfSplitter(page_threshold=5, workers=4, min_pages_per_range=4).should_split(pdf)
+        assert PdfSplitter(page_threshold=5, workers=4, min_pages_per_range=3).should_split(pdf)
+
+    def test_broken_pdf_is_not_split(self, tmp_path):
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"not a pdf")
+
+        assert not PdfSplitter(page_threshold=1, workers=2).should_split(broken)
+
+    def test_split_keeps_page_order(self, tmp_path):
+        pdf = _write_pdf(tmp_path / "a.pdf", 9)
+
+        with PdfSplitter(page_threshold=1, workers=3, min_pages_per_range=1) as splitter:
+            text = splitter.convert(pdf)
+
+        positions = [text.index(f"Page {i}") for i in range(9)]
+        assert positions == sorted(positions)
+
+    def test_converter_uses_splitter(self, tmp_path):
+        pdf = _write_pdf(tmp_path / "a.pdf", 4)
+
+        with PdfSplitter(page_threshold=2, workers=2, min_pages_per_range=1) as splitter:
+            converter = Any2MDConverter(pdf_splitter=splitter)
+            result = converter.convert_file(pdf, tmp_path / "out")
+
+        assert result.success
+        assert "Page 0" in result.markdown and "Page 3" in result.markdown
+        assert result.output_path.read_text(encoding="utf-8") == result.markdown
@@ -0,0 +1,324 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from any2md.converter import Any2MDConverter
+from any2md.office import run_command
+from any2md.converter import MEMORY_ERROR
+from any2md.pool import WorkerLimits, WorkerPool, rss_bytes
+from any2md.quarantine import QUARANTINE_NAME, Quarantine
+
+
+needs_fork = pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="mocked MarkItDown only reaches workers through fork",
+)
+
+
+def _hang_on_slow(path):
+    if Path(path).stem.startswith("slow"):
+        time.sleep(60)
+    return Mock(text_content=f"ok {Path(path).name}", title=None)
+
+
+class TestRunCommand:
+    @pytest.mark.skipif(sys.platform == "win32", reason="uses sleep")
+    def test_timeout_kills_command(self):
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="超时"):
+            run_command(["sleep", "30"], timeout=0.2)
+        assert time.monotonic() - start < 10
+
+    def test_returns_completed_process(self):
+        proc = run_command([sys.executable, "-c", "print('hi')"], timeout=30)
+        assert proc.returncode == 0
+        assert proc.stdout.strip() == "hi"
+
+
+class TestWorkerPool:
+    def test_converts_in_workers(self, tmp_path):
+        (tmp_path / "a.txt").write_text("alpha")
+        (tmp_path / "b.txt").write_text("beta")
+        out = tmp_path / "out"
+
+        with WorkerPool(2) as pool:
+            results = list(
+                pool.imap_unordered([(tmp_path / "a.txt", out), (tmp_path / "b.txt", out)])
+            )
+
+        assert sorted(r.input_path.name for r in results) == ["a.txt", "b.txt"]
+        assert all(r.success and r.markdown == "" for r in results)
+        assert (out / "a.md").read_text().strip() == "alpha"
+
+    @needs_fork
+    @patch("any2md.converter.MarkItDown")
+    def test_timeout_kills_worker_and_continues(self, mock_markitdown_class, tmp_path):
+        mock_markitdown_class.return_value.convert.side_effect = _hang_on_slow
+        files = [tmp_path / "slow.html", tmp_path / "a.html", tmp_path / "b.html"]
+        for f in files:
+            f.write_text("<p>x</p>")
+        out = tmp_path / "out"
+
+        start = time.monotonic()
+        with WorkerPool(2, timeout=1.0) as pool:
+            results = {r.input_path.name: r for r in pool.imap_unordered((f, out) for f in files)}
+        assert time.monotonic() - start < 30
+
+        assert results["slow.html"].timed_out
+        assert not results["slow.html"].success
+        assert "超时" in results["slow.html"].error
+        assert results["a.html"].success and results["b.html"].success
+
+    @needs_fork
+    def test_dead_worker_is_reported_and_replaced(self, tmp_path):
+        files = [tmp_path / "crash.txt", tmp_path / "fine.txt"]
+        for f in files:
+            f.write_text("x")
+
+        def crash_on_first(self, input_path, output_dir=None):
+            if Path(input_path).stem == "crash":
+                os._exit(3)
+            return real_convert(self, input_path, output_dir)
+
+        real_convert = Any2MDConverter.convert_file
+        with patch.object(Any2MDConverter, "convert_file", crash_on_first):
+            with WorkerPool(1) as pool:
+                results = {
+                    r.input_path.name: r
+                    for r in pool.imap_unordered((f, tmp_path / "out") for f in files)
+                }
+
+        assert "exit code 3" in results["crash.txt"].error
+        assert results["fine.txt"].success
+
+
+    def test_prestarted_pool_serves_several_runs(self, tmp_path):
+        files = [tmp_path / f"{name}.txt" for name in ("a", "b", "c")]
+        for f in files:
+            f.write_text(f.stem)
+        out = tmp_path / "out"
+
+        with WorkerPool(2, preload=True) as pool:
+            pool.start()
+            first = [w.proc.pid for w in pool._slots]
+            list(pool.imap_unordered([(files[0], out)]))
+            list(pool.imap_unordered([(files[1], out), (files[2], out)]))
+            assert [w.proc.pid for w in pool._slots] == first
+
+        assert sorted(p.name for p in out.iterdir()) == ["a.md", "b.md", "c.md"]
+
+    def test_idle_worker_that_died_is_replaced(self, tmp_path):
+        src = tmp_path / "a.txt"
+        src.write_text("alpha")
+
+        with WorkerPool(1) as pool:
+            pool.start()
+            pool._slots[0].proc.kill()
+            pool._slots[0].proc.join()
+            results = list(pool.imap_unordered([(src, tmp_path / "out")]))
+
+        assert results[0].success
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script")
+    def test_killed_worker_takes_its_office_process_along(self, tmp_path, monkeypatch):
+        pid_file = tmp_path / "helper.pid"
+        soffice = tmp_path / "soffice"
+        # Like the real launcher: a helper process does the work.
+        soffice.write_text(f"#!/bin/sh\nsleep 300 &\necho $! > {pid_file}\nwait\n")
+        soffice.chmod(0o755)
+        monkeypatch.setenv("ANY2MD_SOFFICE", str(soffice))
+        monkeypatch.setattr(Any2MDConverter, "_soffice_cache", None)
+        temp = tmp_path / "tmp"
+        temp.mkdir()
+        monkeypatch.setattr(tempfile, "tempdir", str(temp))
+        (tmp_path / "in").mkdir()
+        (tmp_path / "in" / "old.doc").write_bytes(b"doc")
+
+        results = Any2MDConverter(timeout=2).convert_directory(
+            tmp_path / "in", tmp_path / "out", max_workers=1
+        )
+
+        assert results[0].timed_out
+        assert not list(temp.glob("any2md_lo_pool_*"))
+        helper = int(pid_file.read_text())
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            try:
+                os.kill(helper, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.1)
+        else:
+            os.kill(helper, 9)
+            pytest.fail("office helper outlived its worker")
+
+
+class TestWorkerLimits:
+    def test_limits_truthiness(self):
+        assert not WorkerLimits()
+        assert WorkerLimits(max_files=10)
+
+    def test_workers_are_recycled_after_max_files(self, tmp_path):
+        files = []
+        for i in range(5):
+            f = tmp_path / f"f{i}.txt"
+            f.write_text(str(i))
+            files.append(f)
+
+        with WorkerPool(1, limits=WorkerLimits(max_files=2)) as pool:
+            results = list(pool.imap_unordered((f, tmp_path / "out") for f in files))
+
+        assert len(results) == 5
+        assert all(r.success for r in results)
+        assert pool.recycled == 2
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RLIMIT_AS")
+    def test_rss_bytes_of_self(self):
+        assert rss_bytes(os.getpid()) > 0
+
+    @needs_fork
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RLIMIT_AS")
+    @patch("any2md.converter.MarkItDown")
+    def test_oversized_file_fails_cleanly(self, mock_markitdown_class, tmp_path):
+        def convert(path):
+            if Path(path).stem == "huge":
+                blob = bytearray(4 * 1024 * 1024 * 1024)
+                return Mock(text_content=str(len(blob)), title=None)
+            return Mock(text_content="small", title=None)
+
+        mock_markitdown_class.return_value.convert.side_effect = convert
+        files = [tmp_path / "huge.html", tmp_path / "small.html"]
+        for f in files:
+            f.write_text("<p>x</p>")
+
+        with WorkerPool(1, limits=WorkerLimits(max_memory_mb=256)) as pool:
+            results = {
+                r.input_path.name: r
+                for r in pool.imap_unordered((f, tmp_path / "out") for f in files)
+            }
+
+        assert not results["huge.html"].success
+        assert results["huge.html"].error.startswith(MEMORY_ERROR)
+        assert results["small.html"].success
+        assert pool.recycled == 1
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RLIMIT_AS")
+    def test_limit_is_measured_after_markitdown_loads(self, tmp_path):
+        files = [tmp_path / f"{i}.html" for i in range(3)]
+        for f in files:
+            f.write_text("<html><body><h1>T</h1><p>x</p></body></html>")
+
+        # MarkItDown with magika alone is about the size of the limit.
+        with WorkerPool(1, limits=WorkerLimits(max_memory_mb=100)) as pool:
+            results = list(pool.imap_unordered((f, tmp_path / "out") for f in files))
+            assert pool._slots[0].baseline.value > 0
+
+        assert [r.error for r in results] == [None, None, None]
+        assert pool.recycled == 0
+
+
+class TestQuarantine:
+    def test_changed_file_leaves_quarantine(self, tmp_path):
+        f = tmp_path / "a.pdf"
+        f.write_bytes(b"1")
+        q = Quarantine(tmp_path / QUARANTINE_NAME)
+        q.add(f, "timeout")
+        q.save()
+
+        reloaded = Quarantine(tmp_path / QUARANTINE_NAME)
+        assert reloaded.contains(f)
+        assert reloaded.reason(f) == "timeout"
+
+        f.write_bytes(b"22")
+        assert not reloaded.contains(f)
+
+    def test_archive_members_survive_reextraction(self, tmp_path):
+        archive = tmp_path / "in.zip"
+        archive.write_bytes(b"zip")
+        for run in ("one", "two"):
+            member = tmp_path / run / "dir" / "b.pdf"
+            member.parent.mkdir(parents=True)
+            member.write_bytes(b"pdf")
+
+        first = Quarantine(tmp_path / QUARANTINE_NAME)
+        first.add_archive(tmp_path / "one", archive)
+        first.add(tmp_path / "one" / "dir" / "b.pdf", "timeout")
+        first.save()
+        # The next run extracts into a new directory.
+        second = Quarantine(tmp_path / QUARANTINE_NAME)
+        second.add_archive(tmp_path / "two", archive)
+
+        assert list(second.entries) == [str(archive.resolve() / "dir" / "b.pdf")]
+        assert second.contains(tmp_path / "two" / "dir" / "b.pdf")
+
+        archive.write_bytes(b"changed")
+        assert not second.contains(tmp_path / "two" / "dir" / "b.pdf")
+
+    def test_entries_of_missing_files_are_dropped(self, tmp_path):
+        gone = tmp_path / "gone.pdf"
+        kept = tmp_path / "kept.pdf"
+        for f in (gone, kept):
+            f.write_bytes(b"1")
+        q = Quarantine(tmp_path / QUARANTINE_NAME)
+        q.add(gone, "timeout")
+        q.add(kept, "timeout")
+        gone.unlink()
+        q.save()
+
+        assert list(Quarantine(tmp_path / QUARANTINE_NAME).entries) == [
+            str(kept.resolve())
+        ]
+
+    @needs_fork
+    @patch("any2md.converter.MarkItDown")
+    def test_timed_out_files_are_skipped_later(self, mock_markitdown_class, tmp_path):
+        mock_markitdown_class.return_value.convert.side_effect = _hang_on_slow
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        (input_dir / "slow.html").write_text("<p>x</p>")
+        (input_dir / "ok.html").write_text("<p>y</p>")
+        output_dir = tmp_path / "output"
+
+        converter = Any2MDConverter(timeout=1.0)
+        first = converter.convert_directory(input_dir, output_dir, max_workers=2)
+        assert [r.timed_out for r in first] == [False, True]
+        assert (output_dir / QUARANTINE_NAME).exists()
+
+        second = converter.convert_directory(input_dir, output_dir, max_workers=2)
+        skipped = second[1]
+        assert not skipped.success and not skipped.timed_out
+        assert "隔离" in skipped.error
+
+        third = converter.convert_directory(
+            input_dir, output_dir, max_workers=2, retry_quarantined=True
+        )
+        assert third[1].timed_out
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script")
+    def test_single_file_cli_run_honours_timeout(self, tmp_path):
+        soffice = tmp_path / "soffice"
+        soffice.write_text("#!/bin/sh\nexec sleep 300\n")
+        soffice.chmod(0o755)
+        src = tmp_path / "old.doc"
+        src.write_bytes(b"doc")
+        output_dir = tmp_path / "out"
+
+        start = time.monotonic()
+        subprocess.run(
+            [sys.executable, "-m", "any2md", "convert", str(src), "-o", str(output_dir)]
+            + ["--timeout", "2"],
+            check=True,
+            capture_output=True,
+            env={**os.environ, "ANY2MD_SOFFICE": str(soffice)},
+            timeout=60,
+        )
+
+        assert time.monotonic() - start < 30
+        assert Quarantine.for_output_dir(output_dir).contains(src)
@@ -0,0 +1,97 @@
+import json
+import zipfile
+from pathlib import Path
+
+from any2md.converter import Any2MDConverter, ConvertResult
+from any2md.report import build_report, percentile, write_report
+
+HTML = "<html><body><h1>Title</h1><p>Body text</p></body></html>"
+
+
+def _result(name: str, elapsed: float, success: bool = True, **timings) -> ConvertResult:
+    return ConvertResult(
+        success=success,
+        input_path=Path("/in") / name,
+        elapsed=elapsed,
+        timings=timings,
+        input_bytes=100,
+        output_bytes=40 if success else 0,
+        error=None if success else "boom",
+    )
+
+
+class TestStageTimings:
+    def test_convert_file_records_stages_and_sizes(self, tmp_path):
+        src = tmp_path / "page.html"
+        src.write_text(HTML, encoding="utf-8")
+
+        result = Any2MDConverter().convert_file(src, tmp_path / "out")
+
+        assert result.success
+        assert {"parse", "write"} <= set(result.timings)
+        assert sum(result.timings.values()) <= result.elapsed
+        assert result.input_bytes == src.stat().st_size
+        assert result.output_bytes == result.output_path.stat().st_size
+
+    def test_misnamed_file_shows_detection(self, tmp_path):
+        src = tmp_path / "report.pdf"
+        src.write_text(HTML, encoding="utf-8")
+
+        result = Any2MDConverter().convert_file(src)
+
+        assert result.success
+        assert result.timings["detect"] > 0
+        assert result.output_bytes == len(result.markdown.encode("utf-8"))
+
+    def test_batches_record_queue_wait(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        for i in range(4):
+            (src / f"{i}.html").write_text(HTML, encoding="utf-8")
+        archive = tmp_path / "pages.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("a.html", HTML)
+        converter = Any2MDConverter()
+
+        results = converter.convert_directory(src, tmp_path / "out", max_workers=2)
+        results += converter.convert_zip(archive, tmp_path / "zip_out")
+
+        assert len(results) == 5
+        assert all(r.timings["queue"] >= 0 for r in results)
+
+
+class TestRunReport:
+    def test_percentile_interpolates(self):
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+        assert percentile([5.0], 99) == 5.0
+        assert percentile([], 90) == 0.0
+
+    def test_aggregates_per_format(self):
+        results = [
+            _result("a.pdf", 3.0, parse=2.5, write=0.1),
+            _result("b.pdf", 1.0, parse=0.8),
+            _result("c.doc", 2.0, legacy=1.5, parse=0.4),
+            _result("d.doc", 0.5, success=False),
+        ]
+
+        report = build_report(results, base_dir=Path("/in"), wall_seconds=4.0, top=2)
+
+        assert report["files"] == 4 and report["failed"] == 1
+        assert report["wall_seconds"] == 4.0
+        assert report["input_bytes"] == 400
+        assert [e["path"] for e in report["slowest"]] == ["a.pdf", "c.doc"]
+        pdf = report["formats"][".pdf"]
+        assert pdf["seconds"]["total"] == 4.0
+        assert pdf["seconds"]["p50"] == 2.0
+        assert pdf["stages"]["parse"]["total"] == 3.3
+        assert pdf["stages"]["write"]["files"] == 1
+        doc = report["formats"][".doc"]
+        assert doc["stages"]["legacy"]["total"] == 1.5
+        assert doc["slowest"][1]["error"] == "boom"
+
+    def test_write_report(self, tmp_path):
+        path = write_report(tmp_path / "run.json", [_result("a.html", 0.2, parse=0.1)])
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["formats"][".html"]["files"] == 1
+        assert data["slowest"][0]["stages"] == {"parse": 0.1}
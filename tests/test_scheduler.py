@@ -0,0 +1,121 @@
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from any2md.converter import Any2MDConverter
+from any2md.scheduler import ThroughputStats, estimate_cost, order_by_cost
+
+
+class TestEstimateCost:
+    def test_larger_files_cost_more(self):
+        assert estimate_cost(Path("a.pdf"), 10_000_000) > estimate_cost(
+            Path("b.pdf"), 10_000
+        )
+
+    def test_format_factor(self):
+        assert estimate_cost(Path("a.pdf"), 1_000_000) > estimate_cost(
+            Path("a.txt"), 1_000_000
+        )
+
+    def test_legacy_formats_have_fixed_overhead(self):
+        assert estimate_cost(Path("a.doc"), 0) > estimate_cost(Path("a.docx"), 0)
+
+    def test_learned_throughput_wins(self, tmp_path):
+        stats = ThroughputStats(tmp_path / "stats.json")
+        stats.record(".txt", 1000, 10.0)
+        stats.flush()
+
+        assert estimate_cost(Path("a.txt"), 1000, stats) == pytest.approx(10.0)
+
+
+class TestOrderByCost:
+    def test_longest_job_first(self, tmp_path):
+        small = tmp_path / "small.pdf"
+        big = tmp_path / "big.pdf"
+        text = tmp_path / "notes.txt"
+        small.write_bytes(b"x" * 100)
+        big.write_bytes(b"x" * 100_000)
+        text.write_bytes(b"x" * 100_000)
+
+        assert order_by_cost([text, small, big]) == [big, small, text]
+
+    def test_key_function(self, tmp_path):
+        big = tmp_path / "big.html"
+        big.write_bytes(b"x" * 50_000)
+        small = tmp_path / "small.html"
+        small.write_bytes(b"x")
+
+        items = [(small, "out"), (big, "out")]
+        assert order_by_cost(items, key=lambda i: i[0])[0][0] == big
+
+
+class TestThroughputStats:
+    def test_persisted_with_moving_average(self, tmp_path):
+        path = tmp_path / "stats.json"
+        stats = ThroughputStats(path, smoothing=0.5)
+        stats.record(".pdf", 1000, 1.0)
+        stats.save()
+        assert ThroughputStats(path).rates[".pdf"] == pytest.approx(1000)
+
+        again = ThroughputStats(path, smoothing=0.5)
+        again.record(".pdf", 3000, 1.0)
+        again.save()
+        assert ThroughputStats(path).rates[".pdf"] == pytest.approx(2000)
+
+    def test_ignores_empty_measurements(self, tmp_path):
+        stats = ThroughputStats(tmp_path / "stats.json")
+        stats.record(".pdf", 0, 1.0)
+        stats.record(".pdf", 10, 0.0)
+        stats.flush()
+        assert stats.rates == {}
+
+
+class TestConvertDirectoryScheduling:
+    @patch("any2md.converter.MarkItDown")
+    def test_big_files_are_submitted_first(self, mock_markitdown_class, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        (input_dir / "a_small.html").write_text("x")
+        (input_dir / "b_big.pdf").write_bytes(b"x" * 200_000)
+        (input_dir / "c_medium.docx").write_bytes(b"x" * 20_000)
+
+        seen = []
+
+        def convert(path):
+            seen.append(Path(path).name)
+            return Mock(text_content="ok", title=None)
+
+        mock_markitdown_class.return_value.convert.side_effect = convert
+        stats = ThroughputStats(tmp_path / "stats.json")
+
+        converter = Any2MDConverter(throughput=stats)
+        results = converter.convert_directory(input_dir, tmp_path / "out", max_workers=1)
+
+        assert seen == ["b_big.pdf", "c_medium.docx", "a_small.html"]
+        assert [r.input_path.name for r in results] == sorted(seen)
+        assert all(r.elapsed > 0 for r in results)
+        assert set(ThroughputStats(tmp_path / "stats.json").rates) == {
+            ".pdf",
+            ".docx",
+            ".html",
+        }
+
+    @patch("any2md.converter.MarkItDown")
+    def test_big_file_found_late_still_starts_first(self, mock_markitdown_class, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        for i in range(100):
+            (input_dir / f"a{i:03d}.html").write_text("x")
+        (input_dir / "z_big.pdf").write_bytes(b"x" * 200_000)
+        seen = []
+
+        def convert(path):
+            seen.append(Path(path).name)
+            return Mock(text_content="ok", title=None)
+
+        mock_markitdown_class.return_value.convert.side_effect = convert
+
+        Any2MDConverter().convert_directory(input_dir, tmp_path / "out", max_workers=1)
+
+        assert seen[0] == "z_big.pdf"
@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+import zipfile
+
+import pytest
+
+from any2md.converter import Any2MDConverter
+from any2md.scratch import ArchiveBombError, ScratchQuotaError, ScratchSpace
+from any2md.unzipper import Unzipper
+
+
+class TestScratchSpace:
+    def test_quota(self):
+        scratch = ScratchSpace(quota_bytes=100)
+        scratch.reserve(60)
+
+        with pytest.raises(ScratchQuotaError):
+            scratch.reserve(50)
+
+        scratch.release(60)
+        scratch.reserve(100)
+        assert scratch.used_bytes == 100
+
+    def test_wait_for_release(self):
+        scratch = ScratchSpace(quota_bytes=100, wait_seconds=5)
+        scratch.reserve(80)
+        threading.Timer(0.1, scratch.release, args=(80,)).start()
+
+        started = time.monotonic()
+        scratch.reserve(50, wait=True)
+
+        assert time.monotonic() - started < 5
+        assert scratch.used_bytes == 50
+
+    def test_wait_gives_up_when_nothing_will_be_released(self):
+        scratch = ScratchSpace(quota_bytes=10, wait_seconds=5)
+
+        with pytest.raises(ScratchQuotaError):
+            scratch.reserve(50, wait=True)
+
+    def test_tempdir_on_chosen_root(self, tmp_path):
+        scratch = ScratchSpace(tmp_path / "scratch", quota_bytes=100)
+
+        with scratch.tempdir("any2md_test_", reserve=40) as td:
+            assert td.parent == tmp_path / "scratch"
+            assert scratch.used_bytes == 40
+
+        assert not td.exists()
+        assert scratch.used_bytes == 0
+
+    def test_env_defaults(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("ANY2MD_SCRATCH_DIR", str(tmp_path))
+        monkeypatch.setenv("ANY2MD_SCRATCH_QUOTA_MB", "2")
+
+        scratch = ScratchSpace()
+
+        assert scratch.root == tmp_path
+        assert scratch.quota_bytes == 2 * 1024 * 1024
+
+
+def _bomb(tmp_path):
+    zip_path = tmp_path / "bomb.zip"
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("zeros.txt", b"\0" * (8 * 1024 * 1024))
+    return zip_path
+
+
+class TestUnzipperBudget:
+    def test_bomb_is_refused(self, tmp_path):
+        zip_path = _bomb(tmp_path)
+        unzipper = Unzipper(scratch=ScratchSpace())
+
+        with pytest.raises(ArchiveBombError):
+            unzipper.extract(zip_path, tmp_path / "out")
+        with pytest.raises(ArchiveBombError):
+            for member in unzipper.iter_members(zip_path):
+                member.spool()
+        assert not (tmp_path / "out" / "zeros.txt").exists()
+
+    def test_quota_stops_extraction(self, tmp_path):
+        zip_path = tmp_path / "big.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("a.txt", "a" * 600)
+            zf.writestr("b.txt", "b" * 600)
+
+        with pytest.raises(ScratchQuotaError):
+            Unzipper(scratch=ScratchSpace(quota_bytes=1000)).extract_selective(
+                zip_path, tmp_path / "out"
+            )
+
+    def test_release_frees_member(self, tmp_path):
+        zip_path = tmp_path / "a.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("a.txt", "a" * 600)
+        scratch = ScratchSpace(quota_bytes=1000)
+
+        with Unzipper(scratch=scratch) as unzipper:
+            (path,) = unzipper.extract_selective(zip_path, tmp_path / "out")
+            assert scratch.used_bytes == 600
+            unzipper.release(path)
+            assert scratch.used_bytes == 0
+            assert not path.exists()
+
+    def test_convert_zip_stays_within_budget(self, tmp_path):
+        zip_path = tmp_path / "many.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            for i in range(6):
+                zf.writestr(f"f{i}.txt", f"{i}" * 400)
+        scratch = ScratchSpace(tmp_path / "scratch", quota_bytes=1000)
+        converter = Any2MDConverter(scratch=scratch)
+
+        results = converter.convert_zip(
+            zip_path, tmp_path / "out", max_workers=2, spill_threshold=100
+        )
+
+        assert len(results) == 6 and all(r.success for r in results)
+        assert scratch.used_bytes == 0
+
+    def test_convert_zip_waits_when_only_one_member_fits(self, tmp_path):
+        zip_path = tmp_path / "big.zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for i in range(4):
+                zf.writestr(f"f{i}.txt", os.urandom(300_000).hex())
+        scratch = ScratchSpace(tmp_path / "scratch", quota_bytes=700_000, wait_seconds=10)
+        converter = Any2MDConverter(scratch=scratch)
+
+        start = time.monotonic()
+        results = converter.convert_zip(
+            zip_path, tmp_path / "out", max_workers=2, spill_threshold=100_000
+        )
+
+        assert time.monotonic() - start < 10
+        assert len(results) == 4 and all(r.success for r in results)
+        assert scratch.used_bytes == 0
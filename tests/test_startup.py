@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+
+import any2md
+
+HEAVY = ["markitdown", "magika", "pdfminer", "pptx", "openpyxl", "pandas"]
+
+
+def _loaded_after(code: str) -> list[str]:
+    probe = f"import json, sys\n{code}\nprint(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    out = subprocess.run(
+        [sys.executable, "-c", probe], check=True, capture_output=True, text=True
+    )
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+class TestLazyImports:
+    def test_cli_import_skips_converter_dependencies(self):
+        assert _loaded_after("import any2md.cli") == []
+
+    def test_text_conversion_never_loads_markitdown(self, tmp_path):
+        src = tmp_path / "a.md"
+        src.write_text("# hi", encoding="utf-8")
+        code = (
+            "from pathlib import Path\n"
+            "from any2md import Any2MDConverter\n"
+            f"assert Any2MDConverter().convert_file(Path({str(src)!r}), Path({str(tmp_path / 'out')!r})).success"
+        )
+
+        assert _loaded_after(code) == []
+
+    def test_package_exports_resolve_lazily(self):
+        from any2md.converter import Any2MDConverter
+
+        assert any2md.Any2MDConverter is Any2MDConverter
+        assert "Unzipper" in dir(any2md)
+
+    def test_markitdown_created_on_first_use(self):
+        converter = any2md.Any2MDConverter()
+
+        assert getattr(converter._local, "md", None) is None
+        assert converter.md is converter.md
@@ -0,0 +1,295 @@
+import io
+import re
+import zipfile
+from unittest.mock import patch
+
+import openpyxl
+import pytest
+
+from any2md.converter import Any2MDConverter
+from any2md.tabular import (
+    TableOptions,
+    format_cell,
+    write_csv,
+    write_table,
+    write_xls,
+    write_xlsx,
+)
+
+
+def _table(rows, **options) -> str:
+    out = io.StringIO()
+    write_table(lambda: iter(rows), out, TableOptions(**options))
+    return out.getvalue()
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    ws.append(["name", None, "score"])
+    ws.append(["a", None, 1.0])
+    ws.append([None, None, None])
+    ws.append(["b|c", None, "x\ny"])
+    wb.create_sheet("Empty")
+    other = wb.create_sheet("Other")
+    other.append(["k"])
+    other.append([42])
+    path = tmp_path / "book.xlsx"
+    wb.save(path)
+    return path
+
+
+class TestWriteTable:
+    def test_header_and_rows(self):
+        assert _table([["a", "b"], [1, 2.5]]) == "| a | b |\n| --- | --- |\n| 1 | 2.5 |\n"
+
+    def test_format_cell(self):
+        assert format_cell(None) == ""
+        assert format_cell(3.0) == "3"
+        assert format_cell("a|b") == "a\\|b"
+        assert format_cell("a\nb") == "a b"
+
+    def test_short_rows_are_padded(self):
+        assert _table([["a", "b"], [1]]).endswith("| 1 |  |\n")
+
+    def test_header_is_padded_to_widest_row(self):
+        table = _table([["a", "b"], [1, 2, "extra note"]])
+
+        assert table.startswith("| a | b |  |\n| --- | --- | --- |\n")
+        assert table.endswith("| 1 | 2 | extra note |\n")
+        # Rows past the cap do not widen the table.
+        assert _table([["a"], [1], [2, 3]], max_rows=1).startswith("| a |\n")
+
+    def test_drop_empty_rows_and_cols(self):
+        rows = [["a", None, "b"], [None, None, None], [1, None, 2]]
+
+        assert _table(rows, drop_empty_cols=True) == "| a | b |\n| --- | --- |\n| 1 | 2 |\n"
+        assert _table(rows, drop_empty_rows=False).count("\n") == 4
+
+    def test_max_rows_truncates(self):
+        text = _table([["h"]] + [[i] for i in range(10)], max_rows=3)
+
+        assert "| 2 |" in text and "| 3 |" not in text
+        assert "仅显示前 3 行" in text
+
+    def test_max_rows_without_overflow_has_no_note(self):
+        assert "仅显示" not in _table([["h"], [1], [2]], max_rows=2)
+
+    def test_sample_is_ordered_and_reproducible(self):
+        rows = [["h"]] + [[i] for i in range(1000)]
+
+        first = _table(rows, max_rows=10, sample=True, seed=1)
+        values = [int(line.strip("| ")) for line in first.splitlines()[2:12]]
+
+        assert values == sorted(values)
+        assert values != list(range(10))
+        assert first == _table(rows, max_rows=10, sample=True, seed=1)
+        assert "抽样显示 10 / 1000 行" in first
+
+    def test_empty_input(self):
+        assert _table([]) == ""
+
+
+class TestWriteXlsx:
+    def test_all_sheets(self, workbook):
+        out = io.StringIO()
+        write_xlsx(workbook, out)
+        text = out.getvalue()
+
+        assert "## Data\n| name |  | score |" in text
+        assert "| b\\|c |  | x y |" in text
+        assert "## Empty\n" in text
+        assert "## Other\n| k |\n| --- |\n| 42 |" in text
+
+    def test_converter_streams_to_output(self, workbook, tmp_path):
+        converter = Any2MDConverter(table_options=TableOptions(drop_empty_cols=True))
+        result = converter.convert_file(workbook, tmp_path / "out")
+
+        assert result.success
+        assert result.markdown == ""
+        assert "| name | score |" in result.output_path.read_text(encoding="utf-8")
+
+    def test_converter_without_output_dir_returns_markdown(self, workbook):
+        result = Any2MDConverter().convert_file(workbook)
+
+        assert result.success
+        assert "## Other" in result.markdown
+
+    def test_wrong_dimension_metadata_is_ignored(self, tmp_path):
+        wb = openpyxl.Workbook()
+        for r in range(5):
+            wb.active.append([f"c{r}{c}" for c in range(3)])
+        path = tmp_path / "export.xlsx"
+        wb.save(path)
+        # Like many exporters: declare the sheet as a single cell.
+        fixed = tmp_path / "fixed.xlsx"
+        with zipfile.ZipFile(path) as src, zipfile.ZipFile(fixed, "w") as dst:
+            for info in src.infolist():
+                data = src.read(info)
+                if info.filename == "xl/worksheets/sheet1.xml":
+                    data = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="A1"', data)
+                dst.writestr(info, data)
+
+        out = io.StringIO()
+        write_xlsx(fixed, out)
+
+        assert "| c00 | c01 | c02 |" in out.getvalue()
+        assert "| c40 | c41 | c42 |" in out.getvalue()
+
+    def test_broken_workbook_leaves_no_output(self, tmp_path):
+        broken = tmp_path / "broken.xlsx"
+        broken.write_bytes(b"not a zip")
+
+        result = Any2MDConverter().convert_file(broken, tmp_path / "out")
+
+        assert not result.success
+        assert not (tmp_path / "out" / "broken.md").exists()
+
+
+class _FakeSheet:
+    def __init__(self, name, rows):
+        self.name = name
+        self._rows = rows
+        self.nrows = len(rows)
+        self.ncols = max((len(row) for row in rows), default=0)
+
+    def row(self, r):
+        return self._rows[r]
+
+
+class _FakeBook:
+    datemode = 0
+
+    def __init__(self, sheets):
+        self._sheets = sheets
+        self.nsheets = len(sheets)
+        self.unloaded = []
+        self.released = False
+
+    def sheet_by_index(self, i):
+        return self._sheets[i]
+
+    def unload_sheet(self, i):
+        self.unloaded.append(i)
+
+    def release_resources(self):
+        self.released = True
+
+
+@pytest.fixture
+def xls_book():
+    xlrd = pytest.importorskip("xlrd")
+    from xlrd.sheet import Cell
+
+    def _text(value):
+        return Cell(xlrd.XL_CELL_TEXT, value)
+
+    return _FakeBook(
+        [
+            _FakeSheet(
+                "First",
+                [
+                    [_text("when"), _text("n"), _text("ok")],
+                    [
+                        Cell(xlrd.XL_CELL_DATE, 45292.0),
+                        Cell(xlrd.XL_CELL_NUMBER, 3.0),
+                        Cell(xlrd.XL_CELL_BOOLEAN, 1),
+                    ],
+                ],
+            ),
+            _FakeSheet("Second", [[_text("k")], [Cell(xlrd.XL_CELL_EMPTY, "")]]),
+        ]
+    )
+
+
+class TestWriteXls:
+    def test_all_sheets_on_demand(self, xls_book, tmp_path):
+        out = io.StringIO()
+        with patch("xlrd.open_workbook", return_value=xls_book) as open_workbook:
+            write_xls(tmp_path / "a.xls", out)
+
+        assert open_workbook.call_args.kwargs["on_demand"] is True
+        assert out.getvalue() == (
+            "## First\n| when | n | ok |\n| --- | --- | --- |\n"
+            "| 2024-01-01 00:00:00 | 3 | True |\n"
+            "\n## Second\n| k |\n| --- |\n"
+        )
+        assert xls_book.unloaded == [0, 1]
+        assert xls_book.released
+
+    def test_converter_falls_back_to_xlrd(self, xls_book, tmp_path):
+        src = tmp_path / "a.xls"
+        src.write_bytes(b"xls")
+
+        with patch("xlrd.open_workbook", return_value=xls_book), patch.object(
+            Any2MDConverter, "_legacy_intermediate", return_value=None
+        ):
+            result = Any2MDConverter().convert_file(src, tmp_path / "out")
+
+        assert result.success
+        text = result.output_path.read_text(encoding="utf-8")
+        assert "## First" in text and "## Second" in text
+
+
+class _Sink(io.TextIOBase):
+    def write(self, text):
+        return len(text)
+
+
+class TestWriteCsv:
+    def test_same_table_as_markitdown(self, tmp_path):
+        src = tmp_path / "a.csv"
+        src.write_text('a,b\n1,"x|y"\n2\n', encoding="utf-8")
+        out = io.StringIO()
+
+        write_csv(src, out)
+
+        assert out.getvalue() == "| a | b |\n| --- | --- |\n| 1 | x\\|y |\n| 2 |  |\n"
+
+    def test_sniffs_dialect_and_encoding(self, tmp_path):
+        src = tmp_path / "a.csv"
+        src.write_bytes("名称;数量\n苹果;3\n".encode("gbk"))
+        out = io.StringIO()
+
+        write_csv(src, out)
+
+        assert out.getvalue().splitlines()[0] == "| 名称 | 数量 |"
+        assert "| 苹果 | 3 |" in out.getvalue()
+
+    def test_stream_source_and_row_cap(self):
+        data = "h\n" + "".join(f"{i}\n" for i in range(100))
+        out = io.StringIO()
+
+        write_csv(io.BytesIO(data.encode()), out, TableOptions(max_rows=5))
+
+        assert "| 4 |" in out.getvalue() and "| 5 |" not in out.getvalue()
+
+    def test_memory_does_not_grow_with_file_size(self, tmp_path):
+        import tracemalloc
+
+        src = tmp_path / "big.csv"
+        with src.open("w", encoding="utf-8") as f:
+            f.write("id,name,value\n")
+            for i in range(100_000):
+                f.write(f"{i},name-{i},{i * 0.5}\n")
+
+        tracemalloc.start()
+        try:
+            write_csv(src, _Sink(), TableOptions(drop_empty_cols=True))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert src.stat().st_size > 2 * 1024 * 1024
+        assert peak < 2 * 1024 * 1024
+
+    def test_converter_streams_csv(self, tmp_path):
+        src = tmp_path / "a.csv"
+        src.write_text("a,b\n1,2\n", encoding="utf-8")
+
+        result = Any2MDConverter().convert_file(src, tmp_path / "out")
+
+        assert result.success
+        assert result.output_path.read_text(encoding="utf-8").startswith("| a | b |")
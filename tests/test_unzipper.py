@@ -1,3 +1,4 @@
+import io
 import pytest
 import zipfile
 import shutil
@@ -138,3 +139,110 @@ class TestUnzipper:
             assert all(p.exists() for p in paths)
 
         assert not any(p.exists() for p in paths)
+
+
+def _nested_zip(tmp_path: Path) -> Path:
+    inner = tmp_path / "inner.zip"
+    with zipfile.ZipFile(inner, "w") as zf:
+        zf.writestr("deep.txt", "deep content")
+    outer = tmp_path / "outer.zip"
+    with zipfile.ZipFile(outer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("root.txt", "root content")
+        zf.writestr("skip.bin", b"\x00\x01")
+        zf.write(inner, "sub/inner.zip")
+    return outer
+
+
+class TestIterMembers:
+    def test_nested_layout_matches_extract_recursive(self, tmp_path):
+        outer = _nested_zip(tmp_path)
+
+        unzipper = Unzipper()
+        virtual = sorted(str(m.path) for m in unzipper.iter_members(outer))
+        extracted = unzipper.extract_recursive(outer, tmp_path / "out")
+        on_disk = sorted(
+            p.relative_to(extracted).as_posix()
+            for p in extracted.rglob("*")
+            if p.is_file()
+        )
+
+        assert virtual == on_disk == ["root.txt", "skip.bin", "sub/inner/deep.txt"]
+
+    def test_predicate_and_content(self, tmp_path):
+        outer = _nested_zip(tmp_path)
+
+        contents = {}
+        for member in Unzipper().iter_members(
+            outer, predicate=lambda p: p.suffix == ".txt"
+        ):
+            with member.spool() as buf:
+                contents[str(member.path)] = buf.read().decode()
+
+        assert contents == {
+            "root.txt": "root content",
+            "sub/inner/deep.txt": "deep content",
+        }
+
+    def test_spills_large_members_to_disk(self, tmp_path):
+        zip_path = tmp_path / "big.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("small.txt", "x")
+            zf.writestr("big.txt", "y" * 1000)
+
+        unzipper = Unzipper(spill_threshold=100)
+        buffers = {m.path.name: m.spool() for m in unzipper.iter_members(zip_path)}
+
+        assert isinstance(buffers["small.txt"], io.BytesIO)
+        assert not isinstance(buffers["big.txt"], io.BytesIO)
+        assert buffers["big.txt"].read() == b"y" * 1000
+        for buf in buffers.values():
+            buf.close()
+
+    def test_unsafe_member_path(self, tmp_path):
+        zip_path = tmp_path / "evil.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("../evil.txt", "bad")
+
+        with pytest.raises(ValueError):
+            list(Unzipper().iter_members(zip_path))
+
+
+class TestExtractSelective:
+    def test_returns_only_accepted_members(self, tmp_path):
+        outer = _nested_zip(tmp_path)
+        output_dir = tmp_path / "out"
+
+        extracted = Unzipper().extract_selective(
+            outer,
+            output_dir,
+            predicate=lambda rel: rel.suffix == ".txt",
+            max_workers=4,
+        )
+
+        root = output_dir.resolve()
+        assert [p.relative_to(root).as_posix() for p in extracted] == [
+            "root.txt",
+            "sub/inner/deep.txt",
+        ]
+        assert (root / "sub" / "inner" / "deep.txt").read_text() == "deep content"
+        assert not (root / "skip.bin").exists()
+        assert not (root / "sub" / "inner.zip").exists()
+
+    def test_without_predicate_matches_extract_recursive(self, tmp_path):
+        outer = _nested_zip(tmp_path)
+
+        extracted = Unzipper().extract_selective(outer, tmp_path / "a")
+        expected_dir = Unzipper().extract_recursive(outer, tmp_path / "b")
+
+        assert [p.relative_to((tmp_path / "a").resolve()) for p in extracted] == sorted(
+            p.relative_to(expected_dir) for p in expected_dir.rglob("*") if p.is_file()
+        )
+
+    def test_temp_dir_is_cleaned_up(self, tmp_path):
+        outer = _nested_zip(tmp_path)
+
+        with Unzipper() as unzipper:
+            extracted = unzipper.extract_selective(outer)
+            assert extracted and all(p.exists() for p in extracted)
+
+        assert not any(p.exists() for p in extracted)